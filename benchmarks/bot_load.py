@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест обработчиков бота.
+
+Генерирует поток синтетических telebot.types.Update (регистрация команды,
+вход по коду приглашения, отправка отчёта, взаимное оценивание) и подаёт его
+зарегистрированным обработчикам с заданной частотой. Апдейты обрабатывают
+--workers потоков, как пул потоков TeleBot в боте; апдейты одного
+пользователя попадают в один поток и обрабатываются по порядку. Следующая
+фаза сценария (например, вход в команды после их регистрации) начинается,
+когда обработаны все апдейты предыдущей. Bot API подменяется заглушкой через
+apihelper.CUSTOM_REQUEST_SENDER, запросы к БД идут в тестовую базу
+(config.database.test).
+
+Отчёт: пропускная способность, перцентили задержки обработки апдейта,
+количество SQL-запросов и вызовов Bot API.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bot_load.py --users 100 --rate 50 --workers 4
+"""
+
+import argparse
+import itertools
+import json
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+
+# Бенчмарк всегда работает с тестовой базой
+os.environ['STUDTEAMS_DB'] = 'test'
+
+import loguru
+import telebot
+from telebot import apihelper
+
+import myconn
+from bot import db
+from bot import main as bot_main
+from bot.callback_data import CallbackKind, pack
+from bot.outbox import Outbox
+from config import config
+
+logger = loguru.logger
+
+# Диапазон Telegram ID синтетических пользователей (удаляются после прогона)
+TG_ID_BASE = 7_000_000_000
+
+# Фиктивный токен: запросы к Bot API перехватывает заглушка
+BOT_TOKEN = "123456:LOAD-TEST"  # noqa: S105 - не секрет, в Telegram не отправляется
+
+# Имена проходят проверку бота: только буквы А-Я, а-я (без «ё»)
+FIRST_NAMES = ["Иван", "Анна", "Павел", "Мария", "Олег", "Ольга", "Денис", "Елена"]
+LAST_NAMES = ["Иванов", "Петрова", "Сидоров", "Смирнова", "Кузнецов", "Попова"]
+
+Step = Callable[[], telebot.types.Update]
+
+# Шаг сценария с Telegram ID пользователя: по нему выбирается поток обработки
+UserStep = tuple[int, Step]
+
+# Потоков обработки по умолчанию (как у пула потоков TeleBot)
+DEFAULT_WORKERS = 2
+
+
+class FakeTelegramApi:
+    """Заглушка Bot API: отвечает успехом и считает вызовы"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self._message_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __call__(self, method, url, params=None, files=None, timeout=None, proxies=None):
+        api_method = url.rsplit('/', 1)[-1]
+        with self._lock:
+            self.calls[api_method] += 1
+            message_id = next(self._message_ids)
+        if self.latency:
+            time.sleep(self.latency)
+
+        if api_method in ('sendMessage', 'editMessageText'):
+            chat_id = int((params or {}).get('chat_id', 0))
+            result = {'message_id': message_id, 'date': int(time.time()), 'chat': {'id': chat_id, 'type': 'private'}}
+        else:
+            result = True
+        return FakeResponse({'ok': True, 'result': result})
+
+
+class FakeResponse:
+    """Ответ requests.Response, достаточный для apihelper._check_result"""
+
+    status_code = 200
+
+    def __init__(self, payload: dict):
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self._payload
+
+
+class SyntheticUser:
+    """Виртуальный студент, от имени которого строятся апдейты"""
+
+    _update_ids = itertools.count(1)
+
+    def __init__(self, index: int):
+        self.tg_id = TG_ID_BASE + index
+        self.name = f"{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[index % len(LAST_NAMES)]}"
+        self._user = {'id': self.tg_id, 'is_bot': False, 'first_name': self.name.split()[0]}
+        self._chat = {'id': self.tg_id, 'type': 'private'}
+
+    def _message(self, text: str, from_user: dict) -> dict:
+        return {
+            'message_id': next(self._update_ids),
+            'from': from_user,
+            'chat': self._chat,
+            'date': int(time.time()),
+            'text': text,
+        }
+
+    def text(self, text: str) -> Step:
+        """Шаг: текстовое сообщение пользователя"""
+        return lambda: telebot.types.Update.de_json({
+            'update_id': next(self._update_ids),
+            'message': self._message(text, self._user),
+        })
+
+    def callback(self, data: str | Callable[[], str]) -> Step:
+        """Шаг: нажатие inline-кнопки (data может вычисляться при отправке)"""
+        return lambda: telebot.types.Update.de_json({
+            'update_id': next(self._update_ids),
+            'callback_query': {
+                'id': str(next(self._update_ids)),
+                'from': self._user,
+                'chat_instance': str(self.tg_id),
+                'message': self._message("...", {'id': 1, 'is_bot': True, 'first_name': "Bot"}),
+                'data': data() if callable(data) else data,
+            },
+        })
+
+    def student(self) -> dict:
+        """Текущие данные студента из БД (для шагов, зависящих от предыдущих)"""
+        return db.student_get_by_tg_id(self.tg_id)
+
+
+def registration_steps(admin: SyntheticUser, team_num: int) -> list[Step]:
+    """Регистрация команды Scrum Master'ом"""
+    return [
+        admin.text("/start"),
+        admin.text("Регистрация команды"),
+        admin.text(f"Нагрузка {team_num}"),
+        admin.text(f"Продукт {team_num}"),
+        admin.text(admin.name),
+        admin.text("6401"),
+        admin.callback("confirm_team_reg"),
+    ]
+
+
+def join_steps(member: SyntheticUser, admin: SyntheticUser) -> list[Step]:
+    """Вход в команду по коду приглашения"""
+    # Код приглашения известен только после регистрации команды
+    def start_with_invite():
+        return member.text(f"/start {admin.student()['team']['invite_code']}")()
+
+    return [
+        start_with_invite,
+        member.text(member.name),
+        member.text("6402"),
+        member.text("Разработчик"),
+        member.callback("confirm_join_team"),
+    ]
+
+
+def report_steps(user: SyntheticUser, sprint_num: int) -> list[Step]:
+    """Отправка отчёта по спринту"""
+    return [
+        user.text("Отправить отчёт"),
+        user.callback(pack(CallbackKind.SPRINT, sprint_num)),
+        user.text(f"Отчёт за спринт {sprint_num}: сделал задачи, написал тесты."),
+        user.text("Мои отчёты"),
+    ]
+
+
+def review_steps(user: SyntheticUser, teammate: SyntheticUser) -> list[Step]:
+    """Оценка одного участника команды"""
+    return [
+        user.text("Оценить участников команды"),
+        user.callback(lambda: pack(CallbackKind.TEAMMATE, teammate.student()['student_id'])),
+        user.callback(pack(CallbackKind.RATING, 8)),
+        user.text("Ответственный, помогает команде"),
+        user.text("Иногда опаздывает с задачами"),
+        user.text("Отправить"),
+        user.text("Кто меня оценил?"),
+    ]
+
+
+def interleave(scenarios: list[tuple[SyntheticUser, list[Step]]]) -> list[UserStep]:
+    """Перемешать сценарии пользователей, сохраняя порядок шагов каждого"""
+    iterators = [(user.tg_id, iter(steps)) for user, steps in scenarios]
+    phase = []
+    while iterators:
+        alive = []
+        for tg_id, steps in iterators:
+            step = next(steps, None)
+            if step is not None:
+                phase.append((tg_id, step))
+                alive.append((tg_id, steps))
+        iterators = alive
+    return phase
+
+
+def build_phases(users: int, team_size: int, with_reviews: bool) -> Iterator[list[UserStep]]:
+    """Фазы сценария по очереди; внутри фазы пользователи чередуются"""
+    people = [SyntheticUser(i) for i in range(users)]
+    teams = [people[i:i + team_size] for i in range(0, users, team_size)]
+
+    yield interleave([(team[0], registration_steps(team[0], num)) for num, team in enumerate(teams, 1)])
+    yield interleave([(member, join_steps(member, team[0])) for team in teams for member in team[1:]])
+    yield interleave([(user, report_steps(user, 1)) for user in people])
+    if with_reviews:
+        yield interleave([
+            (user, review_steps(user, team[(i + 1) % len(team)]))
+            for team in teams if len(team) > 1
+            for i, user in enumerate(team)
+        ])
+
+
+# Удаление синтетических пользователей (tg_id >= TG_ID_BASE) в порядке внешних ключей
+CLEANUP_QUERIES = (
+    "DELETE FROM team_members_ratings WHERE assessor_student_id IN "
+    "(SELECT student_id FROM students WHERE tg_id >= %s)",
+    "DELETE FROM sprint_reports WHERE student_id IN (SELECT student_id FROM students WHERE tg_id >= %s)",
+    "DELETE FROM team_members WHERE student_id IN (SELECT student_id FROM students WHERE tg_id >= %s)",
+    "DELETE FROM teams WHERE admin_student_id IN (SELECT student_id FROM students WHERE tg_id >= %s)",
+    "DELETE FROM students WHERE tg_id >= %s",
+)
+
+
+def cleanup():
+    """Удалить данные синтетических пользователей из тестовой базы"""
+    for query in CLEANUP_QUERIES:
+        myconn.insert_update(query, (TG_ID_BASE,))
+
+
+class UpdateWorkers:
+    """
+    Потоки обработки апдейтов.
+
+    У каждого потока своя очередь, пользователь закреплён за потоком по
+    tg_id, поэтому его апдейты обрабатываются по порядку, а апдейты разных
+    пользователей - параллельно.
+    """
+
+    def __init__(self, bot: telebot.TeleBot, count: int):
+        self.bot = bot
+        self.latencies: list[float] = []
+        self._lock = threading.Lock()
+        self._queues: list[queue.Queue] = [queue.Queue() for _ in range(count)]
+        self._threads = [
+            threading.Thread(target=self._run, args=(q,), name=f"load-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, tg_id: int, step: Step, scheduled: float):
+        self._queues[tg_id % len(self._queues)].put((step, scheduled))
+
+    def join(self):
+        """Дождаться обработки всех поставленных апдейтов"""
+        for q in self._queues:
+            q.join()
+
+    def stop(self):
+        for q in self._queues:
+            q.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self, q: queue.Queue):
+        while (item := q.get()) is not None:
+            step, scheduled = item
+            try:
+                self.bot.process_new_updates([step()])
+            except Exception as e:
+                logger.error(f"Update failed: {type(e).__name__}: {e!s}")
+            finally:
+                # Задержка от запланированного момента прихода апдейта до конца обработки
+                with self._lock:
+                    self.latencies.append(time.perf_counter() - scheduled)
+                q.task_done()
+
+
+def create_bot(api: FakeTelegramApi) -> tuple[telebot.TeleBot, Outbox]:
+    """Собрать бота так же, как main.py, но без polling и лимитов скорости"""
+    apihelper.CUSTOM_REQUEST_SENDER = api
+    return bot_main.create_bot(BOT_TOKEN, threaded=False, global_rate=1e9, per_chat_rate=1e9, per_chat_burst=1e9)
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def run(args) -> dict:
+    api = FakeTelegramApi(latency=args.api_latency / 1000)
+    bot, outbox = create_bot(api)
+
+    if args.reviews:
+        config.update('features.enable_reviews', True)
+
+    cleanup()
+    myconn.query_stats.reset()
+
+    workers = UpdateWorkers(bot, args.workers)
+    interval = 1 / args.rate if args.rate else 0
+    started = time.perf_counter()
+
+    for phase in build_phases(args.users, args.team_size, args.reviews):
+        phase_started = time.perf_counter()
+        for i, (tg_id, step) in enumerate(phase):
+            # Открытая модель нагрузки: апдейты приходят по расписанию, не дожидаясь обработки предыдущих
+            now = time.perf_counter()
+            scheduled = phase_started + i * interval if interval else now
+            if scheduled > now:
+                time.sleep(scheduled - now)
+            workers.submit(tg_id, step, scheduled)
+        # Следующая фаза зависит от результатов этой (коды приглашения, состав команд)
+        workers.join()
+
+    elapsed = time.perf_counter() - started
+    workers.stop()
+    latencies = workers.latencies
+    outbox.flush(timeout=60)
+    drained = time.perf_counter() - started
+    outbox.stop()
+
+    queries = myconn.query_stats.count
+    if not args.keep_data:
+        cleanup()
+
+    updates = len(latencies)
+    return {
+        'updates': updates,
+        'workers': args.workers,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_ups': round(updates / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 2),
+            'p95': round(percentile(latencies, 95) * 1000, 2),
+            'p99': round(percentile(latencies, 99) * 1000, 2),
+            'max': round(max(latencies, default=0) * 1000, 2),
+        },
+        'db_queries': queries,
+        'db_queries_per_update': round(queries / updates, 2) if updates else 0.0,
+        'db_time_s': round(myconn.query_stats.total_time, 3),
+        'api_calls': dict(api.calls),
+        'outbox_drain_s': round(drained - elapsed, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест обработчиков бота")
+    parser.add_argument("--users", type=int, default=50, help="Количество синтетических студентов")
+    parser.add_argument("--team-size", type=int, default=5, help="Размер команды")
+    parser.add_argument("--rate", type=float, default=0, help="Апдейтов в секунду (0 - без ограничения)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Потоков обработки апдейтов")
+    parser.add_argument("--api-latency", type=float, default=0, help="Задержка ответа Bot API, мс")
+    parser.add_argument("--reviews", action="store_true", help="Включить сценарий взаимного оценивания")
+    parser.add_argument("--keep-data", action="store_true", help="Не удалять данные после прогона")
+    parser.add_argument("--json", action="store_true", help="Вывести результат в JSON")
+    parser.add_argument("--log-level", default="WARNING", help="Уровень логирования обработчиков")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    result = run(args)
+
+    if args.json:
+        sys.stdout.write(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
+        return
+
+    latency = result['latency_ms']
+    sys.stdout.write(
+        f"Updates:        {result['updates']} in {result['elapsed_s']} s ({result['throughput_ups']} upd/s)\n"
+        f"Latency, ms:    p50={latency['p50']} p95={latency['p95']} p99={latency['p99']} max={latency['max']}\n"
+        f"DB queries:     {result['db_queries']} ({result['db_queries_per_update']} per update, "
+        f"{result['db_time_s']} s total)\n"
+        f"Bot API calls:  {result['api_calls']}\n"
+        f"Outbox drain:   {result['outbox_drain_s']} s\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Генератор синтетических данных для проверки масштабирования.
+
+Заполняет тестовую базу (config.database.test) командами, студентами,
+отчётами за шесть спринтов и плотной матрицей оценок: каждый участник
+оценивает каждого сокомандника. Объём задаётся множителем --scale от
+размера одного потока курса (BASE_TEAMS команд по --team-size человек),
+данные вставляются пачками (myconn.insert_many).
+
+Длины отчётов - логнормальное распределение (медиана около 400 символов,
+длинный хвост до 4000); часть студентов сдаёт не все спринты. Генерация
+детерминирована (--seed).
+
+С --measure после загрузки измеряется время страниц /teams и /reports
+(запросы web.db) и командного отчёта бота (db.team_get_member_stats).
+
+Запуск:
+    PYTHONPATH=src python benchmarks/datagen.py --scale 10 --measure
+    PYTHONPATH=src python benchmarks/datagen.py --cleanup
+    STUDTEAMS_DB_DRIVER=sqlite PYTHONPATH=src python benchmarks/datagen.py --scale 100 --measure
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Генератор всегда работает с тестовой базой
+os.environ['STUDTEAMS_DB'] = 'test'
+
+from loguru import logger
+
+import myconn
+from bot import db
+from sharedcache import shared_cache
+from web import db as web_db
+
+# Диапазон tg_id синтетических студентов (не пересекается с реальными и с другими бенчмарками)
+TG_ID_BASE = 7_200_000_000
+TG_ID_RANGE = 100_000_000
+
+# Коды приглашения синтетических команд: префикс + номер (всего 8 символов)
+INVITE_PREFIX = "Z"
+
+# Текущий размер курса (множитель --scale 1)
+BASE_TEAMS = 30
+SPRINTS = 6
+SPRINT_DAYS = 14
+COURSE_START = datetime(2025, 2, 3, 9, 0)
+
+ROLES = ("Разработчик", "Аналитик", "Тестировщик", "Дизайнер", "DevOps")
+WORDS = (
+    "сделано", "задача", "ревью", "тесты", "исправлен", "баг", "интеграция", "API", "бот", "отчёт",
+    "спринт", "планирую", "разобрался", "документация", "миграция", "база", "данных", "страница",
+    "команда", "встреча", "демо", "рефакторинг", "обработчик", "клавиатура", "деплой", "сервер",
+)
+
+
+def report_length(rng: random.Random) -> int:
+    """Длина текста отчёта: логнормальное распределение с медианой ~400 символов"""
+    return max(20, min(4000, int(rng.lognormvariate(6.0, 0.7))))
+
+
+def make_text(rng: random.Random, length: int) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+# Студенты синтетического диапазона tg_id (параметры - его границы)
+STUDENTS_IN_RANGE = "SELECT student_id FROM students WHERE tg_id BETWEEN %s AND %s"
+# Таблицы с данными студентов и колонка со student_id, в порядке удаления
+CLEANUP_TABLES = (
+    ('team_members_ratings', 'assessor_student_id'),
+    ('sprint_reports', 'student_id'),
+    ('team_members', 'student_id'),
+    ('teams', 'admin_student_id'),
+)
+
+
+def cleanup():
+    """Удалить синтетические данные из тестовой базы"""
+    tg_ids = (TG_ID_BASE, TG_ID_BASE + TG_ID_RANGE)
+    for table, column in CLEANUP_TABLES:
+        query = f"DELETE FROM {table} WHERE {column} IN ({STUDENTS_IN_RANGE})"  # noqa: S608 - имена из CLEANUP_TABLES
+        myconn.insert_update(query, tg_ids)
+    myconn.insert_update("DELETE FROM students WHERE tg_id BETWEEN %s AND %s", tg_ids)
+    shared_cache.bump('teams', 'reports')
+
+
+def generate(teams: int, team_size: int, seed: int, batch_size: int) -> dict:
+    """
+    Заполнить базу и вернуть количество вставленных строк по таблицам.
+
+    Студенты и команды вставляются пачками, их ID читаются обратно по
+    диапазону tg_id и кодам приглашения.
+    """
+    rng = random.Random(seed)
+    students_count = teams * team_size
+    counts = {}
+
+    counts['students'] = myconn.insert_many(
+        "INSERT INTO students (tg_id, name, group_num) VALUES (%s, %s, %s)",
+        (
+            (TG_ID_BASE + i, f"Студент {i:06d}", f"ГР-{i % 40:02d}")
+            for i in range(students_count)
+        ),
+        batch_size,
+    )
+    rows = myconn.select_all(
+        "SELECT student_id, tg_id FROM students WHERE tg_id BETWEEN %s AND %s",
+        (TG_ID_BASE, TG_ID_BASE + students_count - 1), use_dict=False,
+    )
+    student_ids = [student_id for student_id, _ in sorted(rows, key=lambda row: row[1])]
+    members = [student_ids[i * team_size:(i + 1) * team_size] for i in range(teams)]
+
+    counts['teams'] = myconn.insert_many(
+        "INSERT INTO teams (team_name, product_name, invite_code, admin_student_id) VALUES (%s, %s, %s, %s)",
+        (
+            (f"Команда {i:06d}", f"Продукт {i:06d}", f"{INVITE_PREFIX}{i:07d}", team[0])
+            for i, team in enumerate(members)
+        ),
+        batch_size,
+    )
+    rows = myconn.select_all(
+        "SELECT team_id, invite_code FROM teams WHERE admin_student_id BETWEEN %s AND %s",
+        (min(student_ids), max(student_ids)), use_dict=False,
+    )
+    team_ids = [team_id for team_id, _ in sorted(rows, key=lambda row: row[1])]
+
+    counts['team_members'] = myconn.insert_many(
+        "INSERT INTO team_members (team_id, student_id, role) VALUES (%s, %s, %s)",
+        (
+            (team_id, student_id, "Scrum Master" if position == 0 else rng.choice(ROLES))
+            for team_id, team in zip(team_ids, members, strict=True)
+            for position, student_id in enumerate(team)
+        ),
+        batch_size,
+    )
+
+    def reports():
+        for student_id in student_ids:
+            # Примерно каждый десятый студент перестаёт сдавать отчёты раньше конца курса
+            last_sprint = SPRINTS if rng.random() > 0.1 else rng.randint(1, SPRINTS)
+            for sprint in range(1, last_sprint + 1):
+                date = COURSE_START + timedelta(days=SPRINT_DAYS * sprint - rng.uniform(0, 3))
+                yield student_id, sprint, make_text(rng, report_length(rng)), date.replace(microsecond=0)
+
+    # Метаданные и тексты вставляются одними и теми же пачками: текст ссылается на строку метаданных
+    counts['sprint_reports'] = counts['sprint_report_bodies'] = 0
+    report_rows = reports()
+    while batch := list(itertools.islice(report_rows, batch_size)):
+        counts['sprint_reports'] += myconn.insert_many(
+            "INSERT INTO sprint_reports (student_id, sprint_num, report_date, report_length) VALUES (%s, %s, %s, %s)",
+            [(student_id, sprint, date, len(text)) for student_id, sprint, text, date in batch],
+            batch_size,
+        )
+        counts['sprint_report_bodies'] += myconn.insert_many(
+            "INSERT INTO sprint_report_bodies (student_id, sprint_num, report_text) VALUES (%s, %s, %s)",
+            [(student_id, sprint, text) for student_id, sprint, text, _ in batch],
+            batch_size,
+        )
+
+    def ratings():
+        rated_at = COURSE_START + timedelta(days=SPRINT_DAYS * SPRINTS)
+        for team in members:
+            for assessor in team:
+                for assessored in team:
+                    if assessor != assessored:
+                        yield (
+                            assessor, assessored, rng.randint(4, 10),
+                            make_text(rng, rng.randint(20, 300)), make_text(rng, rng.randint(20, 300)),
+                            rated_at + timedelta(minutes=rng.randint(0, 4 * 24 * 60)),
+                        )
+
+    counts['team_members_ratings'] = myconn.insert_many(
+        "INSERT INTO team_members_ratings "
+        "(assessor_student_id, assessored_student_id, overall_rating, advantages, disadvantages, rate_date) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        ratings(),
+        batch_size,
+    )
+    shared_cache.bump('teams', 'reports')
+    return {'counts': counts, 'team_ids': team_ids}
+
+
+def timed(call, repeat: int) -> dict:
+    """Медиана и максимум времени вызова, мс"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'median_ms': round(statistics.median(timings), 1),
+        'max_ms': round(max(timings), 1),
+        'rows': len(result) if isinstance(result, list) else 1,
+    }
+
+
+def measure(team_ids: list[int], repeat: int) -> dict:
+    """Время запросов страниц и командного отчёта бота на сгенерированных данных"""
+    team_id = team_ids[len(team_ids) // 2]
+    return {
+        '/teams (get_teams_with_members)': timed(web_db.get_teams_with_members, repeat),
+        '/reports (get_all_reports)': timed(web_db.get_all_reports, repeat),
+        '/reports?sprint=6': timed(lambda: web_db.get_all_reports(sprint_filter=SPRINTS), repeat),
+        '/reports statistics': timed(web_db.get_reports_statistics, repeat),
+        'bot team report (team_get_member_stats)': timed(lambda: db.team_get_member_stats(team_id), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Синтетические данные для проверки масштабирования")
+    parser.add_argument("--scale", type=int, default=10, help=f"Множитель объёма ({BASE_TEAMS} команд на единицу)")
+    parser.add_argument("--team-size", type=int, default=5, help="Участников в команде")
+    parser.add_argument("--seed", type=int, default=1, help="Зерно генератора")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Строк в одном INSERT")
+    parser.add_argument("--measure", action="store_true", help="Измерить запросы после загрузки")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов каждого измерения")
+    parser.add_argument("--keep-data", action="store_true", help="Не удалять данные после измерения")
+    parser.add_argument("--cleanup", action="store_true", help="Только удалить синтетические данные")
+    parser.add_argument("--json", action="store_true", help="Вывести результат в JSON")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    cleanup()
+    if args.cleanup:
+        return
+
+    teams = BASE_TEAMS * args.scale
+    if teams * args.team_size > TG_ID_RANGE:
+        parser.error("Too many students for the synthetic tg_id range")
+
+    started = time.perf_counter()
+    generated = generate(teams, args.team_size, args.seed, args.batch_size)
+    report = {
+        'driver': myconn.get_driver().description,
+        'scale': args.scale,
+        'counts': generated['counts'],
+        'load_s': round(time.perf_counter() - started, 2),
+    }
+    if args.measure:
+        report['timings'] = measure(generated['team_ids'], args.repeat)
+        # Данные для измерений не нужны после прогона, для ручной проверки есть --keep-data
+        if not args.keep_data:
+            cleanup()
+
+    if args.json:
+        sys.stdout.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+        return
+
+    lines = [f"{report['driver']}, scale x{args.scale}: loaded in {report['load_s']} s"]
+    lines += [f"  {table:24} {count:>10}" for table, count in report['counts'].items()]
+    lines += [
+        f"  {name:42} median {result['median_ms']:>9} ms  max {result['max_ms']:>9} ms  rows {result['rows']}"
+        for name, result in report.get('timings', {}).items()
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Сравнение драйверов MySQL (dbdriver) на запросах бота и веб-приложения.
+
+Заполняет тестовую базу (config.database.test) синтетическими студентами,
+командами и отчётами, затем для каждого установленного драйвера выполняет
+функции bot.db / web.db и измеряет задержку запроса (p50, p95) и скорость
+чтения строк. Не установленные драйверы пропускаются.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/db_drivers.py
+    PYTHONPATH=src python benchmarks/db_drivers.py --drivers mysql-connector pymysql --iterations 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+
+# Бенчмарк всегда работает с тестовой базой
+os.environ['STUDTEAMS_DB'] = 'test'
+
+from loguru import logger
+
+import dbdriver
+import myconn
+from bot import db
+from config import config
+from web import db as web_db
+
+# Диапазон tg_id синтетических студентов (не пересекается с реальными и с benchmarks/bot_load.py)
+TG_ID_BASE = 7_100_000_000
+TG_ID_RANGE = 1_000_000
+
+# Студенты синтетического диапазона tg_id (параметры - его границы)
+STUDENTS_IN_RANGE = "SELECT student_id FROM students WHERE tg_id BETWEEN %s AND %s"
+# Таблицы с данными студентов и колонка со student_id, в порядке удаления
+CLEANUP_TABLES = (
+    ('team_members_ratings', 'assessor_student_id'),
+    ('sprint_reports', 'student_id'),
+    ('team_members', 'student_id'),
+    ('teams', 'admin_student_id'),
+)
+
+
+class Dataset:
+    """Идентификаторы созданных данных, по которым выполняются запросы"""
+
+    def __init__(self):
+        self.tg_ids: list[int] = []
+        self.student_ids: list[int] = []
+        self.team_ids: list[int] = []
+        self.invite_codes: list[str] = []
+
+
+def cleanup():
+    """Удалить синтетические данные из тестовой базы"""
+    tg_ids = (TG_ID_BASE, TG_ID_BASE + TG_ID_RANGE)
+    for table, column in CLEANUP_TABLES:
+        query = f"DELETE FROM {table} WHERE {column} IN ({STUDENTS_IN_RANGE})"  # noqa: S608 - имена из CLEANUP_TABLES
+        myconn.insert_update(query, tg_ids)
+    myconn.insert_update("DELETE FROM students WHERE tg_id BETWEEN %s AND %s", tg_ids)
+
+
+def seed(students: int, team_size: int, sprints: int) -> Dataset:
+    """Создать студентов, команды и отчёты через функции bot.db"""
+    data = Dataset()
+    team_id = None
+    for i in range(students):
+        student = db.student_create(TG_ID_BASE + i, f"Driver Bench {i}", f"DB-{i % 10}")
+        data.tg_ids.append(student['tg_id'])
+        data.student_ids.append(student['student_id'])
+
+        if i % team_size == 0:
+            code = f"DRV{len(data.team_ids):05d}"
+            team = db.team_create(f"Driver Bench Team {i // team_size}", "Benchmark", code, student['student_id'])
+            team_id = team['team_id']
+            data.team_ids.append(team_id)
+            data.invite_codes.append(code)
+        db.team_add_member(team_id, student['student_id'], "Разработчик")
+
+        for sprint in range(1, sprints + 1):
+            db.report_create_or_update(student['student_id'], sprint, f"Отчёт {i} за спринт {sprint}. " * 5)
+    return data
+
+
+def use_driver(name: str):
+    """Переключить myconn на драйвер (соединения открываются заново)"""
+    myconn.close_connection()
+    # Общие курсоры принадлежат закрытому соединению
+    myconn.cursors.close_all()
+    myconn.prepared_statements = None
+    config.update('database.driver', name)
+
+
+def count_rows(result) -> int:
+    if result is None:
+        return 0
+    return len(result) if isinstance(result, list) else 1
+
+
+def query_cases(data: Dataset) -> dict[str, Callable[[int], object]]:
+    """Измеряемые запросы: функция от номера итерации"""
+    def pick(values: list, i: int):
+        return values[i % len(values)]
+
+    return {
+        'student_get_by_tg_id': lambda i: db.student_get_by_tg_id(pick(data.tg_ids, i)),
+        'team_get_by_invite_code': lambda i: db.team_get_by_invite_code(pick(data.invite_codes, i)),
+        'report_get_by_student': lambda i: db.report_get_by_student(pick(data.student_ids, i)),
+        'team_get_all_members': lambda i: db.team_get_all_members(pick(data.team_ids, i)),
+        'rating_get_stats': lambda i: db.rating_get_stats(pick(data.student_ids, i)),
+        'web.get_all_reports': lambda i: web_db.get_all_reports(),
+        'select_iter(sprint_reports)': lambda i: list(myconn.select_iter("SELECT * FROM sprint_reports")),
+    }
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def measure(case: Callable[[int], object], iterations: int) -> dict:
+    """Задержка запроса и скорость чтения строк"""
+    # Прогрев: соединение, подготовленные запросы, кэш сервера
+    for i in range(min(5, iterations)):
+        case(i)
+
+    latencies = []
+    rows = 0
+    for i in range(iterations):
+        started = time.perf_counter()
+        result = case(i)
+        latencies.append(time.perf_counter() - started)
+        rows += count_rows(result)
+
+    total = sum(latencies)
+    return {
+        'p50_us': round(percentile(latencies, 50) * 1e6, 1),
+        'p95_us': round(percentile(latencies, 95) * 1e6, 1),
+        'rows_per_call': round(rows / iterations, 1),
+        'rows_per_s': round(rows / total) if total else 0,
+    }
+
+
+def run(args) -> dict:
+    drivers = {}
+    for name in args.drivers:
+        try:
+            drivers[name] = dbdriver.get_driver(name).description
+        except ImportError as e:
+            logger.warning(f"Driver {name} skipped: {e}")
+
+    configured = config.get('database.driver', "mysql-connector")
+    cleanup()
+    data = seed(args.students, args.team_size, args.sprints)
+    results = {}
+    try:
+        for name in drivers:
+            use_driver(name)
+            results[name] = {
+                case_name: measure(case, args.iterations)
+                for case_name, case in query_cases(data).items()
+            }
+    finally:
+        use_driver(configured)
+        if not args.keep_data:
+            cleanup()
+    return {'drivers': drivers, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение драйверов MySQL на запросах бота")
+    parser.add_argument("--drivers", nargs="+", default=list(dbdriver.DRIVERS), choices=list(dbdriver.DRIVERS))
+    parser.add_argument("--iterations", type=int, default=200, help="Повторов каждого запроса")
+    parser.add_argument("--students", type=int, default=200, help="Синтетических студентов")
+    parser.add_argument("--team-size", type=int, default=5, help="Размер команды")
+    parser.add_argument("--sprints", type=int, default=3, help="Отчётов на студента")
+    parser.add_argument("--keep-data", action="store_true", help="Не удалять данные после прогона")
+    parser.add_argument("--json", action="store_true", help="Вывести результат в JSON")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    report = run(args)
+    if args.json:
+        sys.stdout.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+        return
+
+    lines = []
+    for name, description in report['drivers'].items():
+        lines += ["", description, f"  {'query':30} {'p50, us':>10} {'p95, us':>10} {'rows/call':>10} {'rows/s':>10}"]
+        lines += [
+            f"  {case_name:30} {result['p50_us']:10} {result['p95_us']:10}"
+            f" {result['rows_per_call']:10} {result['rows_per_s']:10}"
+            for case_name, result in report['results'][name].items()
+        ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
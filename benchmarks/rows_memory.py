@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Память и аллокации строк результата: словари против myconn.Record.
+
+Строки имеют форму результата web.db.get_all_reports (страница /reports).
+Из одних и тех же кортежей (как их отдаёт курсор) строятся список словарей
+(как у dictionary-курсора) и список записей Record; для каждого варианта
+измеряется прирост памяти и число блоков по tracemalloc, время построения
+и размер pickle (так список хранится в общем кэше веб-воркеров).
+
+База данных не нужна.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/rows_memory.py --rows 5000
+"""
+
+import argparse
+import itertools
+import json
+# Замеряется размер pickle собственных объектов (как в общем кэше), загрузки нет
+import pickle  # noqa: S403
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from myconn import record_class
+
+# Колонки запроса get_all_reports
+REPORT_COLUMNS = (
+    'student_id', 'sprint_num', 'report_date', 'report_text', 'student_name', 'group_num',
+    'team_name', 'product_name', 'role', 'is_admin', 'report_length',
+)
+
+
+def make_raw_rows(count: int) -> list[tuple]:
+    """Кортежи, как их возвращает курсор без dictionary=True"""
+    started = datetime(2025, 2, 1, 10, 0)
+    rows = []
+    for i in range(count):
+        text = f"Сделано: задача {i}, ревью, тесты. Планы: задача {i + 1}."
+        rows.append((
+            i, i % 8 + 1, started + timedelta(minutes=i), text, f"Студент {i}", f"ГР-{i % 20:02d}",
+            f"Команда {i % 40}", f"Продукт {i % 40}", "Разработчик", int(i % 5 == 0), len(text),
+        ))
+    return rows
+
+
+def as_dicts(rows: list[tuple]) -> list[dict]:
+    return [dict(zip(REPORT_COLUMNS, row, strict=True)) for row in rows]
+
+
+def as_records(rows: list[tuple]) -> list:
+    cls = record_class(REPORT_COLUMNS)
+    return list(itertools.starmap(cls, rows))
+
+
+def measure(build, rows: list[tuple]) -> dict:
+    """Память, число блоков и время построения списка строк"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    blocks_before = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    started = time.perf_counter()
+    result = build(rows)
+    elapsed = time.perf_counter() - started
+    after, _ = tracemalloc.get_traced_memory()
+    blocks_after = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    return {
+        'bytes': after - before,
+        'blocks': blocks_after - blocks_before,
+        'build_ms': elapsed * 1000,
+        'pickle_bytes': len(pickle.dumps(result, pickle.HIGHEST_PROTOCOL)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Память строк результата: dict против Record")
+    parser.add_argument("--rows", type=int, default=5000, help="Количество отчётов")
+    parser.add_argument("--json", action="store_true", help="Вывести результат в JSON")
+    args = parser.parse_args()
+
+    rows = make_raw_rows(args.rows)
+    # Класс записи создаётся один раз на форму запроса, не учитываем его в замере
+    record_class(REPORT_COLUMNS)
+    results = {'dict': measure(as_dicts, rows), 'record': measure(as_records, rows)}
+
+    if args.json:
+        sys.stdout.write(json.dumps(results, indent=2) + "\n")
+        return
+
+    lines = [
+        f"Rows: {args.rows} (shape of get_all_reports)",
+        f"  {'':8} {'memory, KiB':>12} {'blocks':>8} {'per row, B':>11} {'build, ms':>10} {'pickle, KiB':>12}",
+    ]
+    for name, result in results.items():
+        lines.append(
+            f"  {name:8} {result['bytes'] / 1024:12.1f} {result['blocks']:8} {result['bytes'] / args.rows:11.1f}"
+            f" {result['build_ms']:10.2f} {result['pickle_bytes'] / 1024:12.1f}",
+        )
+    saved = 1 - results['record']['bytes'] / results['dict']['bytes']
+    lines.append(f"  Record saves {saved:.0%} of row memory")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
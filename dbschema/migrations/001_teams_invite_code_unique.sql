@@ -0,0 +1,9 @@
+-- Уникальный индекс на код приглашения команды.
+-- Поиск команды по /start <код> становится поиском по индексу, а повтор
+-- кода при создании команды отклоняется базой (ошибка 1062, повтор с новым кодом).
+
+-- Перед применением проверьте, что повторов нет:
+-- SELECT invite_code, COUNT(*) FROM teams GROUP BY invite_code HAVING COUNT(*) > 1;
+
+ALTER TABLE `teams`
+  ADD UNIQUE KEY `uk_teams_invite_code` (`invite_code`);
@@ -0,0 +1,24 @@
+-- Тексты отчётов выносятся из sprint_reports в отдельную таблицу.
+-- Списки и подсчёты отчётов (report_get_by_student, статистика команд,
+-- фильтры /reports) читают только узкую таблицу метаданных, не затрагивая
+-- страницы с TEXT; длина текста хранится в метаданных (report_length).
+-- Текст читается по первичному ключу, только когда он показывается.
+
+ALTER TABLE `sprint_reports`
+  ADD COLUMN `report_length` INT NOT NULL DEFAULT 0 COMMENT 'Длина текста отчёта, символов' AFTER `report_date`;
+
+UPDATE `sprint_reports` SET `report_length` = CHAR_LENGTH(`report_text`);
+
+CREATE TABLE `sprint_report_bodies` (
+  `student_id` INT NOT NULL COMMENT 'ID студента',
+  `sprint_num` INT NOT NULL COMMENT 'Номер спринта/каденции',
+  `report_text` TEXT NOT NULL COMMENT 'Текст отчёта',
+  PRIMARY KEY (`student_id`, `sprint_num`),
+  CONSTRAINT `sprint_report_bodies_ibfk_1` FOREIGN KEY (`student_id`, `sprint_num`)
+    REFERENCES `sprint_reports` (`student_id`, `sprint_num`) ON DELETE CASCADE
+) COMMENT='Тексты отчётов о спринтах';
+
+INSERT INTO `sprint_report_bodies` (`student_id`, `sprint_num`, `report_text`)
+SELECT `student_id`, `sprint_num`, `report_text` FROM `sprint_reports`;
+
+ALTER TABLE `sprint_reports` DROP COLUMN `report_text`;
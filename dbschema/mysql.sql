@@ -17,6 +17,7 @@ CREATE TABLE `teams` (
   `admin_student_id` INT NOT NULL COMMENT 'ID студента - администратора команды',
   `invite_code` VARCHAR(8) NOT NULL COMMENT 'Код приглашения для telegram для вступления в команду',
   PRIMARY KEY (`team_id`),
+  UNIQUE KEY `uk_teams_invite_code` (`invite_code`),
   CONSTRAINT `teams_ibfk_1` FOREIGN KEY (`admin_student_id`)
     REFERENCES `students` (`student_id`)
 ) COMMENT='Студенческие команды';
@@ -34,11 +35,20 @@ CREATE TABLE `sprint_reports` (
   `student_id` INT NOT NULL COMMENT 'ID студента',
   `sprint_num` INT NOT NULL COMMENT 'Номер спринта/каденции',
   `report_date` TIMESTAMP NOT NULL COMMENT 'Дата/время отправки отчёта',
-  `report_text` TEXT NOT NULL COMMENT 'Текст отчёта',
+  `report_length` INT NOT NULL DEFAULT 0 COMMENT 'Длина текста отчёта, символов',
   PRIMARY KEY (`student_id`, `sprint_num`),
   CONSTRAINT `sprint_reports_ibfk_1` FOREIGN KEY (`student_id`) REFERENCES `students` (`student_id`)
 ) COMMENT='Отчёты о спринтах';
 
+CREATE TABLE `sprint_report_bodies` (
+  `student_id` INT NOT NULL COMMENT 'ID студента',
+  `sprint_num` INT NOT NULL COMMENT 'Номер спринта/каденции',
+  `report_text` TEXT NOT NULL COMMENT 'Текст отчёта',
+  PRIMARY KEY (`student_id`, `sprint_num`),
+  CONSTRAINT `sprint_report_bodies_ibfk_1` FOREIGN KEY (`student_id`, `sprint_num`)
+    REFERENCES `sprint_reports` (`student_id`, `sprint_num`) ON DELETE CASCADE
+) COMMENT='Тексты отчётов о спринтах';
+
 CREATE TABLE `team_members_ratings` (
   `assessor_student_id` INT NOT NULL COMMENT 'ID студента оценивающего',
   `assessored_student_id` INT NOT NULL COMMENT 'ID студента оцениваемого',
@@ -0,0 +1,67 @@
+-- Схема для встроенной базы SQLite (database.driver: sqlite).
+-- Соответствует mysql.sql со всеми миграциями; драйвер создаёт таблицы
+-- при первом подключении к пустому файлу базы.
+--
+-- Уникальные индексы называются uk_<таблица>_<колонки>: по этому имени
+-- myconn.is_duplicate_key узнаёт ключ из сообщения SQLite
+-- ("UNIQUE constraint failed: teams.invite_code").
+
+-- Студенты
+CREATE TABLE IF NOT EXISTS students (
+  student_id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID студента
+  tg_id INTEGER NOT NULL,                        -- telegram_id студента
+  name VARCHAR(64) NOT NULL,                     -- Имя Фамилия студента
+  group_num VARCHAR(16) DEFAULT NULL             -- Номер группы студента
+);
+
+-- Студенческие команды
+CREATE TABLE IF NOT EXISTS teams (
+  team_id INTEGER PRIMARY KEY AUTOINCREMENT,     -- ID команды
+  team_name VARCHAR(64) NOT NULL,                -- Название команды
+  product_name VARCHAR(100) NOT NULL,            -- Название продукта команды
+  admin_student_id INTEGER NOT NULL REFERENCES students (student_id),  -- ID администратора команды
+  invite_code VARCHAR(8) NOT NULL                -- Код приглашения для вступления в команду
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uk_teams_invite_code ON teams (invite_code);
+
+-- Членство в командах
+CREATE TABLE IF NOT EXISTS team_members (
+  team_id INTEGER NOT NULL REFERENCES teams (team_id),           -- ID команды
+  student_id INTEGER NOT NULL REFERENCES students (student_id),  -- ID студента
+  role VARCHAR(32) NOT NULL,                                     -- Роль участника
+  PRIMARY KEY (team_id, student_id)
+) WITHOUT ROWID;
+
+-- Отчёты о спринтах (метаданные)
+CREATE TABLE IF NOT EXISTS sprint_reports (
+  student_id INTEGER NOT NULL REFERENCES students (student_id),  -- ID студента
+  sprint_num INTEGER NOT NULL,                                   -- Номер спринта/каденции
+  report_date TIMESTAMP NOT NULL,                                -- Дата/время отправки отчёта
+  report_length INTEGER NOT NULL DEFAULT 0,                      -- Длина текста отчёта, символов
+  PRIMARY KEY (student_id, sprint_num)
+) WITHOUT ROWID;
+
+-- Тексты отчётов о спринтах
+CREATE TABLE IF NOT EXISTS sprint_report_bodies (
+  student_id INTEGER NOT NULL,  -- ID студента
+  sprint_num INTEGER NOT NULL,  -- Номер спринта/каденции
+  report_text TEXT NOT NULL,    -- Текст отчёта
+  PRIMARY KEY (student_id, sprint_num),
+  FOREIGN KEY (student_id, sprint_num) REFERENCES sprint_reports (student_id, sprint_num) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Взаимные оценки участников
+CREATE TABLE IF NOT EXISTS team_members_ratings (
+  assessor_student_id INTEGER NOT NULL REFERENCES students (student_id),    -- ID студента оценивающего
+  assessored_student_id INTEGER NOT NULL REFERENCES students (student_id),  -- ID студента оцениваемого
+  overall_rating INTEGER NOT NULL,                                          -- Общий рейтинг от 1 до 10
+  advantages TEXT NOT NULL,                                                 -- Позитивные стороны
+  disadvantages TEXT NOT NULL,                                              -- Негативные моменты
+  rate_date TIMESTAMP NOT NULL,                                             -- Дата/время выставления оценки
+  PRIMARY KEY (assessor_student_id, assessored_student_id)
+) WITHOUT ROWID;
+
+-- Индексы, которые InnoDB создаёт для внешних ключей автоматически
+CREATE INDEX IF NOT EXISTS idx_teams_admin_student_id ON teams (admin_student_id);
+CREATE INDEX IF NOT EXISTS idx_team_members_student_id ON team_members (student_id);
+CREATE INDEX IF NOT EXISTS idx_team_members_ratings_assessored ON team_members_ratings (assessored_student_id);
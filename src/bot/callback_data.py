@@ -0,0 +1,149 @@
+"""
+Компактное кодирование callback_data для inline-кнопок.
+
+Формат: '~' + base64url(версия | тип | поля (varint) | подпись HMAC-SHA256[:4]).
+
+- версия позволяет инвалидировать все ранее выданные кнопки при смене формата;
+- тип (CallbackKind) выбирает обработчик без разбора строк;
+- подпись защищает от подделанных и устаревших после смены ключа кнопок.
+
+Длина результата не превышает 64 байта (ограничение Telegram).
+"""
+
+import base64
+import enum
+import hashlib
+import hmac
+from typing import NamedTuple
+
+from config import config
+
+# Признак упакованных данных (не встречается в алфавите base64url)
+MARKER = "~"
+
+# Версия формата; при изменении все старые кнопки становятся недействительными
+VERSION = 1
+
+SIGNATURE_SIZE = 4
+MAX_CALLBACK_DATA_SIZE = 64
+
+
+class CallbackKind(enum.IntEnum):
+    """Типы упакованных callback-запросов"""
+    SPRINT = 1  # (sprint_num,)
+    RATING = 2  # (rating,)
+    TEAMMATE = 3  # (student_id,)
+    MEMBER = 4  # (student_id,)
+    EDIT_MEMBER = 5  # (team_id, student_id)
+    REMOVE_MEMBER = 6  # (team_id, student_id)
+    EDIT_REPORT = 7  # (sprint_num,)
+    DELETE_REPORT = 8  # (sprint_num,)
+
+
+class CallbackPayload(NamedTuple):
+    """Распакованные callback_data"""
+    kind: CallbackKind
+    args: tuple[int, ...]
+
+
+def _get_secret() -> bytes:
+    """Ключ подписи: отдельный секрет или токен бота"""
+    secret = config.get('bot.callback_secret') or config.get('bot.token') or ""
+    return str(secret).encode()
+
+
+_secret = _get_secret()
+
+
+def _sign(body: bytes) -> bytes:
+    return hmac.new(_secret, body, hashlib.sha256).digest()[:SIGNATURE_SIZE]
+
+
+def _write_varint(buf: bytearray, value: int):
+    if value < 0:
+        raise ValueError(f"Callback field must be non-negative: {value}")
+    while value >= 0x80:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _read_varints(body: bytes) -> tuple[int, ...]:
+    values = []
+    value = 0
+    shift = 0
+    for byte in body:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            if shift > 63:
+                raise ValueError("Varint is too long")
+        else:
+            values.append(value)
+            value = 0
+            shift = 0
+    if shift:
+        raise ValueError("Truncated varint")
+    return tuple(values)
+
+
+def pack(kind: CallbackKind, *args: int) -> str:
+    """
+    Упаковать callback_data.
+
+    Args:
+        kind: Тип callback-запроса
+        args: Целочисленные неотрицательные поля
+
+    Returns:
+        Строка для InlineKeyboardButton.callback_data
+    """
+    body = bytearray((VERSION, int(kind)))
+    for value in args:
+        _write_varint(body, int(value))
+    body += _sign(bytes(body))
+
+    data = MARKER + base64.urlsafe_b64encode(bytes(body)).rstrip(b"=").decode()
+    if len(data) > MAX_CALLBACK_DATA_SIZE:
+        raise ValueError(f"Callback data is too long: {len(data)} bytes")
+    return data
+
+
+def is_packed(data: str | None) -> bool:
+    """Проверяет, что callback_data упакованы этим модулем"""
+    return bool(data) and data.startswith(MARKER)
+
+
+def unpack(data: str) -> CallbackPayload | None:
+    """
+    Распаковать callback_data.
+
+    Returns:
+        CallbackPayload или None, если данные повреждены, подпись неверна
+        или кнопка выдана для другой версии формата
+    """
+    if not is_packed(data):
+        return None
+
+    encoded = data[len(MARKER):]
+    try:
+        raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    except ValueError:
+        return None
+
+    if len(raw) < 2 + SIGNATURE_SIZE:
+        return None
+
+    body, signature = raw[:-SIGNATURE_SIZE], raw[-SIGNATURE_SIZE:]
+    if not hmac.compare_digest(signature, _sign(body)):
+        return None
+    if body[0] != VERSION:
+        return None
+
+    try:
+        kind = CallbackKind(body[1])
+        args = _read_varints(body[2:])
+    except ValueError:
+        return None
+
+    return CallbackPayload(kind, args)
@@ -2,15 +2,22 @@
 Модуль работы с базой данных MySQL для Telegram бота StudHelper.
 
 Содержит функции для выполнения всех необходимых операций с базой данных.
+Функции записи сбрасывают общий кэш веб-приложения (sharedcache), чтобы
+все воркеры увидели изменения на страницах /teams и /reports. Списки
+участников команды строятся из кэшируемого состава команды (bot.roster).
 """
 
-from myconn import insert_update, select_all, select_one
+from bot import roster
+from myconn import insert_update, select_all, select_one, transaction
+from sharedcache import shared_cache
 
 
 def student_get_by_tg_id(tg_id: int):
     """
     Получение студента по Telegram ID.
 
+    Вызывается почти на каждый апдейт, поэтому запросы подготовленные.
+
     Args:
         tg_id: Telegram ID студента
 
@@ -23,7 +30,7 @@ def student_get_by_tg_id(tg_id: int):
         SELECT s.student_id, s.tg_id, s.name, s.group_num
         FROM students s
         WHERE s.tg_id = %s
-    """, (tg_id,)
+    """, (tg_id,), prepared=True
     )
 
     if not student:
@@ -38,7 +45,7 @@ def student_get_by_tg_id(tg_id: int):
         JOIN teams t ON tm.team_id = t.team_id
         JOIN students s2 ON t.admin_student_id = s2.student_id
         WHERE tm.student_id = %s
-    """, (student['student_id'],)
+    """, (student['student_id'],), prepared=True
     )
 
     if team_info:
@@ -84,6 +91,7 @@ def student_create(tg_id: int, name: str, group_num: str | None = None):
         VALUES (%s, %s, %s)
     """, (tg_id, name, group_num)
     )
+    shared_cache.bump('teams')
 
     return {
         'student_id': student_id,
@@ -103,19 +111,8 @@ def student_get_teammates(student_id: int):
     Returns:
         Список словарей с информацией об участниках команды
     """
-    return select_all(
-        """
-        SELECT DISTINCT s.student_id, s.name, tm.role
-        FROM students s
-        JOIN team_members tm ON s.student_id = tm.student_id
-        WHERE tm.team_id IN (
-            SELECT team_id
-            FROM team_members
-            WHERE student_id = %s
-        )
-        AND s.student_id != %s
-    """, (student_id, student_id)
-    )
+    team_id = roster.team_id_of(student_id)
+    return roster.teammates(team_id, student_id) if team_id else []
 
 
 def student_get_teammates_not_rated(assessor_id: int):
@@ -128,24 +125,8 @@ def student_get_teammates_not_rated(assessor_id: int):
     Returns:
         Список словарей с информацией об участниках команды, которых ещё не оценили
     """
-    return select_all(
-        """
-        SELECT DISTINCT s.student_id, s.name
-        FROM students s
-        JOIN team_members tm ON s.student_id = tm.student_id
-        WHERE tm.team_id IN (
-            SELECT team_id
-            FROM team_members
-            WHERE student_id = %s
-        )
-        AND s.student_id != %s
-        AND s.student_id NOT IN (
-            SELECT assessored_student_id
-            FROM team_members_ratings
-            WHERE assessor_student_id = %s
-        )
-    """, (assessor_id, assessor_id, assessor_id)
-    )
+    team_id = roster.team_id_of(assessor_id)
+    return roster.teammates_not_rated(team_id, assessor_id) if team_id else []
 
 
 def team_create(team_name: str, product_name: str, invite_code: str, admin_student_id: int):
@@ -167,6 +148,7 @@ def team_create(team_name: str, product_name: str, invite_code: str, admin_stude
         VALUES (%s, %s, %s, %s)
     """, (team_name, product_name, invite_code, admin_student_id)
     )
+    shared_cache.bump('teams', 'reports')
 
     return {
         'team_id': team_id,
@@ -193,7 +175,7 @@ def team_get_by_invite_code(invite_code: str):
         FROM teams t
         JOIN students s ON t.admin_student_id = s.student_id
         WHERE t.invite_code = %s
-    """, (invite_code,)
+    """, (invite_code,), prepared=True
     )
 
 
@@ -213,6 +195,8 @@ def team_add_member(team_id: int, student_id: int, role: str):
         ON DUPLICATE KEY UPDATE role = %s
     """, (team_id, student_id, role, role)
     )
+    roster.invalidate(team_id, student_id)
+    shared_cache.bump('teams', 'reports')
 
 
 def team_remove_member(team_id: int, student_id: int):
@@ -229,6 +213,8 @@ def team_remove_member(team_id: int, student_id: int):
         WHERE team_id = %s AND student_id = %s
     """, (team_id, student_id)
     )
+    roster.invalidate(team_id, student_id)
+    shared_cache.bump('teams', 'reports')
 
 
 def team_get_all_members(team_id: int):
@@ -241,75 +227,127 @@ def team_get_all_members(team_id: int):
     Returns:
         Список словарей с информацией о всех участниках команды, включая администратора
     """
-    return select_all(
-        """
-        SELECT DISTINCT s.student_id, s.name,
-            CASE
-                WHEN t.admin_student_id = s.student_id THEN 'Scrum Master'
-                ELSE tm.role
-            END as role
-        FROM students s
-        LEFT JOIN team_members tm ON s.student_id = tm.student_id AND tm.team_id = %s
-        JOIN teams t ON t.team_id = %s
-        WHERE tm.team_id = %s OR s.student_id = t.admin_student_id
-    """, (team_id, team_id, team_id)
-    )
+    return roster.all_members(team_id)
 
 
 def report_create_or_update(student_id: int, sprint_num: int, report_text: str):
     """
     Создание нового отчёта или обновление существующего
 
+    Метаданные (дата, длина текста) и текст хранятся в разных таблицах:
+    sprint_reports и sprint_report_bodies, записываются одной транзакцией.
+
     Args:
         student_id: ID студента
         sprint_num: Номер спринта
         report_text: Текст отчёта
     """
-    # Проверяем существует ли отчет
-    result = select_one(
-        """
-        SELECT COUNT(*) as cnt
-        FROM sprint_reports
-        WHERE student_id = %s AND sprint_num = %s
-    """, (student_id, sprint_num), use_dict=False
-    )
-
-    if result[0] > 0:
-        # Обновляем существующий отчет
+    report_length = len(report_text)
+    with transaction():
         insert_update(
             """
-            UPDATE sprint_reports
-            SET report_text = %s, report_date = NOW()
-            WHERE student_id = %s AND sprint_num = %s
-        """, (report_text, student_id, sprint_num)
+            INSERT INTO sprint_reports (student_id, sprint_num, report_date, report_length)
+            VALUES (%s, %s, NOW(), %s)
+            ON DUPLICATE KEY UPDATE report_date = NOW(), report_length = %s
+        """, (student_id, sprint_num, report_length, report_length)
         )
-    else:
-        # Создаем новый отчет
         insert_update(
             """
-            INSERT INTO sprint_reports (student_id, sprint_num, report_text, report_date)
-            VALUES (%s, %s, %s, NOW())
-        """, (student_id, sprint_num, report_text)
+            INSERT INTO sprint_report_bodies (student_id, sprint_num, report_text)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE report_text = %s
+        """, (student_id, sprint_num, report_text, report_text)
         )
+    shared_cache.bump('teams', 'reports')
 
 
 def report_get_by_student(student_id: int):
     """
-    Получение всех отчётов студента
+    Получение всех отчётов студента без текстов
 
     Args:
         student_id: ID студента
 
     Returns:
-        Список словарей с отчётами студента
+        Список словарей (student_id, sprint_num, report_date, report_length), упорядоченный по sprint_num
     """
     return select_all(
         """
-        SELECT *
+        SELECT student_id, sprint_num, report_date, report_length
         FROM sprint_reports
         WHERE student_id = %s
         ORDER BY sprint_num
-    """, (student_id,)
+    """, (student_id,), prepared=True
+    )
+
+
+def report_get_with_text_by_student(student_id: int):
+    """
+    Получение всех отчётов студента вместе с текстами (для списка «Мои отчёты»)
+
+    Args:
+        student_id: ID студента
+
+    Returns:
+        Список словарей (student_id, sprint_num, report_date, report_length, report_text),
+        упорядоченный по sprint_num
+    """
+    return select_all(
+        """
+        SELECT sr.student_id, sr.sprint_num, sr.report_date, sr.report_length, b.report_text
+        FROM sprint_reports sr
+        JOIN sprint_report_bodies b ON b.student_id = sr.student_id AND b.sprint_num = sr.sprint_num
+        WHERE sr.student_id = %s
+        ORDER BY sr.sprint_num
+    """, (student_id,), prepared=True
+    )
+
+
+def report_get_text(student_id: int, sprint_num: int):
+    """
+    Получение текста отчёта студента по конкретному спринту
+
+    Args:
+        student_id: ID студента
+        sprint_num: Номер спринта
+
+    Returns:
+        Текст отчёта или None, если отчёта нет
+    """
+    result = select_one(
+        """
+        SELECT report_text
+        FROM sprint_report_bodies
+        WHERE student_id = %s AND sprint_num = %s
+    """, (student_id, sprint_num), use_dict=False, prepared=True
+    )
+    return result[0] if result else None
+
+
+def report_get_missing_submitters(sprint_num: int):
+    """
+    Получение участников команд, не отправивших отчёт по спринту
+
+    Разность множеств team_members и sprint_reports считается одним
+    запросом (anti-join), без отдельного запроса на каждого студента.
+
+    Args:
+        sprint_num: Номер спринта
+
+    Returns:
+        Список словарей (student_id, tg_id, name, team_name), упорядоченный по student_id
+    """
+    return select_all(
+        """
+        SELECT s.student_id, s.tg_id, s.name, t.team_name
+        FROM team_members tm
+        JOIN students s ON s.student_id = tm.student_id
+        JOIN teams t ON t.team_id = tm.team_id
+        LEFT JOIN sprint_reports sr
+            ON sr.student_id = tm.student_id AND sr.sprint_num = %s
+        WHERE sr.student_id IS NULL
+        ORDER BY s.student_id
+    """, (sprint_num,)
     )
 
 
@@ -321,12 +359,14 @@ def report_delete(student_id: int, sprint_num: int):
         student_id: ID студента
         sprint_num: Номер спринта
     """
+    # Текст удаляется каскадно (внешний ключ sprint_report_bodies)
     insert_update(
         """
         DELETE FROM sprint_reports
         WHERE student_id = %s AND sprint_num = %s
     """, (student_id, sprint_num)
     )
+    shared_cache.bump('teams', 'reports')
     # Убран вызов myconn.commit() так как у нас включен autocommit
 
 
@@ -383,6 +423,105 @@ def rating_get_who_rated_me(student_id: int):
     )
 
 
+def rating_get_stats(student_id: int):
+    """
+    Сводка оценок, полученных студентом, одним запросом
+
+    Агрегаты считаются оконными функциями по строкам оценок, количество
+    участников команды - подзапросом, поэтому строка есть даже без оценок.
+
+    Args:
+        student_id: ID студента
+
+    Returns:
+        Словарь: count, average, min, max, distribution ({оценка: количество}),
+        assessors (список с assessor_name, overall_rating, rate_date по убыванию даты)
+        и total_teammates (участники команды кроме самого студента)
+    """
+    rows = select_all(
+        """
+        SELECT teammates.total_teammates, r.*
+        FROM (
+            SELECT COUNT(DISTINCT tm2.student_id) AS total_teammates
+            FROM team_members tm1
+            JOIN team_members tm2 ON tm2.team_id = tm1.team_id AND tm2.student_id != tm1.student_id
+            WHERE tm1.student_id = %s
+        ) teammates
+        LEFT JOIN (
+            SELECT s.name AS assessor_name, tmr.overall_rating, tmr.rate_date,
+                   COUNT(*) OVER () AS ratings_count,
+                   AVG(tmr.overall_rating) OVER () AS average_rating,
+                   MIN(tmr.overall_rating) OVER () AS min_rating,
+                   MAX(tmr.overall_rating) OVER () AS max_rating,
+                   COUNT(*) OVER (PARTITION BY tmr.overall_rating) AS rating_frequency
+            FROM team_members_ratings tmr
+            JOIN students s ON tmr.assessor_student_id = s.student_id
+            WHERE tmr.assessored_student_id = %s
+        ) r ON TRUE
+        ORDER BY r.rate_date DESC
+    """, (student_id, student_id)
+    )
+
+    first = rows[0] if rows else {}
+    rated = [row for row in rows if row['ratings_count']]
+    return {
+        'count': first.get('ratings_count') or 0,
+        'average': round(float(first['average_rating']), 1) if rated else 0,
+        'min': first.get('min_rating'),
+        'max': first.get('max_rating'),
+        'distribution': {row['overall_rating']: row['rating_frequency'] for row in rated},
+        'assessors': [
+            {key: row[key] for key in ('assessor_name', 'overall_rating', 'rate_date')}
+            for row in rated
+        ],
+        'total_teammates': first.get('total_teammates') or 0,
+    }
+
+
+def team_get_member_stats(team_id: int):
+    """
+    Статистика всех участников команды одним запросом
+
+    Args:
+        team_id: ID команды
+
+    Администратор входит в список, даже если у него нет строки в team_members.
+
+    Returns:
+        Список словарей: student_id, name, role, reports_count, ratings_given_count,
+        ratings_received_count, avg_rating (None если оценок нет)
+    """
+    return select_all(
+        """
+        SELECT s.student_id, s.name,
+            CASE
+                WHEN t.admin_student_id = s.student_id THEN 'Scrum Master'
+                ELSE tm.role
+            END as role,
+            (SELECT COUNT(*) FROM sprint_reports sr
+             WHERE sr.student_id = s.student_id) AS reports_count,
+            (SELECT COUNT(*) FROM team_members_ratings g
+             WHERE g.assessor_student_id = s.student_id) AS ratings_given_count,
+            (SELECT COUNT(*) FROM team_members_ratings r
+             WHERE r.assessored_student_id = s.student_id) AS ratings_received_count,
+            (SELECT ROUND(AVG(r.overall_rating), 1) FROM team_members_ratings r
+             WHERE r.assessored_student_id = s.student_id) AS avg_rating
+        FROM (
+            SELECT team_id, student_id, role FROM team_members WHERE team_id = %s
+            UNION ALL
+            SELECT a.team_id, a.admin_student_id, NULL FROM teams a
+            WHERE a.team_id = %s AND NOT EXISTS (
+                SELECT 1 FROM team_members am
+                WHERE am.team_id = a.team_id AND am.student_id = a.admin_student_id
+            )
+        ) tm
+        JOIN teams t ON t.team_id = tm.team_id
+        JOIN students s ON s.student_id = tm.student_id
+        ORDER BY t.admin_student_id = s.student_id DESC, s.name
+    """, (team_id, team_id)
+    )
+
+
 def rating_get_given_by_student(student_id: int):
     """
     Получение списка оценок, которые поставил данный студент
@@ -0,0 +1,138 @@
+"""
+Конечный автомат (FSM) диалогов бота.
+
+Состояние - небольшое целое число, которое выдаётся при объявлении
+State("Группа:шаг") в bot.states.user_states; имя нужно только для логов.
+Таблица автомата - список, индексированный ID состояния: обработчик
+текстового ввода и допустимые переходы. Поиск обработчика сообщения -
+одно обращение по индексу, без сравнения строк.
+
+Все диалоги объявляются одной таблицей в bot.handlers.dialogs.
+"""
+
+from collections.abc import Callable, Iterable
+from typing import ClassVar, NamedTuple
+
+import loguru
+
+from bot.state_storage import StateStorage, state_storage
+
+logger = loguru.logger
+
+Handler = Callable[..., None]
+
+
+class State(int):
+    """Состояние FSM: ID (индекс в таблице автомата) с именем для логов"""
+
+    __slots__ = ()
+
+    # Имена состояний по ID
+    _names: ClassVar[list[str]] = []
+
+    def __new__(cls, name: str):
+        if name in cls._names:
+            raise ValueError(f"State {name!r} is already declared")
+        state = super().__new__(cls, len(cls._names))
+        cls._names.append(name)
+        return state
+
+    @property
+    def name(self) -> str:
+        return State._names[self]
+
+    @property
+    def group(self) -> str:
+        """'JoinTeam' для 'JoinTeam:confirm'"""
+        return self.name.partition(':')[0]
+
+    def __repr__(self) -> str:
+        return f"<State {self.name}>"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def states_of(group: type) -> frozenset[State]:
+    """Все состояния, объявленные в классе-группе (например, JoinTeam)"""
+    return frozenset(value for value in vars(group).values() if isinstance(value, State))
+
+
+class StateRow(NamedTuple):
+    """Строка таблицы автомата"""
+    state: State
+    # Обработчик текстового ввода (None - сообщение уходит в маршруты по тексту кнопок)
+    handler: Handler | None = None
+    # Состояния, в которые можно перейти из этого
+    transitions: tuple[State, ...] = ()
+    # Начало диалога: вход разрешён из любого состояния
+    entry: bool = False
+
+
+class FSM:
+    """Таблица состояний и переходы пользователей между ними"""
+
+    def __init__(self, storage: StateStorage):
+        self.storage = storage
+        self._table: list[StateRow | None] = []
+
+    def add(self, row: StateRow):
+        """Добавить строку таблицы"""
+        if row.state >= len(self._table):
+            self._table.extend([None] * (row.state + 1 - len(self._table)))
+        if self._table[row.state] is not None:
+            raise ValueError(f"State {row.state.name!r} is already registered")
+        self._table[row.state] = row._replace(transitions=tuple(row.transitions))
+
+    def load(self, rows: Iterable[StateRow]):
+        """Добавить таблицу и проверить, что все переходы ведут в объявленные состояния"""
+        for row in rows:
+            self.add(row)
+        for row in self.rows():
+            for target in row.transitions:
+                if self.row(target) is None:
+                    raise ValueError(f"Transition {row.state.name} -> {target.name}: target is not registered")
+
+    def row(self, state: int | None) -> StateRow | None:
+        if state is None or state >= len(self._table):
+            return None
+        return self._table[state]
+
+    def rows(self) -> list[StateRow]:
+        return [row for row in self._table if row is not None]
+
+    def handler(self, state: int | None) -> Handler | None:
+        """Обработчик текстового ввода в состоянии"""
+        row = self.row(state)
+        return row.handler if row else None
+
+    def can_transition(self, current: int | None, state: int) -> bool:
+        """Объявлен ли переход current -> state в таблице"""
+        target = self.row(state)
+        if current is None or current == state or (target is not None and target.entry):
+            return True
+        row = self.row(current)
+        return row is not None and state in row.transitions
+
+    def get_state(self, user_id: int) -> State | None:
+        return self.storage.get_state(user_id)
+
+    def set_state(self, user_id: int, state: State):
+        """
+        Перевести пользователя в состояние.
+
+        Переход, которого нет в таблице, выполняется, но пишется в лог:
+        значит, таблица разошлась с обработчиками.
+        """
+        current = self.storage.get_state(user_id)
+        if not self.can_transition(current, state):
+            logger.warning(f"Undeclared FSM transition {current} -> {state} for user_id={user_id}")
+        self.storage.set_state(user_id, state)
+
+    def in_group(self, user_id: int, group: frozenset[State]) -> bool:
+        """Находится ли пользователь в одном из состояний группы"""
+        return self.storage.get_state(user_id) in group
+
+
+# Глобальный автомат
+fsm = FSM(state_storage)
@@ -6,11 +6,15 @@
 
 import telebot
 
-from bot import db
+from bot import db, roster
 from bot.bot_instance import bot
+from bot.callback_data import CallbackKind
+from bot.fsm import fsm
 from bot.keyboards import inline as inline_keyboards
 from bot.keyboards import reply as keyboards
+from bot.router import router
 from bot.state_storage import state_storage
+from bot.states.user_states import AdminActions
 from bot.utils import decorators as decorators
 from bot.utils import helpers as helpers
 
@@ -32,22 +36,8 @@ def get_team_member_stats(member_id: int) -> dict:
         # Получаем оценки, данные участником
         ratings_given = db.rating_get_given_by_student(member_id)
 
-        # Получаем оценки, полученные участником
-        ratings_received = db.rating_get_who_rated_me(member_id)
-
-        # Считаем среднюю оценку, если есть оценки
-        avg_rating = 0
-        if ratings_received:
-            total_rating = 0
-            count = 0
-            for rating in ratings_received:
-                if isinstance(rating, dict):
-                    total_rating += rating.get('overall_rating', 0)
-                else:
-                    total_rating += getattr(rating, 'overall_rating', 0)
-                count += 1
-            if count > 0:
-                avg_rating = round(total_rating / count, 1)
+        # Сводка полученных оценок считается в БД одним запросом
+        ratings = db.rating_get_stats(member_id)
 
         return {
             'success': True,
@@ -55,9 +45,12 @@ def get_team_member_stats(member_id: int) -> dict:
             'reports_count': len(reports),
             'ratings_given': ratings_given,
             'ratings_given_count': len(ratings_given),
-            'ratings_received': ratings_received,
-            'ratings_received_count': len(ratings_received),
-            'average_rating': avg_rating,
+            'ratings_received': ratings['assessors'],
+            'ratings_received_count': ratings['count'],
+            'average_rating': ratings['average'],
+            'min_rating': ratings['min'],
+            'max_rating': ratings['max'],
+            'rating_distribution': ratings['distribution'],
         }
 
     except Exception as e:
@@ -78,73 +71,30 @@ def get_team_overall_stats(team_id: int) -> dict:
         Словарь с общей статистикой команды
     """
     try:
-        # Получаем всех участников команды, включая администратора
-        all_members = db.team_get_all_members(team_id)
+        # Статистика всех участников одним запросом
+        members = db.team_get_member_stats(team_id)
 
-        if not all_members:
+        if not members:
             return {
                 'success': False,
                 'error': 'В команде нет участников',
             }
 
-        # Собираем статистику для каждого участника
-        team_stats = []
-
-        for member in all_members:
-            # Получаем ID участника
-            member_id = ""
-            member_name = ""
-            member_role = ""
-
-            if isinstance(member, dict):
-                member_id = member.get('student_id', '')
-                member_name = member.get('name', 'Неизвестно')
-                member_role = member.get('role', 'Участник')
-            else:
-                member_id = getattr(member, 'student_id', '')
-                member_name = getattr(member, 'name', 'Неизвестно')
-                member_role = getattr(member, 'role', 'Участник')
-
-            # Получаем количество отчетов
-            # Конвертируем member_id в int если это строка
-            member_id_int = int(member_id) if isinstance(member_id, str) else member_id
-            reports = db.report_get_by_student(member_id_int)
-            reports_count = len(reports) if reports else 0
-
-            # Получаем количество оценок, данных участником
-            ratings_given = db.rating_get_given_by_student(member_id_int)
-            ratings_given_count = len(ratings_given) if ratings_given else 0
-
-            # Получаем количество оценок, полученных участником
-            ratings_received = db.rating_get_who_rated_me(member_id_int)
-            ratings_received_count = len(ratings_received) if ratings_received else 0
-
-            # Считаем среднюю оценку, если есть оценки
-            avg_rating = 0
-            if ratings_received:
-                total_rating = 0
-                count = 0
-                for rating in ratings_received:
-                    if isinstance(rating, dict):
-                        total_rating += rating.get('overall_rating', 0)
-                    else:
-                        total_rating += getattr(rating, 'overall_rating', 0)
-                    count += 1
-                if count > 0:
-                    avg_rating = round(total_rating / count, 1)
-
-            team_stats.append({
-                'name': member_name,
-                'role': member_role,
-                'reports_count': reports_count,
-                'ratings_given_count': ratings_given_count,
-                'ratings_received_count': ratings_received_count,
-                'avg_rating': avg_rating,
-            })
+        team_stats = [
+            {
+                'name': member['name'],
+                'role': member['role'],
+                'reports_count': member['reports_count'],
+                'ratings_given_count': member['ratings_given_count'],
+                'ratings_received_count': member['ratings_received_count'],
+                'avg_rating': float(member['avg_rating'] or 0),
+            }
+            for member in members
+        ]
 
         return {
             'success': True,
-            'members': all_members,
+            'members': members,
             'stats': team_stats,
         }
 
@@ -252,7 +202,7 @@ def process_member_selection(message: telebot.types.Message, ):
 
     # Сохраняем выбранного участника в состоянии
     state_storage.update_data(message.from_user.id, selected_member=selected_member)
-    state_storage.set_state(message.from_user.id, "states.AdminActions.confirm_removal")
+    fsm.set_state(message.from_user.id, AdminActions.confirm_removal)
 
     # Подтверждение удаления
     keyboard = keyboards.get_confirmation_keyboard("Подтвердить", "Отмена")
@@ -358,7 +308,7 @@ def handle_view_member_stats(message: telebot.types.Message, ):
         bot.send_message(message.chat.id, "❌ Недостаточно прав.")
         return
 
-    teammates = db.student_get_teammates(student['student_id'])
+    teammates = roster.teammates(student['team']['team_id'], student['student_id'])
 
     if not teammates:
         bot.send_message(message.chat.id, "👥 В команде нет других участников.")
@@ -366,19 +316,15 @@ def handle_view_member_stats(message: telebot.types.Message, ):
 
     # Сохраняем список участников в состоянии
     state_storage.update_data(message.from_user.id, teammates=teammates)
-    state_storage.set_state(message.from_user.id, "states.AdminActions.select_member_stats")
+    fsm.set_state(message.from_user.id, AdminActions.select_member_stats)
 
     # Создаем клавиатуру с выбором участников
-    teammate_names = []
-    for teammate in teammates:
-        # Ensure teammate is a dictionary
-        if isinstance(teammate, dict):
-            teammate_names.append(teammate['name'])
-        else:
-            # Handle case where teammate might be a different type
-            teammate_names.append(getattr(teammate, 'name', 'Неизвестно'))
+    teammate_names = [teammate['name'] for teammate in teammates]
+    teammate_ids = [teammate['student_id'] for teammate in teammates]
 
-    keyboard = inline_keyboards.get_dynamic_inline_keyboard(teammate_names, "member", columns=2)
+    keyboard = inline_keyboards.get_dynamic_inline_keyboard(
+        teammate_names, CallbackKind.MEMBER, teammate_ids, columns=2,
+    )
 
     bot.send_message(
 
@@ -464,7 +410,8 @@ def process_member_stats_selection(message: telebot.types.Message, ):
         stats_text += "⭐ *Оценки, данные другими:*\n"
         if stats['ratings_received']:
             stats_text += f"Получено: {stats['ratings_received_count']}\n"
-            stats_text += f"Средняя оценка: {stats['average_rating']:.1f}/10\n\n"
+            stats_text += f"Средняя оценка: {stats['average_rating']:.1f}/10\n"
+            stats_text += f"Мин/макс: {stats['min_rating']}/{stats['max_rating']}\n\n"
         else:
             stats_text += "Пока никто не оценил\n\n"
 
@@ -538,17 +485,6 @@ def cancel_admin_action(message: telebot.types.Message, ):
 
 def register_admin_handlers(bot_instance: telebot.TeleBot):
     """Регистрация обработчиков административных функций"""
-    bot_instance.register_message_handler(
-        handle_admin_panel,
-        func=lambda m: m.text == "🔧 Админ панель"
-    )
-    bot_instance.register_message_handler(
-        handle_view_team_members,
-        func=lambda m: m.text == "👥 Участники команды"
-    )
-    bot_instance.register_message_handler(
-        handle_view_member_stats,
-        func=lambda m: m.text == "📊 Статистика участника"
-    )
-
-    # FSM для просмотра статистики
+    router.text("🔧 Админ панель", handle_admin_panel)
+    router.text("👥 Участники команды", handle_view_team_members)
+    router.text("📊 Статистика участника", handle_view_member_stats)
@@ -6,14 +6,22 @@
 
 import telebot
 
-from bot import db
+from bot import db, invites
+from bot.bot_instance import bot
+from bot.callback_data import CallbackKind
+from bot.fsm import fsm, states_of
 from bot.keyboards import inline as inline_keyboards
 from bot.keyboards import reply as keyboards
+from bot.router import router
 from bot.state_storage import state_storage
+from bot.states.user_states import JoinTeam, ReportCreation, ReviewProcess
 from bot.utils import decorators as decorators
 from bot.utils import helpers as helpers
 from config import config
 
+# Состояния присоединения к команде (кнопка отмены ведёт себя в них иначе)
+JOIN_TEAM_STATES = states_of(JoinTeam)
+
 # Team Registration Callbacks
 
 
@@ -37,13 +45,12 @@ def callback_confirm_team_registration(
             )
 
         # Создаем команду
-        invite_code = helpers.generate_invite_code()
-        team = db.team_create(
+        team = invites.create_team(
             team_name=data['team_name'],
             product_name=data['product_name'],
-            invite_code=invite_code,
             admin_student_id=student['student_id'],
         )
+        invite_code = team['invite_code']
 
         # Добавляем администратора в команду
         db.team_add_member(
@@ -63,25 +70,29 @@ def callback_confirm_team_registration(
         )
 
         if callback.message:
-            callback.message.edit_text(
-                f"🎉 *Команда успешно создана!*\n\n"
+            bot.edit_message_text(
+                chat_id=callback.message.chat.id,
+                message_id=callback.message.message_id,
+                text=f"🎉 *Команда успешно создана!*\n\n"
                 f"👥 Команда: {data['team_name']}\n"
                 f"📱 Продукт: {data['product_name']}\n"
                 f"{invite_link_text}",
                 parse_mode="Markdown",
             )
 
-            callback.bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
+            bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
 
     except Exception as e:
         if callback.message:
-            callback.message.edit_text(
-                f"❌ Ошибка при создании команды: {e!s}\n"
+            bot.edit_message_text(
+                chat_id=callback.message.chat.id,
+                message_id=callback.message.message_id,
+                text=f"❌ Ошибка при создании команды: {e!s}\n"
                 f"Попробуйте еще раз или обратитесь к администратору.",
             )
         state_storage.clear_state(callback.from_user.id)
 
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_cancel_team_reg")
@@ -93,9 +104,9 @@ def callback_cancel_team_registration(
     keyboard = keyboards.get_main_menu_keyboard(is_admin=False, has_team=False)
 
     if callback.message:
-        callback.message.edit_text("❌ Регистрация команды отменена.")
-        callback.bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
-    callback.answer()
+        bot.edit_message_text("❌ Регистрация команды отменена.", callback.message.chat.id, callback.message.message_id)
+        bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
+    bot.answer_callback_query(callback.id)
 
 # Role Selection Callbacks
 
@@ -110,26 +121,17 @@ def callback_role_selection(callback: telebot.types.CallbackQuery):
         "role_member": "Участник команды",
     }
 
-    if callback.data == "cancel":
-        # Проверяем текущее состояние, чтобы понять контекст отмены
-        current_state = state_storage.get_state(callback.from_user.id)
-        if current_state and "JoinTeam" in str(current_state):
-            callback_cancel_join_team(callback)
-        else:
-            callback_cancel_action(callback)
-        return
-
     if not callback.data:
-        callback.answer("❌ Неверные данные")
+        bot.answer_callback_query(callback.id, "❌ Неверные данные")
         return
 
     role = role_mapping.get(callback.data)
     if not role:
-        callback.answer("❌ Неверная роль")
+        bot.answer_callback_query(callback.id, "❌ Неверная роль")
         return
 
     state_storage.update_data(callback.from_user.id, user_role=role)
-    state_storage.set_state(callback.from_user.id, "states.JoinTeam.confirm")
+    fsm.set_state(callback.from_user.id, JoinTeam.confirm)
 
     # Показываем данные для подтверждения
     data = state_storage.get_data(callback.from_user.id)
@@ -144,12 +146,14 @@ def callback_role_selection(callback: telebot.types.CallbackQuery):
     )
 
     if callback.message:
-        callback.message.edit_text(
-            confirmation_text,
+        bot.edit_message_text(
+            chat_id=callback.message.chat.id,
+            message_id=callback.message.message_id,
+            text=confirmation_text,
             reply_markup=inline_keyboards.get_join_team_confirm_keyboard(),
             parse_mode="Markdown",
         )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 # Join Team Callbacks
 
@@ -166,7 +170,7 @@ def callback_confirm_join_team(callback: telebot.types.CallbackQuery):
         if not student:
             # Создаём нового пользователя - данные должны быть в state
             if 'user_name' not in data or 'user_group' not in data:
-                callback.answer("❌ Ошибка: недостаточно данных")
+                bot.answer_callback_query(callback.id, "❌ Ошибка: недостаточно данных")
                 return
 
             student = db.student_create(
@@ -188,8 +192,10 @@ def callback_confirm_join_team(callback: telebot.types.CallbackQuery):
         keyboard = keyboards.get_main_menu_keyboard(is_admin=False, has_team=True)
 
         if callback.message:
-            callback.message.edit_text(
-                f"🎉 *Добро пожаловать в команду!*\n\n"
+            bot.edit_message_text(
+                chat_id=callback.message.chat.id,
+                message_id=callback.message.message_id,
+                text=f"🎉 *Добро пожаловать в команду!*\n\n"
                 f"👥 Команда: {data['team_name']}\n"
                 f"💼 Ваша роль: {data['user_role']}\n\n"
                 f"Теперь вы можете отправлять отчеты о проделанной работе и "
@@ -197,17 +203,19 @@ def callback_confirm_join_team(callback: telebot.types.CallbackQuery):
                 parse_mode="Markdown",
             )
 
-            callback.bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
+            bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
 
     except Exception as e:
         if callback.message:
-            callback.message.edit_text(
-                f"❌ Ошибка при присоединении к команде: {e!s}\n"
+            bot.edit_message_text(
+                chat_id=callback.message.chat.id,
+                message_id=callback.message.message_id,
+                text=f"❌ Ошибка при присоединении к команде: {e!s}\n"
                 f"Попробуйте еще раз или обратитесь к администратору.",
             )
         state_storage.clear_state(callback.from_user.id)
 
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_cancel_join_team")
@@ -217,10 +225,12 @@ def callback_cancel_join_team(callback: telebot.types.CallbackQuery, ):
     keyboard = keyboards.get_main_menu_keyboard(is_admin=False, has_team=False)
 
     if callback.message:
-        callback.message.edit_text("❌ Присоединение к команде отменено.")
+        bot.edit_message_text(
+            "❌ Присоединение к команде отменено.", callback.message.chat.id, callback.message.message_id,
+        )
 
-        callback.bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
-    callback.answer()
+        bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
+    bot.answer_callback_query(callback.id)
 
 
 # Report Callbacks
@@ -244,38 +254,44 @@ def callback_confirm_report(callback: telebot.types.CallbackQuery, ):
         # Показываем сообщение об успешном сохранении
         if callback.message:
             if is_editing:
-                callback.message.edit_text(
-                    f"✅ *Отчет успешно обновлен!*\n\n"
+                bot.edit_message_text(
+                    chat_id=callback.message.chat.id,
+                    message_id=callback.message.message_id,
+                    text=f"✅ *Отчет успешно обновлен!*\n\n"
                     f"📊 Спринт: №{data['sprint_num']}\n"
                     f"📅 Дата: {helpers.format_datetime('now')}",
                     parse_mode="Markdown",
                 )
             else:
-                callback.message.edit_text(
-                    f"✅ *Отчет успешно отправлен!*\n\n"
+                bot.edit_message_text(
+                    chat_id=callback.message.chat.id,
+                    message_id=callback.message.message_id,
+                    text=f"✅ *Отчет успешно отправлен!*\n\n"
                     f"📊 Спринт: №{data['sprint_num']}\n"
                     f"📅 Дата: {helpers.format_datetime('now')}",
                     parse_mode="Markdown",
                 )
 
             # Переходим на страницу "Мои отчёты"
-            reports = db.report_get_by_student(student['student_id'])
+            reports = db.report_get_with_text_by_student(student['student_id'])
             report_text = helpers.format_reports_list(reports)
             keyboard = inline_keyboards.get_report_management_keyboard(reports)
-            callback.bot.send_message(
+            bot.send_message(
                 callback.message.chat.id, report_text,
                 parse_mode="Markdown", reply_markup=keyboard
             )
 
     except Exception as e:
         if callback.message:
-            callback.message.edit_text(
-                f"❌ Ошибка при сохранении отчета: {e!s}\n"
+            bot.edit_message_text(
+                chat_id=callback.message.chat.id,
+                message_id=callback.message.message_id,
+                text=f"❌ Ошибка при сохранении отчета: {e!s}\n"
                 f"Попробуйте еще раз.",
             )
         state_storage.clear_state(callback.from_user.id)
 
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_cancel_report")
@@ -285,7 +301,7 @@ def callback_cancel_report(callback: telebot.types.CallbackQuery, ):
     student = db.student_get_by_tg_id(callback.from_user.id)
 
     if callback.message:
-        callback.message.edit_text("❌ Отправка отчета отменена.")
+        bot.edit_message_text("❌ Отправка отчета отменена.", callback.message.chat.id, callback.message.message_id)
 
         if student:
             has_team = 'team' in student
@@ -297,53 +313,42 @@ def callback_cancel_report(callback: telebot.types.CallbackQuery, ):
         else:
             keyboard = keyboards.get_main_menu_keyboard(is_admin=False, has_team=False)
 
-        callback.bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
-    callback.answer()
+        bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_edit_report")
 def callback_edit_report(callback: telebot.types.CallbackQuery, ):
     """Callback обработчик редактирования отчета"""
-    if not callback.data or not callback.data.startswith("edit_report_"):
-        callback.answer("❌ Неверные данные")
-        return
-
-    # Извлекаем номер спринта из callback_data
-    try:
-        sprint_num = int(callback.data.split("_")[-1])
-    except (ValueError, IndexError):
-        callback.answer("❌ Неверные данные")
-        return
+    # Номер спринта уже распакован маршрутизатором из callback_data
+    sprint_num, = callback.payload.args
 
     student = db.student_get_by_tg_id(callback.from_user.id)
 
-    # Получаем существующий отчет
-    reports = db.report_get_by_student(student['student_id'])
-    report_to_edit = None
-    for report in reports:
-        if report['sprint_num'] == sprint_num:
-            report_to_edit = report
-            break
+    # Получаем текст существующего отчета
+    current_text = db.report_get_text(student['student_id'], sprint_num)
 
-    if not report_to_edit:
-        callback.answer("❌ Отчет не найден")
+    if current_text is None:
+        bot.answer_callback_query(callback.id, "❌ Отчет не найден")
         return
 
     # Сохраняем данные в состоянии
     state_storage.update_data(
         callback.from_user.id,
         sprint_num=sprint_num,
-        report_text=report_to_edit['report_text'],
+        report_text=current_text,
         editing=True,
     )
 
-    state_storage.set_state(callback.from_user.id, "states.ReportCreation.report_text")
+    fsm.set_state(callback.from_user.id, ReportCreation.report_text)
 
     if callback.message:
-        report_preview = report_to_edit['report_text'][:200]
-        ellipsis = '...' if len(report_to_edit['report_text']) > 200 else ''
-        callback.message.edit_text(
-            f"📝 *Редактирование отчета*\n\n"
+        report_preview = current_text[:200]
+        ellipsis = '...' if len(current_text) > 200 else ''
+        bot.edit_message_text(
+            chat_id=callback.message.chat.id,
+            message_id=callback.message.message_id,
+            text=f"📝 *Редактирование отчета*\n\n"
             f"📊 Спринт: №{sprint_num}\n\n"
             f"Текущий текст отчета:\n{report_preview}{ellipsis}\n\n"
             f"Введите новый текст отчета:",
@@ -352,22 +357,14 @@ def callback_edit_report(callback: telebot.types.CallbackQuery, ):
             ),
             parse_mode="Markdown",
         )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_delete_report_inline")
 def callback_delete_report_inline(callback: telebot.types.CallbackQuery, ):
     """Callback обработчик удаления отчета (из inline клавиатуры)"""
-    if not callback.data or not callback.data.startswith("delete_report_"):
-        callback.answer("❌ Неверные данные")
-        return
-
-    # Извлекаем номер спринта из callback_data
-    try:
-        sprint_num = int(callback.data.split("_")[-1])
-    except (ValueError, IndexError):
-        callback.answer("❌ Неверные данные")
-        return
+    # Номер спринта уже распакован маршрутизатором из callback_data
+    sprint_num, = callback.payload.args
 
     student = db.student_get_by_tg_id(callback.from_user.id)
 
@@ -378,14 +375,16 @@ def callback_delete_report_inline(callback: telebot.types.CallbackQuery, ):
     )
 
     if callback.message:
-        callback.message.edit_text(
-            f"⚠️ *Подтверждение удаления*\n\n"
+        bot.edit_message_text(
+            chat_id=callback.message.chat.id,
+            message_id=callback.message.message_id,
+            text=f"⚠️ *Подтверждение удаления*\n\n"
             f"Вы действительно хотите удалить отчет за *Спринт №{sprint_num}*?\n\n"
             f"*Это действие нельзя отменить!*",
             reply_markup=inline_keyboards.get_report_delete_confirm_keyboard(),
             parse_mode="Markdown",
         )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_confirm_delete_report")
@@ -402,30 +401,34 @@ def callback_confirm_delete_report(callback: telebot.types.CallbackQuery, ):
         state_storage.clear_state(callback.from_user.id)
 
         if callback.message:
-            callback.message.edit_text(
-                f"✅ *Отчет за Спринт №{data['sprint_num']} успешно удален!*",
+            bot.edit_message_text(
+                chat_id=callback.message.chat.id,
+                message_id=callback.message.message_id,
+                text=f"✅ *Отчет за Спринт №{data['sprint_num']} успешно удален!*",
                 parse_mode="Markdown",
             )
 
             # Переходим на страницу "Мои отчёты"
             student = db.student_get_by_tg_id(callback.from_user.id)
-            reports = db.report_get_by_student(student['student_id'])
+            reports = db.report_get_with_text_by_student(student['student_id'])
             report_text = helpers.format_reports_list(reports)
             keyboard = inline_keyboards.get_report_management_keyboard(reports)
-            callback.bot.send_message(
+            bot.send_message(
                 callback.message.chat.id, report_text,
                 parse_mode="Markdown", reply_markup=keyboard
             )
 
     except Exception as e:
         if callback.message:
-            callback.message.edit_text(
-                f"❌ Ошибка при удалении отчета: {e!s}\n"
+            bot.edit_message_text(
+                chat_id=callback.message.chat.id,
+                message_id=callback.message.message_id,
+                text=f"❌ Ошибка при удалении отчета: {e!s}\n"
                 f"Попробуйте еще раз.",
             )
         state_storage.clear_state(callback.from_user.id)
 
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_cancel_delete_report")
@@ -435,17 +438,17 @@ def callback_cancel_delete_report(callback: telebot.types.CallbackQuery, ):
     student = db.student_get_by_tg_id(callback.from_user.id)
 
     if callback.message:
-        callback.message.edit_text("❌ Удаление отчета отменено.")
+        bot.edit_message_text("❌ Удаление отчета отменено.", callback.message.chat.id, callback.message.message_id)
 
         # Переходим на страницу "Мои отчёты"
-        reports = db.report_get_by_student(student['student_id'])
+        reports = db.report_get_with_text_by_student(student['student_id'])
         report_text = helpers.format_reports_list(reports)
         keyboard = inline_keyboards.get_report_management_keyboard(reports)
-        callback.bot.send_message(
+        bot.send_message(
             callback.message.chat.id, report_text,
             parse_mode="Markdown", reply_markup=keyboard
         )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 # Review Callbacks
@@ -468,8 +471,10 @@ def callback_confirm_review(callback: telebot.types.CallbackQuery, ):
             state_storage.clear_state(callback.from_user.id)
 
             if callback.message:
-                callback.message.edit_text(
-                    f"✅ *Оценка успешно отправлена!*\n\n"
+                bot.edit_message_text(
+                    chat_id=callback.message.chat.id,
+                    message_id=callback.message.message_id,
+                    text=f"✅ *Оценка успешно отправлена!*\n\n"
                     f"👤 Участник: {data['teammate_name']}\n"
                     f"⭐ Оценка: {data['overall_rating']}/10",
                     parse_mode="Markdown",
@@ -480,7 +485,7 @@ def callback_confirm_review(callback: telebot.types.CallbackQuery, ):
                     teammates_to_rate = db.student_get_teammates_not_rated(student['student_id'])
 
                     if not teammates_to_rate:
-                        callback.bot.send_message(
+                        bot.send_message(
                             callback.message.chat.id,
                             "✅ Вы уже оценили всех участников команды!\n\n"
                             "Используйте кнопку \"Кто меня оценил?\" чтобы посмотреть свои оценки.",
@@ -488,13 +493,15 @@ def callback_confirm_review(callback: telebot.types.CallbackQuery, ):
                     else:
                         # Создаем список имен для выбора
                         teammate_names = [teammate['name'] for teammate in teammates_to_rate]
+                        teammate_ids = [teammate['student_id'] for teammate in teammates_to_rate]
 
-                        state_storage.set_state(callback.from_user.id, "states.ReviewProcess.teammate_selection")
+                        state_storage.update_data(callback.from_user.id, teammates_to_rate=teammates_to_rate)
+                        fsm.set_state(callback.from_user.id, ReviewProcess.teammate_selection)
 
                         keyboard = inline_keyboards.get_dynamic_inline_keyboard(
-                            teammate_names, "teammate", columns=2,
+                            teammate_names, CallbackKind.TEAMMATE, teammate_ids, columns=2,
                         )
-                        callback.bot.send_message(
+                        bot.send_message(
                             callback.message.chat.id,
                             "⭐ *Оценивание участников команды*\n\n"
                             "Выберите участника для оценки:",
@@ -504,13 +511,15 @@ def callback_confirm_review(callback: telebot.types.CallbackQuery, ):
 
         except Exception as e:
             if callback.message:
-                callback.message.edit_text(
-                    f"❌ Ошибка при отправке оценки: {e!s}\n"
+                bot.edit_message_text(
+                    chat_id=callback.message.chat.id,
+                    message_id=callback.message.message_id,
+                    text=f"❌ Ошибка при отправке оценки: {e!s}\n"
                     f"Попробуйте еще раз.",
                 )
             state_storage.clear_state(callback.from_user.id)
 
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_cancel_review")
@@ -520,7 +529,7 @@ def callback_cancel_review(callback: telebot.types.CallbackQuery, ):
     student = db.student_get_by_tg_id(callback.from_user.id)
 
     if callback.message:
-        callback.message.edit_text("❌ Отправка оценки отменена.")
+        bot.edit_message_text("❌ Отправка оценки отменена.", callback.message.chat.id, callback.message.message_id)
 
         if student:
             has_team = 'team' in student
@@ -532,30 +541,27 @@ def callback_cancel_review(callback: telebot.types.CallbackQuery, ):
         else:
             keyboard = keyboards.get_main_menu_keyboard(is_admin=False, has_team=False)
 
-        callback.bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
-    callback.answer()
+        bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
+    bot.answer_callback_query(callback.id)
 
 
 # Team Member Management Callbacks
 @decorators.log_handler("callback_remove_member_inline")
 def callback_remove_member_inline(callback: telebot.types.CallbackQuery, ):
     """Callback обработчик удаления участника команды (из inline клавиатуры)"""
-    if not callback.data or not callback.data.startswith("remove_member_"):
-        callback.answer("❌ Неверные данные")
-        return
-
-    # Извлекаем ID участника из callback_data
-    try:
-        member_id = int(callback.data.split("_")[-1])
-    except (ValueError, IndexError):
-        callback.answer("❌ Неверные данные")
-        return
+    # ID команды и участника уже распакованы маршрутизатором из callback_data
+    team_id, member_id = callback.payload.args
 
     student = db.student_get_by_tg_id(callback.from_user.id)
 
     # Проверяем, что пользователь является администратором команды
     if not student or 'team' not in student or student['team']['admin_student_id'] != student['student_id']:
-        callback.answer("❌ Недостаточно прав")
+        bot.answer_callback_query(callback.id, "❌ Недостаточно прав")
+        return
+
+    # Кнопка выдана для другой команды (устаревшее сообщение)
+    if student['team']['team_id'] != team_id:
+        bot.answer_callback_query(callback.id, "❌ Кнопка устарела")
         return
 
     team = student['team']
@@ -564,7 +570,7 @@ def callback_remove_member_inline(callback: telebot.types.CallbackQuery, ):
     member_to_remove = db.student_get_by_id(member_id)
 
     if not member_to_remove:
-        callback.answer("❌ Участник не найден")
+        bot.answer_callback_query(callback.id, "❌ Участник не найден")
         return
 
     # Сохраняем данные в состоянии
@@ -574,15 +580,17 @@ def callback_remove_member_inline(callback: telebot.types.CallbackQuery, ):
     )
 
     if callback.message:
-        callback.message.edit_text(
-            f"⚠️ *Подтверждение удаления*\n\n"
+        bot.edit_message_text(
+            chat_id=callback.message.chat.id,
+            message_id=callback.message.message_id,
+            text=f"⚠️ *Подтверждение удаления*\n\n"
             f"Вы действительно хотите удалить *{member_to_remove['name']}* из команды?\n\n"
             f"*Это действие нельзя отменить!*\n"
             f"Участник потеряет доступ ко всем функциям команды.",
             reply_markup=inline_keyboards.get_member_removal_confirm_keyboard(),
             parse_mode="Markdown",
         )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_confirm_remove_member")
@@ -599,8 +607,10 @@ def callback_confirm_remove_member(callback: telebot.types.CallbackQuery, ):
         state_storage.clear_state(callback.from_user.id)
 
         if callback.message:
-            callback.message.edit_text(
-                f"✅ *Участник {data['selected_member']['name']} успешно удален из команды!*",
+            bot.edit_message_text(
+                chat_id=callback.message.chat.id,
+                message_id=callback.message.message_id,
+                text=f"✅ *Участник {data['selected_member']['name']} успешно удален из команды!*",
                 parse_mode="Markdown",
             )
 
@@ -608,7 +618,7 @@ def callback_confirm_remove_member(callback: telebot.types.CallbackQuery, ):
             team_data = helpers.get_team_display_data("", callback.from_user.id)
 
             if team_data:
-                callback.bot.send_message(callback.message.chat.id,
+                bot.send_message(callback.message.chat.id,
                     team_data['team_info'],
                     parse_mode="Markdown",
                     reply_markup=team_data['keyboard'],
@@ -616,13 +626,15 @@ def callback_confirm_remove_member(callback: telebot.types.CallbackQuery, ):
 
     except Exception as e:
         if callback.message:
-            callback.message.edit_text(
-                f"❌ Ошибка при удалении участника: {e!s}\n"
+            bot.edit_message_text(
+                chat_id=callback.message.chat.id,
+                message_id=callback.message.message_id,
+                text=f"❌ Ошибка при удалении участника: {e!s}\n"
                 f"Попробуйте еще раз.",
             )
         state_storage.clear_state(callback.from_user.id)
 
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_cancel_remove_member")
@@ -631,72 +643,57 @@ def callback_cancel_remove_member(callback: telebot.types.CallbackQuery, ):
     state_storage.clear_state(callback.from_user.id)
 
     if callback.message:
-        callback.message.edit_text("❌ Удаление участника отменено.")
+        bot.edit_message_text("❌ Удаление участника отменено.", callback.message.chat.id, callback.message.message_id)
 
         # Обновляем информацию о команде
         team_data = helpers.get_team_display_data("", callback.from_user.id)
 
         if team_data:
-            callback.bot.send_message(callback.message.chat.id,
+            bot.send_message(callback.message.chat.id,
                 team_data['team_info'],
                 parse_mode="Markdown",
                 reply_markup=team_data['keyboard'],
             )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 # Dynamic Callbacks (pattern-based)
 @decorators.log_handler("callback_sprint_selection")
 def callback_sprint_selection(callback: telebot.types.CallbackQuery, ):
     """Callback обработчик выбора спринта"""
-    if not callback.data or not callback.data.startswith("sprint_"):
-        callback.answer("❌ Неверные данные")
-        return
-
-    # Извлекаем номер спринта из callback_data
-    try:
-        sprint_num = int(callback.data.split("_")[-1])
-    except (ValueError, IndexError):
-        callback.answer("❌ Неверные данные")
-        return
+    # Номер спринта уже распакован маршрутизатором из callback_data
+    sprint_num, = callback.payload.args
 
     state_storage.update_data(callback.from_user.id, sprint_num=sprint_num)
-    state_storage.set_state(callback.from_user.id, "states.ReportCreation.report_text")
+    fsm.set_state(callback.from_user.id, ReportCreation.report_text)
 
     if callback.message:
-        callback.message.edit_text(
-            f"✅ Спринт №{sprint_num}\n\n"
+        bot.edit_message_text(
+            chat_id=callback.message.chat.id,
+            message_id=callback.message.message_id,
+            text=f"✅ Спринт №{sprint_num}\n\n"
             f"📝 Введите текст отчета о проделанной работе:",
             reply_markup=inline_keyboards.get_confirmation_inline_keyboard("Отмена", "Назад", "cancel", "back"),
             parse_mode="Markdown",
         )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_member_selection")
 def callback_member_selection(callback: telebot.types.CallbackQuery, ):
     """Callback обработчик выбора участника команды"""
-    if not callback.data or not callback.data.startswith("member_"):
-        callback.answer("❌ Неверные данные")
-        return
-
-    # Извлекаем индекс участника из callback_data
-    try:
-        member_index = int(callback.data.split("_", 1)[1])
-    except (ValueError, IndexError):
-        callback.answer("❌ Неверные данные")
-        return
+    # ID участника уже распакован маршрутизатором из callback_data
+    member_id, = callback.payload.args
 
     data = state_storage.get_data(callback.from_user.id)
     teammates = data.get('teammates_to_rate', [])
 
-    # Проверяем, что индекс корректный
-    if member_index < 0 or member_index >= len(teammates):
-        callback.answer("❌ Участник не найден")
-        return
+    # Ищем выбранного участника по ID (индекс мог устареть)
+    selected_teammate = next((t for t in teammates if t['student_id'] == member_id), None)
 
-    # Получаем выбранного участника по индексу
-    selected_teammate = teammates[member_index]
+    if not selected_teammate:
+        bot.answer_callback_query(callback.id, "❌ Участник не найден")
+        return
 
     # Сохраняем выбранного участника в состоянии
     state_storage.update_data(
@@ -705,42 +702,35 @@ def callback_member_selection(callback: telebot.types.CallbackQuery, ):
         teammate_name=selected_teammate['name'],
     )
 
-    state_storage.set_state(callback.from_user.id, "states.ReviewProcess.rating_input")
+    fsm.set_state(callback.from_user.id, ReviewProcess.rating_input)
 
     if callback.message:
-        callback.message.edit_text(
-            f"⭐ *Оценка участника: {selected_teammate['name']}*\n\n"
+        bot.edit_message_text(
+            chat_id=callback.message.chat.id,
+            message_id=callback.message.message_id,
+            text=f"⭐ *Оценка участника: {selected_teammate['name']}*\n\n"
             f"Поставьте оценку от {config.features.min_rating} до {config.features.max_rating}:",
             reply_markup=inline_keyboards.get_ratings_inline_keyboard(),
             parse_mode="Markdown",
         )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_teammate_selection")
 def callback_teammate_selection(callback: telebot.types.CallbackQuery, ):
     """Callback обработчик выбора участника для оценки"""
-    if not callback.data or not callback.data.startswith("teammate_"):
-        callback.answer("❌ Неверные данные")
-        return
-
-    # Извлекаем индекс участника из callback_data
-    try:
-        teammate_index = int(callback.data.split("_", 1)[1])
-    except (ValueError, IndexError):
-        callback.answer("❌ Неверные данные")
-        return
+    # ID участника уже распакован маршрутизатором из callback_data
+    teammate_id, = callback.payload.args
 
     data = state_storage.get_data(callback.from_user.id)
     teammates = data.get('teammates_to_rate', [])
 
-    # Проверяем, что индекс корректный
-    if teammate_index < 0 or teammate_index >= len(teammates):
-        callback.answer("❌ Участник не найден")
-        return
+    # Ищем выбранного участника по ID (индекс мог устареть)
+    selected_teammate = next((t for t in teammates if t['student_id'] == teammate_id), None)
 
-    # Получаем выбранного участника по индексу
-    selected_teammate = teammates[teammate_index]
+    if not selected_teammate:
+        bot.answer_callback_query(callback.id, "❌ Участник не найден")
+        return
 
     # Сохраняем выбранного участника в состоянии
     state_storage.update_data(
@@ -749,100 +739,101 @@ def callback_teammate_selection(callback: telebot.types.CallbackQuery, ):
         teammate_name=selected_teammate['name'],
     )
 
-    state_storage.set_state(callback.from_user.id, "states.ReviewProcess.rating_input")
+    fsm.set_state(callback.from_user.id, ReviewProcess.rating_input)
 
     if callback.message:
-        callback.message.edit_text(
-            f"⭐ *Оценка участника: {selected_teammate['name']}*\n\n"
+        bot.edit_message_text(
+            chat_id=callback.message.chat.id,
+            message_id=callback.message.message_id,
+            text=f"⭐ *Оценка участника: {selected_teammate['name']}*\n\n"
             f"Поставьте оценку от {config.features.min_rating} до {config.features.max_rating}:",
             reply_markup=inline_keyboards.get_ratings_inline_keyboard(),
             parse_mode="Markdown",
         )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_rating_selection")
 def callback_rating_selection(callback: telebot.types.CallbackQuery, ):
     """Callback обработчик выбора оценки"""
-    if not callback.data or not callback.data.startswith("rating_"):
-        callback.answer("❌ Неверные данные")
-        return
-
-    # Извлекаем оценку из callback_data
-    try:
-        rating = int(callback.data.split("_")[-1])
-    except (ValueError, IndexError):
-        callback.answer("❌ Неверные данные")
-        return
+    # Оценка уже распакована маршрутизатором из callback_data
+    rating, = callback.payload.args
 
     if rating < config.features.min_rating or rating > config.features.max_rating:
-        callback.answer(
+        bot.answer_callback_query(
+            callback.id,
             f"❌ Оценка должна быть от {config.features.min_rating} до {config.features.max_rating}",
         )
         return
 
     state_storage.update_data(callback.from_user.id, overall_rating=rating)
-    state_storage.set_state(callback.from_user.id, "states.ReviewProcess.advantages_input")
+    fsm.set_state(callback.from_user.id, ReviewProcess.advantages_input)
 
     if callback.message:
-        callback.message.edit_text(
-            f"✅ Оценка: {rating}/10\n\n"
+        bot.edit_message_text(
+            chat_id=callback.message.chat.id,
+            message_id=callback.message.message_id,
+            text=f"✅ Оценка: {rating}/10\n\n"
             f"👍 *Положительные качества*\n"
             f"Напишите положительные качества участника:",
             parse_mode="Markdown",
         )
-    callback.answer()
+    bot.answer_callback_query(callback.id)
 
 
 @decorators.log_handler("callback_edit_member")
 def callback_edit_member(callback: telebot.types.CallbackQuery, ):
     """Callback обработчик редактирования участника команды"""
-    if not callback.data or not callback.data.startswith("edit_member_"):
-        callback.answer("❌ Неверные данные")
-        return
-
-    # Извлекаем ID участника из callback_data
-    try:
-        member_id = int(callback.data.split("_")[-1])
-    except (ValueError, IndexError):
-        callback.answer("❌ Неверные данные")
-        return
+    # ID команды и участника уже распакованы маршрутизатором из callback_data
+    team_id, member_id = callback.payload.args
 
     student = db.student_get_by_tg_id(callback.from_user.id)
 
     # Проверяем, что пользователь является администратором команды
     if not student or 'team' not in student or student['team']['admin_student_id'] != student['student_id']:
-        callback.answer("❌ Недостаточно прав")
+        bot.answer_callback_query(callback.id, "❌ Недостаточно прав")
+        return
+
+    # Кнопка выдана для другой команды (устаревшее сообщение)
+    if student['team']['team_id'] != team_id:
+        bot.answer_callback_query(callback.id, "❌ Кнопка устарела")
         return
 
     # Получаем информацию об участнике
     member_to_edit = db.student_get_by_id(member_id)
 
     if not member_to_edit:
-        callback.answer("❌ Участник не найден")
+        bot.answer_callback_query(callback.id, "❌ Участник не найден")
         return
 
     # ПРИМЕЧАНИЕ: Функция редактирования участников в текущей версии не реализована
     # В будущих версиях здесь можно будет изменять роль участника
     if callback.message:
-        callback.message.edit_text(
-            f"ℹ️ *Информация об участнике*\n\n"
+        bot.edit_message_text(
+            chat_id=callback.message.chat.id,
+            message_id=callback.message.message_id,
+            text=f"ℹ️ *Информация об участнике*\n\n"
             f"👤 Имя: {member_to_edit['name']}\n"
             f"🆔 ID: {member_to_edit['student_id']}\n\n"
             f"💡 Для изменения роли участника используйте удаление и повторное добавление.",
             parse_mode="Markdown",
         )
-    callback.answer("Функция редактирования будет добавлена в следующей версии")
+    bot.answer_callback_query(callback.id, "Функция редактирования будет добавлена в следующей версии")
 
 
 @decorators.log_handler("callback_cancel_action")
 def callback_cancel_action(callback: telebot.types.CallbackQuery, ):
     """Callback обработчик отмены действия (универсальный)"""
+    # Кнопка "cancel" есть и на клавиатуре выбора роли при присоединении к команде
+    if fsm.in_group(callback.from_user.id, JOIN_TEAM_STATES):
+        callback_cancel_join_team(callback)
+        return
+
     state_storage.clear_state(callback.from_user.id)
     student = db.student_get_by_tg_id(callback.from_user.id)
 
     if callback.message:
-        callback.message.edit_text("❌ Действие отменено.")
+        bot.edit_message_text("❌ Действие отменено.", callback.message.chat.id, callback.message.message_id)
 
         if student:
             has_team = 'team' in student
@@ -854,91 +845,51 @@ def callback_cancel_action(callback: telebot.types.CallbackQuery, ):
         else:
             keyboard = keyboards.get_main_menu_keyboard(is_admin=False, has_team=False)
 
-        callback.bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
-    callback.answer()
+        bot.send_message(callback.message.chat.id, "Главное меню:", reply_markup=keyboard)
+    bot.answer_callback_query(callback.id)
 
 
 def register_callback_handlers(bot_instance: telebot.TeleBot):
     """Регистрация callback обработчиков"""
     # Team registration callbacks
-    bot_instance.register_callback_query_handler(
-        callback_confirm_team_registration, func=lambda c: c.data == "confirm_team_reg"
-    )
-    bot_instance.register_callback_query_handler(
-        callback_cancel_team_registration, func=lambda c: c.data == "cancel_team_reg"
-    )
+    router.callback("confirm_team_reg", callback_confirm_team_registration)
+    router.callback("cancel_team_reg", callback_cancel_team_registration)
+
+    # Role selection callbacks
+    for role_data in ("role_po", "role_sm", "role_dev", "role_member"):
+        router.callback(role_data, callback_role_selection)
 
     # Join team callbacks
-    bot_instance.register_callback_query_handler(
-        callback_confirm_join_team, func=lambda c: c.data == "confirm_join_team"
-    )
-    bot_instance.register_callback_query_handler(
-        callback_cancel_join_team, func=lambda c: c.data == "cancel_join_team"
-    )
+    router.callback("confirm_join_team", callback_confirm_join_team)
+    router.callback("cancel_join_team", callback_cancel_join_team)
 
-    # Report callbacks - specific callbacks first
-    bot_instance.register_callback_query_handler(callback_confirm_report, func=lambda c: c.data == "confirm_report")
-    bot_instance.register_callback_query_handler(callback_cancel_report, func=lambda c: c.data == "cancel_report")
-    bot_instance.register_callback_query_handler(
-        callback_confirm_delete_report,
-        func=lambda c: c.data == "confirm_delete_report"
-    )
-    bot_instance.register_callback_query_handler(
-        callback_cancel_delete_report,
-        func=lambda c: c.data == "cancel_delete_report"
-    )
+    # Report callbacks
+    router.callback("confirm_report", callback_confirm_report)
+    router.callback("cancel_report", callback_cancel_report)
+    router.callback("confirm_delete_report", callback_confirm_delete_report)
+    router.callback("cancel_delete_report", callback_cancel_delete_report)
 
-    # Review callbacks - specific callbacks first
-    bot_instance.register_callback_query_handler(callback_confirm_review, func=lambda c: c.data == "confirm_review")
-    bot_instance.register_callback_query_handler(callback_cancel_review, func=lambda c: c.data == "cancel_review")
+    # Review callbacks
+    router.callback("confirm_review", callback_confirm_review)
+    router.callback("cancel_review", callback_cancel_review)
 
-    # Member management callbacks - specific callbacks first
-    bot_instance.register_callback_query_handler(
-        callback_confirm_remove_member,
-        func=lambda c: c.data == "confirm_remove_member"
-    )
-    bot_instance.register_callback_query_handler(
-        callback_cancel_remove_member,
-        func=lambda c: c.data == "cancel_remove_member"
-    )
+    # Member management callbacks
+    router.callback("confirm_remove_member", callback_confirm_remove_member)
+    router.callback("cancel_remove_member", callback_cancel_remove_member)
 
-    # Pattern-based callbacks with mixed patterns - more specific first
-    bot_instance.register_callback_query_handler(
-        callback_sprint_selection,
-        func=lambda c: c.data and c.data.startswith("sprint_")
-    )
-    bot_instance.register_callback_query_handler(
-        callback_member_selection,
-        func=lambda c: c.data and c.data.startswith("member_")
-    )
-    bot_instance.register_callback_query_handler(
-        callback_teammate_selection,
-        func=lambda c: c.data and c.data.startswith("teammate_")
-    )
-    bot_instance.register_callback_query_handler(
-        callback_rating_selection,
-        func=lambda c: c.data and c.data.startswith("rating_")
-    )
+    # Packed callbacks (bot.callback_data), распаковываются маршрутизатором один раз
+    router.callback_kind(CallbackKind.SPRINT, callback_sprint_selection)
+    router.callback_kind(CallbackKind.MEMBER, callback_member_selection)
+    router.callback_kind(CallbackKind.TEAMMATE, callback_teammate_selection)
+    router.callback_kind(CallbackKind.RATING, callback_rating_selection)
 
     # Team member management callbacks (inline)
-    bot_instance.register_callback_query_handler(
-        callback_edit_member,
-        func=lambda c: c.data and c.data.startswith("edit_member_")
-    )
-    bot_instance.register_callback_query_handler(
-        callback_remove_member_inline,
-        func=lambda c: c.data and c.data.startswith("remove_member_")
-    )
+    router.callback_kind(CallbackKind.EDIT_MEMBER, callback_edit_member)
+    router.callback_kind(CallbackKind.REMOVE_MEMBER, callback_remove_member_inline)
 
     # Report management callbacks (inline)
-    bot_instance.register_callback_query_handler(
-        callback_edit_report,
-        func=lambda c: c.data and c.data.startswith("edit_report_")
-    )
-    bot_instance.register_callback_query_handler(
-        callback_delete_report_inline,
-        func=lambda c: c.data and c.data.startswith("delete_report_")
-    )
+    router.callback_kind(CallbackKind.EDIT_REPORT, callback_edit_report)
+    router.callback_kind(CallbackKind.DELETE_REPORT, callback_delete_report_inline)
 
-    # General cancel callback (fallback) - MUST BE LAST
-    bot_instance.register_callback_query_handler(callback_cancel_action, func=lambda c: c.data == "cancel")
+    # General cancel callback
+    router.callback("cancel", callback_cancel_action)
@@ -0,0 +1,54 @@
+"""
+Таблица диалогов бота: для каждого состояния FSM - обработчик текстового
+ввода и состояния, в которые из него можно перейти.
+
+Состояние пользователя имеет приоритет над кнопками; в состоянии без
+обработчика (выбор кнопкой inline-клавиатуры) текст маршрутизируется
+по кнопкам как обычно.
+"""
+
+import telebot
+
+from bot.fsm import StateRow, fsm
+from bot.handlers import admin, reports, reviews, team
+from bot.states.user_states import AdminActions, JoinTeam, ReportCreation, ReviewProcess, TeamRegistration
+
+DIALOGS = (
+    # Регистрация команды
+    StateRow(TeamRegistration.team_name, team.process_team_name, (TeamRegistration.product_name,), entry=True),
+    StateRow(TeamRegistration.product_name, team.process_product_name, (TeamRegistration.user_name,)),
+    StateRow(TeamRegistration.user_name, team.process_admin_name, (TeamRegistration.user_group,)),
+    StateRow(TeamRegistration.user_group, team.process_admin_group, (TeamRegistration.confirm,)),
+    StateRow(TeamRegistration.confirm, team.confirm_team_registration),
+
+    # Присоединение к команде (имя и группа не спрашиваются у зарегистрированных студентов)
+    StateRow(JoinTeam.user_name, team.process_join_user_name, (JoinTeam.user_group,), entry=True),
+    StateRow(JoinTeam.user_group, team.process_join_user_group, (JoinTeam.user_role,)),
+    StateRow(JoinTeam.user_role, team.process_join_user_role, (JoinTeam.confirm,), entry=True),
+    StateRow(JoinTeam.confirm, team.confirm_join_team),
+
+    # Отчёты ('Назад' возвращает к выбору спринта, редактирование начинается сразу с текста)
+    StateRow(
+        ReportCreation.sprint_selection, reports.process_sprint_selection, (ReportCreation.report_text,), entry=True,
+    ),
+    StateRow(
+        ReportCreation.report_text, reports.process_report_text, (ReportCreation.sprint_selection,), entry=True,
+    ),
+
+    # Оценка участников команды (участник выбирается inline-кнопкой)
+    StateRow(ReviewProcess.teammate_selection, None, (ReviewProcess.rating_input,), entry=True),
+    StateRow(ReviewProcess.rating_input, reviews.process_rating_input, (ReviewProcess.advantages_input,)),
+    StateRow(ReviewProcess.advantages_input, reviews.process_advantages_input, (ReviewProcess.disadvantages_input,)),
+    StateRow(ReviewProcess.disadvantages_input, reviews.process_disadvantages_input, (ReviewProcess.confirmation,)),
+    StateRow(ReviewProcess.confirmation, reviews.confirm_review, (ReviewProcess.teammate_selection,)),
+
+    # Администрирование команды
+    StateRow(AdminActions.select_member, admin.process_member_selection, (AdminActions.confirm_removal,), entry=True),
+    StateRow(AdminActions.confirm_removal, admin.confirm_member_removal),
+    StateRow(AdminActions.select_member_stats, admin.process_member_stats_selection, entry=True),
+)
+
+
+def register_dialog_handlers(bot_instance: telebot.TeleBot):
+    """Регистрация таблицы диалогов в FSM"""
+    fsm.load(DIALOGS)
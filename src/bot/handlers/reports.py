@@ -8,9 +8,12 @@ import telebot
 
 from bot import db
 from bot.bot_instance import bot
+from bot.fsm import fsm
 from bot.keyboards import inline as inline_keyboards
 from bot.keyboards import reply as keyboards
+from bot.router import router
 from bot.state_storage import state_storage
+from bot.states.user_states import ReportCreation
 from bot.utils import decorators as decorators
 from bot.utils import helpers as helpers
 
@@ -24,7 +27,7 @@ def handle_my_reports(message: telebot.types.Message):
         bot.send_message(message.chat.id, "❌ Вы не зарегистрированы в системе.")
         return
 
-    reports = db.report_get_by_student(student['student_id'])
+    reports = db.report_get_with_text_by_student(student['student_id'])
     report_text = helpers.format_reports_list(reports)
 
     # Создаем inline клавиатуру для управления отчетами
@@ -42,7 +45,7 @@ def handle_send_report(message: telebot.types.Message, ):
         bot.send_message(message.chat.id, "❌ Вы не состоите в команде.")
         return
 
-    state_storage.set_state(message.from_user.id, "states.ReportCreation.sprint_selection")
+    fsm.set_state(message.from_user.id, ReportCreation.sprint_selection)
     bot.send_message(
 
         message.chat.id,
@@ -77,7 +80,7 @@ def process_sprint_selection(message: telebot.types.Message, ):
         return
 
     state_storage.update_data(message.from_user.id, sprint_num=sprint_num)
-    state_storage.set_state(message.from_user.id, "states.ReportCreation.report_text")
+    fsm.set_state(message.from_user.id, ReportCreation.report_text)
 
     bot.send_message(
 
@@ -94,7 +97,7 @@ def process_report_text(message: telebot.types.Message, ):
     """Обработка текста отчета"""
     if message.text in ["Отмена", "Назад"]:
         if message.text == "Назад":
-            state_storage.set_state(message.from_user.id, "states.ReportCreation.sprint_selection")
+            fsm.set_state(message.from_user.id, ReportCreation.sprint_selection)
             bot.send_message(
 
                 message.chat.id,
@@ -171,7 +174,7 @@ def process_report_text(message: telebot.types.Message, ):
             )
 
         # Переходим на страницу "Мои отчёты"
-        reports = db.report_get_by_student(student['student_id'])
+        reports = db.report_get_with_text_by_student(student['student_id'])
         report_text = helpers.format_reports_list(reports)
         keyboard = inline_keyboards.get_report_management_keyboard(reports)
         bot.send_message(message.chat.id, report_text, parse_mode="Markdown", reply_markup=keyboard)
@@ -188,8 +191,7 @@ def process_report_text(message: telebot.types.Message, ):
 
 def register_reports_handlers(bot_instance: telebot.TeleBot):
     """Регистрация обработчиков отчетов"""
-    # FSM обработчики РЕГИСТРИРУЮТСЯ ПЕРВЫМИ
-
-    # Основные команды (регистрируются ПОСЛЕ FSM)
-    bot_instance.register_message_handler(handle_my_reports, func=lambda m: m.text == "Мои отчёты")
-    bot_instance.register_message_handler(handle_send_report, func=lambda m: m.text == "Отправить отчёт")
+    # Обработчики состояний FSM - в таблице bot.handlers.dialogs
+    # Основные команды
+    router.text("Мои отчёты", handle_my_reports)
+    router.text("Отправить отчёт", handle_send_report)
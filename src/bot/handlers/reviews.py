@@ -6,11 +6,15 @@
 
 import telebot
 
-from bot import db
+from bot import db, roster
 from bot.bot_instance import bot
+from bot.callback_data import CallbackKind
+from bot.fsm import fsm
 from bot.keyboards import inline as inline_keyboards
 from bot.keyboards import reply as keyboards
+from bot.router import router
 from bot.state_storage import state_storage
+from bot.states.user_states import ReviewProcess
 from bot.utils import decorators as decorators
 from config import config
 
@@ -29,7 +33,7 @@ def handle_rate_teammates(message: telebot.types.Message, ):
         return
 
     # Получаем участников команды, которых еще не оценил пользователь
-    teammates_to_rate = db.student_get_teammates_not_rated(student['student_id'])
+    teammates_to_rate = roster.teammates_not_rated(student['team']['team_id'], student['student_id'])
 
     if not teammates_to_rate:
         bot.send_message(
@@ -42,9 +46,10 @@ def handle_rate_teammates(message: telebot.types.Message, ):
 
     # Создаем список имен для выбора
     teammate_names = [teammate['name'] for teammate in teammates_to_rate]
+    teammate_ids = [teammate['student_id'] for teammate in teammates_to_rate]
 
     state_storage.update_data(message.from_user.id, teammates_to_rate=teammates_to_rate)
-    state_storage.set_state(message.from_user.id, "states.ReviewProcess.teammate_selection")
+    fsm.set_state(message.from_user.id, ReviewProcess.teammate_selection)
 
     bot.send_message(
 
@@ -52,7 +57,9 @@ def handle_rate_teammates(message: telebot.types.Message, ):
         message.chat.id,
         "⭐ *Оценивание участников команды*\n\n"
         "Выберите участника для оценки:",
-        reply_markup=inline_keyboards.get_dynamic_inline_keyboard(teammate_names, "teammate", columns=2),
+        reply_markup=inline_keyboards.get_dynamic_inline_keyboard(
+            teammate_names, CallbackKind.TEAMMATE, teammate_ids, columns=2,
+        ),
         parse_mode="Markdown",
     )
 
@@ -70,10 +77,10 @@ def handle_who_rated_me(message: telebot.types.Message):
         bot.send_message(message.chat.id, "❌ Вы не состоите в команде.")
         return
 
-    # Получаем оценки пользователя
-    ratings = db.rating_get_who_rated_me(student['student_id'])
+    # Сводка оценок и размер команды одним запросом
+    stats = db.rating_get_stats(student['student_id'])
 
-    if not ratings:
+    if not stats['count']:
         bot.send_message(
 
             message.chat.id,
@@ -83,21 +90,14 @@ def handle_who_rated_me(message: telebot.types.Message):
         )
         return
 
-    # Получаем информацию о команде для статистики
-    teammates = db.student_get_teammates(student['student_id'])
-    total_teammates = len(teammates)
-    rated_count = len(ratings)
+    total_teammates = stats['total_teammates']
+    rated_count = stats['count']
 
     # Формируем текст со списком оценивших
-    if not ratings:
-        ratings_text = "⭐ Вас пока никто не оценил"
-    else:
-        ratings_text = "*Меня оценили:*\n"
-        for rating in ratings:
-            # For MySQL version, we don't have datetime objects, so we need to handle this differently
-            # Let's assume the date is already formatted as a string
-            date_str = rating.get('rate_date', 'Неизвестно')
-            ratings_text += f"• {rating['assessor_name']} ({date_str})\n"
+    ratings_text = "*Меня оценили:*\n"
+    for rating in stats['assessors']:
+        date_str = rating.get('rate_date', 'Неизвестно')
+        ratings_text += f"• {rating['assessor_name']} ({date_str})\n"
 
     status_text = (
         f"*Статус оценок:*\n"
@@ -139,7 +139,7 @@ def process_rating_input(message: telebot.types.Message, ):
         return
 
     state_storage.update_data(message.from_user.id, overall_rating=rating)
-    state_storage.set_state(message.from_user.id, "states.ReviewProcess.advantages_input")
+    fsm.set_state(message.from_user.id, ReviewProcess.advantages_input)
 
     bot.send_message(
 
@@ -176,7 +176,7 @@ def process_advantages_input(message: telebot.types.Message, ):
 
     data = state_storage.get_data(message.from_user.id)
     state_storage.update_data(message.from_user.id, advantages=advantages)
-    state_storage.set_state(message.from_user.id, "states.ReviewProcess.disadvantages_input")
+    fsm.set_state(message.from_user.id, ReviewProcess.disadvantages_input)
 
     bot.send_message(
 
@@ -211,7 +211,7 @@ def process_disadvantages_input(message: telebot.types.Message, ):
         return
 
     state_storage.update_data(message.from_user.id, disadvantages=disadvantages)
-    state_storage.set_state(message.from_user.id, "states.ReviewProcess.confirmation")
+    fsm.set_state(message.from_user.id, ReviewProcess.confirmation)
 
     # Показываем итоговую оценку
     data = state_storage.get_data(message.from_user.id)
@@ -277,12 +277,13 @@ def confirm_review(message: telebot.types.Message, ):
                 else:
                     # Создаем список имен для выбора
                     teammate_names = [teammate['name'] for teammate in teammates_to_rate]
+                    teammate_ids = [teammate['student_id'] for teammate in teammates_to_rate]
 
                     state_storage.update_data(message.from_user.id, teammates_to_rate=teammates_to_rate)
-                    state_storage.set_state(message.from_user.id, "states.ReviewProcess.teammate_selection")
+                    fsm.set_state(message.from_user.id, ReviewProcess.teammate_selection)
 
                     keyboard = inline_keyboards.get_dynamic_inline_keyboard(
-                        teammate_names, "teammate", columns=2,
+                        teammate_names, CallbackKind.TEAMMATE, teammate_ids, columns=2,
                     )
                     bot.send_message(
 
@@ -326,8 +327,7 @@ def cancel_review(message: telebot.types.Message, ):
 
 def register_reviews_handlers(bot_instance: telebot.TeleBot):
     """Регистрация обработчиков оценивания"""
-    # FSM обработчики РЕГИСТРИРУЮТСЯ ПЕРВЫМИ
-
-    # Основные команды (регистрируются ПОСЛЕ FSM)
-    bot_instance.register_message_handler(handle_rate_teammates, func=lambda m: m.text == "Оценить участников команды")
-    bot_instance.register_message_handler(handle_who_rated_me, func=lambda m: m.text == "Кто меня оценил?")
+    # Обработчики состояний FSM - в таблице bot.handlers.dialogs
+    # Основные команды
+    router.text("Оценить участников команды", handle_rate_teammates)
+    router.text("Кто меня оценил?", handle_who_rated_me)
@@ -6,10 +6,13 @@
 
 import telebot
 
-from bot import db, tgtexts
+from bot import db, invites, tgtexts
 from bot.bot_instance import bot
+from bot.fsm import fsm
 from bot.keyboards import inline as inline_keyboards
+from bot.router import router
 from bot.state_storage import state_storage
+from bot.states.user_states import JoinTeam
 from bot.utils import decorators
 
 
@@ -55,7 +58,7 @@ def handle_regular_start(message: telebot.types.Message):
 def handle_join_team(message: telebot.types.Message, invite_code: str):
     """Обработка присоединения к команде по коду"""
     # Проверяем код приглашения
-    team = db.team_get_by_invite_code(invite_code)
+    team = invites.find_team(invite_code)
 
     if not team:
         bot.send_message(
@@ -81,7 +84,7 @@ def handle_join_team(message: telebot.types.Message, invite_code: str):
 
     if student:
         # Пользователь есть в системе, но не в команде - сразу выбираем роль
-        state_storage.set_state(message.from_user.id, "states.JoinTeam.user_role")
+        fsm.set_state(message.from_user.id, JoinTeam.user_role)
         bot.send_message(
 
             message.chat.id,
@@ -92,7 +95,7 @@ def handle_join_team(message: telebot.types.Message, invite_code: str):
         )
     else:
         # Новый пользователь - запрашиваем данные
-        state_storage.set_state(message.from_user.id, "states.JoinTeam.user_name")
+        fsm.set_state(message.from_user.id, JoinTeam.user_name)
         bot.send_message(
 
             message.chat.id,
@@ -128,5 +131,5 @@ def register_start_handlers(bot_instance: telebot.TeleBot):
     """Регистрация обработчиков"""
     bot_instance.register_message_handler(cmd_start, commands=['start'])
     bot_instance.register_message_handler(cmd_help, commands=['help'])
-    bot_instance.register_message_handler(handle_help_button, func=lambda m: m.text == "Помощь")
-    bot_instance.register_message_handler(handle_update_button, func=lambda m: m.text == "Обновить")
+    router.text("Помощь", handle_help_button)
+    router.text("Обновить", handle_update_button)
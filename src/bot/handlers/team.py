@@ -8,11 +8,14 @@ import re
 
 import telebot
 
-from bot import db
+from bot import db, invites
 from bot.bot_instance import bot
+from bot.fsm import fsm
 from bot.keyboards import inline as inline_keyboards
 from bot.keyboards import reply as keyboards
+from bot.router import router
 from bot.state_storage import state_storage
+from bot.states.user_states import JoinTeam, TeamRegistration
 from bot.utils import decorators as decorators
 from bot.utils import helpers as helpers
 
@@ -45,7 +48,7 @@ def handle_register_team(message: telebot.types.Message, ):
         )
         return
 
-    state_storage.set_state(message.from_user.id, "states.TeamRegistration.team_name")
+    fsm.set_state(message.from_user.id, TeamRegistration.team_name)
     bot.send_message(
 
         message.chat.id,
@@ -82,7 +85,7 @@ def process_team_name(message: telebot.types.Message, ):
         return
 
     state_storage.update_data(message.from_user.id, team_name=team_name)
-    state_storage.set_state(message.from_user.id, "states.TeamRegistration.product_name")
+    fsm.set_state(message.from_user.id, TeamRegistration.product_name)
     bot.send_message(
 
         message.chat.id,
@@ -105,7 +108,7 @@ def process_product_name(message: telebot.types.Message, ):
         return
 
     state_storage.update_data(message.from_user.id, product_name=product_name)
-    state_storage.set_state(message.from_user.id, "states.TeamRegistration.user_name")
+    fsm.set_state(message.from_user.id, TeamRegistration.user_name)
 
     # Получаем имя пользователя из Telegram
     first_name = message.from_user.first_name or ""
@@ -147,7 +150,7 @@ def process_admin_name(message: telebot.types.Message, ):
         return
 
     state_storage.update_data(message.from_user.id, user_name=user_name)
-    state_storage.set_state(message.from_user.id, "states.TeamRegistration.user_group")
+    fsm.set_state(message.from_user.id, TeamRegistration.user_group)
     bot.send_message(
 
         message.chat.id,
@@ -174,7 +177,7 @@ def process_admin_group(message: telebot.types.Message, ):
 
     # Показываем данные для подтверждения
     data = state_storage.get_data(message.from_user.id)
-    state_storage.set_state(message.from_user.id, "states.TeamRegistration.confirm")
+    fsm.set_state(message.from_user.id, TeamRegistration.confirm)
 
     confirmation_text = (
         "📋 *Проверьте данные:*\n\n"
@@ -214,13 +217,12 @@ def confirm_team_registration(message: telebot.types.Message, ):
                 )
 
             # Создаем команду
-            invite_code = helpers.generate_invite_code()
-            team = db.team_create(
+            team = invites.create_team(
                 team_name=data['team_name'],
                 product_name=data['product_name'],
-                invite_code=invite_code,
                 admin_student_id=student['student_id'],
             )
+            invite_code = team['invite_code']
 
             # Добавляем администратора в команду
             db.team_add_member(
@@ -279,7 +281,7 @@ def process_join_user_name(message: telebot.types.Message, ):
         return
 
     state_storage.update_data(message.from_user.id, user_name=user_name)
-    state_storage.set_state(message.from_user.id, "states.JoinTeam.user_group")
+    fsm.set_state(message.from_user.id, JoinTeam.user_group)
     bot.send_message(
 
         message.chat.id,
@@ -303,7 +305,7 @@ def process_join_user_group(message: telebot.types.Message, ):
         return
 
     state_storage.update_data(message.from_user.id, user_group=user_group)
-    state_storage.set_state(message.from_user.id, "states.JoinTeam.user_role")
+    fsm.set_state(message.from_user.id, JoinTeam.user_role)
     bot.send_message(
 
         message.chat.id,
@@ -327,7 +329,7 @@ def process_join_user_role(message: telebot.types.Message, ):
         return
 
     state_storage.update_data(message.from_user.id, user_role=message.text)
-    state_storage.set_state(message.from_user.id, "states.JoinTeam.confirm")
+    fsm.set_state(message.from_user.id, JoinTeam.confirm)
 
     # Показываем данные для подтверждения
     data = state_storage.get_data(message.from_user.id)
@@ -424,68 +426,13 @@ def handle_team_report(message: telebot.types.Message):
         bot.send_message(message.chat.id, "❌ Вы не состоите в команде.")
         return
 
-    # Получаем всех участников команды, включая администратора
-    all_members = db.team_get_all_members(student['team']['team_id'])
+    # Статистика всех участников одним запросом
+    team_stats = db.team_get_member_stats(student['team']['team_id'])
 
-    if not all_members:
+    if not team_stats:
         bot.send_message(message.chat.id, "👥 В команде нет участников.")
         return
 
-    # Собираем статистику для каждого участника
-    team_stats = []
-
-    for member in all_members:
-        # Получаем ID участника
-        member_id = ""
-        member_name = ""
-        member_role = ""
-
-        if isinstance(member, dict):
-            member_id = member.get('student_id', '')
-            member_name = member.get('name', 'Неизвестно')
-            member_role = member.get('role', 'Участник')
-        else:
-            member_id = getattr(member, 'student_id', '')
-            member_name = getattr(member, 'name', 'Неизвестно')
-            member_role = getattr(member, 'role', 'Участник')
-
-            # Получаем количество отчетов
-            # Конвертируем member_id в int если это строка
-            member_id_int = int(member_id) if isinstance(member_id, str) else member_id
-            reports = db.report_get_by_student(member_id_int)
-            reports_count = len(reports) if reports else 0
-
-            # Получаем количество оценок, данных участником
-            ratings_given = db.rating_get_given_by_student(member_id_int)
-            ratings_given_count = len(ratings_given) if ratings_given else 0
-
-            # Получаем количество оценок, полученных участником
-            ratings_received = db.rating_get_who_rated_me(member_id_int)
-        ratings_received_count = len(ratings_received) if ratings_received else 0
-
-        # Считаем среднюю оценку, если есть оценки
-        avg_rating = 0
-        if ratings_received:
-            total_rating = 0
-            count = 0
-            for rating in ratings_received:
-                if isinstance(rating, dict):
-                    total_rating += rating.get('overall_rating', 0)
-                else:
-                    total_rating += getattr(rating, 'overall_rating', 0)
-                count += 1
-            if count > 0:
-                avg_rating = int(round(total_rating / count, 1))
-
-        team_stats.append({
-            'name': member_name,
-            'role': member_role,
-            'reports_count': reports_count,
-            'ratings_given_count': ratings_given_count,
-            'ratings_received_count': ratings_received_count,
-            'avg_rating': avg_rating,
-        })
-
     # Формируем текст отчета
     report_text = f"📊 *Отчёт о команде: {student['team']['team_name']}*\n\n"
 
@@ -494,7 +441,7 @@ def handle_team_report(message: telebot.types.Message):
         report_text += f"   📝 Отчеты: {stats['reports_count']}\n"
         report_text += f"   ⭐ Оценки от меня: {stats['ratings_given_count']}\n"
         report_text += f"   👀 Оценки мне: {stats['ratings_received_count']}"
-        if isinstance(stats['avg_rating'], (int, float)) and stats['avg_rating'] > 0:
+        if stats['avg_rating']:
             report_text += f" (средняя: {stats['avg_rating']}/10)"
         report_text += "\n\n"
 
@@ -503,12 +450,8 @@ def handle_team_report(message: telebot.types.Message):
 
 def register_team_handlers(bot_instance: telebot.TeleBot):
     """Регистрация обработчиков команды"""
-    # FSM обработчики РЕГИСТРИРУЮТСЯ ПЕРВЫМИ (они имеют приоритет)
-    # FSM для регистрации команды
-
-    # FSM для присоединения к команде
-
-    # Основные команды (регистрируются ПОСЛЕ FSM)
-    bot_instance.register_message_handler(handle_register_team, func=lambda m: m.text == "Регистрация команды")
-    bot_instance.register_message_handler(handle_my_team, func=lambda m: m.text == "Моя команда")
-    bot_instance.register_message_handler(handle_team_report, func=lambda m: m.text == "📊 Отчёт о команде")
+    # Обработчики состояний FSM - в таблице bot.handlers.dialogs
+    # Основные команды
+    router.text("Регистрация команды", handle_register_team)
+    router.text("Моя команда", handle_my_team)
+    router.text("📊 Отчёт о команде", handle_team_report)
@@ -0,0 +1,135 @@
+"""
+Коды приглашения в команду.
+
+- коды генерируются криптографически стойким генератором (secrets);
+- уникальность обеспечивает индекс uk_teams_invite_code: при совпадении
+  INSERT завершается ошибкой 1062 и команда создаётся с новым кодом
+  (без предварительной проверки SELECT, которая не защищает от гонок);
+- результаты поиска по /start <код> кэшируются в памяти, включая
+  отрицательные, поэтому поток неверных кодов не доходит до БД.
+"""
+
+import re
+import secrets
+import string
+import threading
+import time
+from collections import OrderedDict
+
+import loguru
+
+import myconn
+from bot import db
+from config import config
+
+logger = loguru.logger
+
+# Без похожих символов: 0, O, I
+ALPHABET = "".join(ch for ch in string.ascii_uppercase + string.digits if ch not in "0OI")
+CODE_LENGTH = 8
+
+# Длина столбца teams.invite_code
+MAX_CODE_LENGTH = 8
+
+INVITE_CODE_KEY = "uk_teams_invite_code"
+MAX_CREATE_ATTEMPTS = 5
+
+# Допустимый вид кода: всё остальное отклоняется без обращения к БД
+CODE_RE = re.compile(rf"[A-Za-z0-9]{{1,{MAX_CODE_LENGTH}}}")
+
+
+def generate_code(length: int = CODE_LENGTH) -> str:
+    """Случайный код приглашения"""
+    return "".join(secrets.choice(ALPHABET) for _ in range(length))
+
+
+def is_well_formed(code: str) -> bool:
+    """Код может существовать в БД (длина и символы)"""
+    return bool(CODE_RE.fullmatch(code))
+
+
+class InviteCache:
+    """
+    Кэш поиска команды по коду: найденные команды и отсутствующие коды
+    хранятся с разным временем жизни, размер ограничен (LRU).
+    """
+
+    def __init__(self, ttl: float = 300, negative_ttl: float = 60, max_size: int = 10000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, code: str) -> tuple[bool, dict | None]:
+        """(найдено в кэше, команда или None)"""
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None:
+                return False, None
+            expires, team = entry
+            if expires < time.monotonic():
+                del self._entries[code]
+                return False, None
+            self._entries.move_to_end(code)
+            return True, team
+
+    def put(self, code: str, team: dict | None):
+        ttl = self.ttl if team is not None else self.negative_ttl
+        with self._lock:
+            self._entries[code] = (time.monotonic() + ttl, team)
+            self._entries.move_to_end(code)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, code: str):
+        with self._lock:
+            self._entries.pop(code, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+cache = InviteCache(
+    ttl=config.get('invites.cache_ttl', 300),
+    negative_ttl=config.get('invites.negative_cache_ttl', 60),
+    max_size=config.get('invites.cache_size', 10000),
+)
+
+
+def find_team(code: str) -> dict | None:
+    """Команда по коду приглашения (через кэш)"""
+    code = code.strip()
+    if not is_well_formed(code):
+        return None
+
+    cached, team = cache.get(code)
+    if cached:
+        return team
+
+    team = db.team_get_by_invite_code(code)
+    cache.put(code, team)
+    return team
+
+
+def create_team(team_name: str, product_name: str, admin_student_id: int) -> dict:
+    """
+    Создать команду с новым уникальным кодом приглашения.
+
+    Returns:
+        Словарь с информацией о созданной команде (как db.team_create)
+    """
+    for attempt in range(1, MAX_CREATE_ATTEMPTS + 1):
+        code = generate_code()
+        try:
+            team = db.team_create(team_name, product_name, code, admin_student_id)
+        except Exception as e:
+            if not myconn.is_duplicate_key(e, INVITE_CODE_KEY):
+                raise
+            logger.warning(f"Invite code collision (attempt {attempt}), generating a new one")
+            continue
+        # Код мог попасть в кэш как несуществующий
+        cache.invalidate(code)
+        return team
+    raise RuntimeError(f"Could not generate a unique invite code in {MAX_CREATE_ATTEMPTS} attempts")
@@ -1 +1,24 @@
 # Keyboards Package
+
+from bot.keyboards import inline, reply
+from config import config
+
+# Клавиатуры, собранные один раз и зависящие от конфига
+CACHED_KEYBOARDS = (
+    reply.get_main_menu_keyboard,
+    reply.get_roles_keyboard,
+    reply.get_sprints_keyboard,
+    reply.get_ratings_keyboard,
+    inline.get_roles_inline_keyboard,
+    inline.get_sprints_inline_keyboard,
+    inline.get_ratings_inline_keyboard,
+)
+
+
+def clear_cache(changes: dict | None = None):
+    """Сбросить закэшированные клавиатуры (после перезагрузки конфига)"""
+    for builder in CACHED_KEYBOARDS:
+        builder.cache_clear()
+
+
+config.on_reload(clear_cache)
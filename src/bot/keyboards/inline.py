@@ -2,10 +2,15 @@
 Модуль inline-клавиатур для Telegram бота.
 
 Создает различные типы inline-клавиатур для взаимодействия с пользователем.
+Клавиатуры без пользовательских данных строятся один раз (functools.cache);
+кэш сбрасывается при перезагрузке конфига (bot.keyboards.clear_cache).
 """
 
+import functools
+
 import telebot.types
 
+from bot.callback_data import CallbackKind, pack
 from config import config
 
 
@@ -24,6 +29,7 @@ def get_confirmation_inline_keyboard(
     return markup
 
 
+@functools.cache
 def get_roles_inline_keyboard():
     """Inline клавиатура выбора роли"""
     roles = [
@@ -44,6 +50,7 @@ def get_roles_inline_keyboard():
     return markup
 
 
+@functools.cache
 def get_sprints_inline_keyboard():
     """Иnline клавиатура выбора спринта"""
     markup = telebot.types.InlineKeyboardMarkup()
@@ -57,7 +64,7 @@ def get_sprints_inline_keyboard():
                 buttons.append(
                     telebot.types.InlineKeyboardButton(
                         text=sprints[i + j],
-                        callback_data=f"sprint_{sprint_num}",
+                        callback_data=pack(CallbackKind.SPRINT, sprint_num),
                     )
                 )
         if buttons:
@@ -67,6 +74,7 @@ def get_sprints_inline_keyboard():
     return markup
 
 
+@functools.cache
 def get_ratings_inline_keyboard():
     """Иnline клавиатура выбора оценки"""
     markup = telebot.types.InlineKeyboardMarkup()
@@ -74,20 +82,25 @@ def get_ratings_inline_keyboard():
     # Первая строка: 1-5
     row1 = []
     for i in range(config.features.min_rating, 6):
-        row1.append(telebot.types.InlineKeyboardButton(text=f"⭐ {i}", callback_data=f"rating_{i}"))
+        row1.append(telebot.types.InlineKeyboardButton(text=f"⭐ {i}", callback_data=pack(CallbackKind.RATING, i)))
 
     # Вторая строка: 6-10
     row2 = []
     for i in range(6, config.features.max_rating + 1):
-        row2.append(telebot.types.InlineKeyboardButton(text=f"⭐ {i}", callback_data=f"rating_{i}"))
+        row2.append(telebot.types.InlineKeyboardButton(text=f"⭐ {i}", callback_data=pack(CallbackKind.RATING, i)))
 
     markup.row(*row1)
     markup.row(*row2)
     return markup
 
 
-def get_dynamic_inline_keyboard(items: list[str], callback_prefix: str, columns: int = 2):
-    """Динамическая inline клавиатура для списков (участники, отчеты и т.д.)"""
+def get_dynamic_inline_keyboard(items: list[str], kind: CallbackKind, values: list[int], columns: int = 2):
+    """
+    Динамическая inline клавиатура для списков (участники, отчеты и т.д.)
+
+    В callback_data кладется значение из values (например, student_id), а не индекс
+    в списке, поэтому устаревшая клавиатура не укажет на другой элемент.
+    """
     markup = telebot.types.InlineKeyboardMarkup()
 
     for i in range(0, len(items), columns):
@@ -103,7 +116,7 @@ def get_dynamic_inline_keyboard(items: list[str], callback_prefix: str, columns:
                 buttons.append(
                     telebot.types.InlineKeyboardButton(
                         text=item_text,
-                        callback_data=f"{callback_prefix}_{item_index}",
+                        callback_data=pack(kind, values[item_index]),
                     )
                 )
         if buttons:
@@ -153,7 +166,7 @@ def get_review_confirm_keyboard():
     return get_confirmation_inline_keyboard("⭐ Отправить", "❌ Отмена", "confirm_review", "cancel_review")
 
 
-def get_team_member_management_keyboard(members, current_user_id, is_admin=False):
+def get_team_member_management_keyboard(members, current_user_id, is_admin=False, team_id=0):
     """Клавиатура управления участниками команды"""
     markup = telebot.types.InlineKeyboardMarkup()
 
@@ -177,11 +190,11 @@ def get_team_member_management_keyboard(members, current_user_id, is_admin=False
                 markup.row(
                     telebot.types.InlineKeyboardButton(
                         text=f"✏️ {name}",
-                        callback_data=f"edit_member_{member_id}",
+                        callback_data=pack(CallbackKind.EDIT_MEMBER, team_id, member_id),
                     ),
                     telebot.types.InlineKeyboardButton(
                         text="🗑️ Удалить",
-                        callback_data=f"remove_member_{member_id}",
+                        callback_data=pack(CallbackKind.REMOVE_MEMBER, team_id, member_id),
                     ),
                 )
 
@@ -195,21 +208,16 @@ def get_report_management_keyboard(reports):
     if reports:
         # Кнопки для каждого отчета
         for report in reports:
-            # Обрезаем длинный текст отчета для отображения
-            preview_text = report['report_text'][:30] if len(report['report_text']) > 30 else report['report_text']
-            if len(report['report_text']) > 30:
-                preview_text += "..."
-
             sprint_text = f"Спринт №{report['sprint_num']}"
 
             markup.row(
                 telebot.types.InlineKeyboardButton(
                     text=f"✏️ {sprint_text}",
-                    callback_data=f"edit_report_{report['sprint_num']}",
+                    callback_data=pack(CallbackKind.EDIT_REPORT, report['sprint_num']),
                 ),
                 telebot.types.InlineKeyboardButton(
                     text="🗑️ Удалить",
-                    callback_data=f"delete_report_{report['sprint_num']}",
+                    callback_data=pack(CallbackKind.DELETE_REPORT, report['sprint_num']),
                 ),
             )
 
@@ -2,13 +2,18 @@
 Модуль reply-клавиатур для Telegram бота.
 
 Создает клавиатуры основного меню и навигации по боту.
+Клавиатуры без пользовательских данных строятся один раз (functools.cache);
+кэш сбрасывается при перезагрузке конфига (bot.keyboards.clear_cache).
 """
 
+import functools
+
 import telebot.types
 
 from config import config
 
 
+@functools.cache
 def get_main_menu_keyboard(is_admin: bool = False, has_team: bool = False):
     """Создает основную клавиатуру в зависимости от статуса пользователя"""
     markup = telebot.types.ReplyKeyboardMarkup(resize_keyboard=True)
@@ -58,6 +63,7 @@ def get_confirmation_keyboard(confirm_text: str = "Продолжить", cancel
     return markup
 
 
+@functools.cache
 def get_roles_keyboard():
     """Клавиатура выбора роли"""
     roles = ["Product owner", "Scrum Master", "Разработчик", "Участник команды"]
@@ -73,6 +79,7 @@ def get_roles_keyboard():
     return markup
 
 
+@functools.cache
 def get_sprints_keyboard():
     """Клавиатура выбора спринта"""
     markup = telebot.types.ReplyKeyboardMarkup(resize_keyboard=True, one_time_keyboard=True)
@@ -91,6 +98,7 @@ def get_sprints_keyboard():
     return markup
 
 
+@functools.cache
 def get_ratings_keyboard():
     """Клавиатура выбора оценки"""
     markup = telebot.types.ReplyKeyboardMarkup(resize_keyboard=True, one_time_keyboard=True)
@@ -6,6 +6,7 @@ Telegram-бот для отслеживания прогресса студен
 и управления проектами по методологии Scrum.
 """
 
+import os
 import signal
 import sys
 
@@ -14,78 +15,174 @@ import telebot
 
 import myconn
 from bot import bot_instance
-from bot.handlers import admin as admin_handlers
-from bot.handlers import callbacks as callback_handlers
-from bot.handlers import reports as reports_handlers
-from bot.handlers import reviews as reviews_handlers
-from bot.handlers import start as start_handlers
-from bot.handlers import team as team_handlers
-from bot.middlewares import logging as logging_middleware
-from config import config
-
-# Настройка логирования с loguru
-loguru.logger.add(
-    config.logging.file,
-    rotation=config.logging.rotation,
-    retention=config.logging.retention,
-    level=config.logging.level,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}",
-)
+from bot.outbox import Outbox, QueuedBot
+from config import ConfigWatcher, config
+from startup import StartupTimer
 
 logger = loguru.logger
 
-# Проверяем конфигурацию
-if not config.bot.token:
-    logger.error("BOT_TOKEN not set in config.py")
-    exit(1)
-
-# Создаем бота
-bot = telebot.TeleBot(config.bot.token)
-bot_instance.set_bot_instance(bot)
-
-# Применяем middleware для логирования
-logging_middleware.setup_logging_middleware(bot)
-
-# Регистрируем обработчики
-start_handlers.register_start_handlers(bot)
-team_handlers.register_team_handlers(bot)
-reports_handlers.register_reports_handlers(bot)
-reviews_handlers.register_reviews_handlers(bot)
-admin_handlers.register_admin_handlers(bot)
-callback_handlers.register_callback_handlers(bot)
 
+def setup_logging():
+    """Настройка логирования с loguru"""
+    loguru.logger.add(
+        config.logging.file,
+        rotation=config.logging.rotation,
+        retention=config.logging.retention,
+        level=config.logging.level,
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}",
+    )
+
+
+def create_bot(token: str, threaded: bool = True, **outbox_options) -> tuple[telebot.TeleBot, Outbox]:
+    """
+    Создать бота, очередь исходящих сообщений и зарегистрировать обработчики.
+
+    outbox_options переопределяют лимиты из секции outbox конфига
+    (например, нагрузочный тест снимает ограничения скорости).
+    """
+    # Без этого флага TeleBot не принимает middleware_handler (логирование апдейтов)
+    telebot.apihelper.ENABLE_MIDDLEWARE = True
+    bot = telebot.TeleBot(token, threaded=threaded)
+
+    # Очередь исходящих сообщений: обработчики не ждут ответа Bot API
+    options = {
+        'workers': config.outbox.workers,
+        'global_rate': config.outbox.global_rate,
+        'per_chat_rate': config.outbox.per_chat_rate,
+        'per_chat_burst': config.outbox.per_chat_burst,
+        'max_retries': config.outbox.max_retries,
+        **outbox_options,
+    }
+    outbox = Outbox(bot, **options)
+    outbox.start()
+
+    # Обработчики импортируют bot из bot_instance при загрузке модуля,
+    # поэтому экземпляр устанавливается до их импорта
+    bot_instance.set_bot_instance(QueuedBot(bot, outbox))
+
+    from bot.handlers import admin as admin_handlers
+    from bot.handlers import callbacks as callback_handlers
+    from bot.handlers import dialogs as dialog_handlers
+    from bot.handlers import reports as reports_handlers
+    from bot.handlers import reviews as reviews_handlers
+    from bot.handlers import start as start_handlers
+    from bot.handlers import team as team_handlers
+    from bot.middlewares import logging as logging_middleware
+    from bot.router import router
+
+    # Применяем middleware для логирования
+    logging_middleware.setup_logging_middleware(bot)
+
+    # Регистрируем обработчики
+    start_handlers.register_start_handlers(bot)
+    team_handlers.register_team_handlers(bot)
+    reports_handlers.register_reports_handlers(bot)
+    reviews_handlers.register_reviews_handlers(bot)
+    admin_handlers.register_admin_handlers(bot)
+    callback_handlers.register_callback_handlers(bot)
+    dialog_handlers.register_dialog_handlers(bot)
+
+    # Маршрутизатор текстовых сообщений и callback-запросов (после команд /start, /help)
+    router.install(bot)
+    return bot, outbox
+
+
+def connect_db():
+    """Подключиться к БД при старте, чтобы ошибка настроек была видна сразу"""
+    try:
+        myconn.get_connection()
+    except Exception as e:
+        logger.error(f"Database connection failed: {e}")
+
+
+def start(timer: StartupTimer | None = None):
+    """
+    Подготовить бота к работе (всё, кроме polling).
+
+    Returns:
+        Бот, очередь сообщений, наблюдатель за конфигом и планировщик напоминаний
+    """
+    timer = timer or StartupTimer()
+
+    with timer.phase("config"):
+        settings = config.settings
+    with timer.phase("logging"):
+        setup_logging()
+
+    # Проверяем конфигурацию
+    if not settings.bot.token:
+        logger.error("BOT_TOKEN not set in config.py")
+        sys.exit(1)
+
+    with timer.phase("db connect"):
+        connect_db()
+    with timer.phase("handlers"):
+        bot, outbox = create_bot(settings.bot.token)
+
+    # Перезагрузка конфига без перезапуска: по изменению файлов и по SIGHUP
+    config_watcher = ConfigWatcher(config, interval=config.get('config_reload.watch_interval', 5))
+    config_watcher.start()
+
+    # Напоминания о несданных отчётах перед сроком сдачи
+    reminder_scheduler = None
+    if config.get('reminders.enabled', False):
+        with timer.phase("reminders"):
+            # Импорт только при включённых напоминаниях
+            from bot.reminders import ReminderScheduler
+
+            reminder_scheduler = ReminderScheduler.from_config(outbox)
+            reminder_scheduler.start()
+
+    logger.info(f"Startup: {timer.summary()}")
+    if os.environ.get('STUDTEAMS_PROFILE_STARTUP'):
+        timer.emit()
+    return bot, outbox, config_watcher, reminder_scheduler
+
+
+def main():
+    timer = StartupTimer()
+    bot, outbox, config_watcher, reminder_scheduler = start(timer)
+
+    def signal_handler(sig, frame):
+        """Обработчик сигналов для graceful shutdown."""
+        logger.info(f"Received signal {sig}. Shutting down gracefully...")
+        config_watcher.stop()
+        if reminder_scheduler:
+            reminder_scheduler.stop()
+        # Отправляем то, что уже стоит в очереди
+        outbox.stop()
+        try:
+            # Закрываем соединение с БД
+            myconn.close_connection()
+            logger.info("Database connection closed")
+        except Exception as e:
+            logger.error(f"Error closing database connection: {e}")
+        finally:
+            logger.info("Bot stopped")
+            sys.exit(0)
+
+    # Регистрируем обработчики сигналов
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGHUP, lambda sig, frame: config_watcher.request_reload())
+
+    logger.info("StudHelper Bot starting...")
 
-def signal_handler(sig, frame):
-    """Обработчик сигналов для graceful shutdown."""
-    logger.info(f"Received signal {sig}. Shutting down gracefully...")
     try:
-        # Закрываем соединение с БД
-        myconn.close_connection()
-        logger.info("Database connection closed")
+        # Удаляем webhook если он активен
+        bot.remove_webhook()
+        logger.info("Webhook deleted (if it was active)")
+
+        # Запускаем polling
+        logger.info("Bot is running. Press Ctrl+C to stop.")
+        bot.infinity_polling()
+    except KeyboardInterrupt:
+        logger.info("Bot stopped by user (Ctrl+C)")
+        signal_handler(signal.SIGINT, None)
     except Exception as e:
-        logger.error(f"Error closing database connection: {e}")
-    finally:
-        logger.info("Bot stopped")
-        sys.exit(0)
-
-
-# Регистрируем обработчики сигналов
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
-
-logger.info("StudHelper Bot starting...")
-
-try:
-    # Удаляем webhook если он активен
-    bot.remove_webhook()
-    logger.info("Webhook deleted (if it was active)")
-
-    # Запускаем polling
-    logger.info("Bot is running. Press Ctrl+C to stop.")
-    bot.infinity_polling()
-except KeyboardInterrupt:
-    logger.info("Bot stopped by user (Ctrl+C)")
-    signal_handler(signal.SIGINT, None)
-except Exception as e:
-    logger.error(f"Bot startup error: {e}")
-    raise
+        logger.error(f"Bot startup error: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
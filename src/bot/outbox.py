@@ -0,0 +1,330 @@
+"""
+Очередь исходящих сообщений Telegram.
+
+Обработчики не ждут ответа Bot API: вызовы send_message, edit_message_text и
+answer_callback_query ставятся в очередь и выполняются пулом фоновых потоков.
+
+- глобальный и поканальный token bucket под лимиты Telegram
+  (~30 сообщений/с на бота, ~1 сообщение/с в один чат);
+- ошибка 429 не блокирует поток: чат откладывается на retry_after секунд;
+- порядок сообщений внутри одного чата сохраняется;
+- корзины простаивающих чатов и истёкшие отсрочки 429 периодически
+  удаляются, чтобы память не росла с числом чатов;
+- подряд идущие send_message в один чат склеиваются в одно сообщение,
+  если у первого нет клавиатуры и совпадает parse_mode.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+import loguru
+import telebot
+from telebot.apihelper import ApiTelegramException
+
+logger = loguru.logger
+
+# Методы, на которые распространяются лимиты Telegram на отправку сообщений
+RATE_LIMITED_METHODS = frozenset({'send_message', 'edit_message_text'})
+
+# Максимальная длина текста сообщения в Telegram
+MAX_MESSAGE_LENGTH = 4096
+
+# Разделитель склеенных сообщений
+COALESCE_SEPARATOR = "\n\n"
+
+# Префикс ключа очереди для answer_callback_query (не привязаны к чату и лимитам)
+ANSWERS_KEY = "answer"
+
+# Как часто удалять состояние простаивающих чатов, секунд
+EVICT_INTERVAL = 60
+
+
+class TokenBucket:
+    """Token bucket: rate токенов в секунду, не более capacity накопленных"""
+
+    __slots__ = ('_tokens', '_updated', 'capacity', 'rate')
+
+    def __init__(self, rate: float, capacity: float, now: float | None = None):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic() if now is None else now
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def delay(self, now: float) -> float:
+        """Сколько секунд ждать до появления токена"""
+        self._refill(now)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def consume(self, now: float):
+        """Забрать один токен (вызывать после delay() == 0)"""
+        self._refill(now)
+        self._tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        """Корзина полная: её можно удалить и создать заново без изменения лимита"""
+        self._refill(now)
+        return self._tokens >= self.capacity
+
+
+class OutgoingRequest:
+    """Отложенный вызов метода Bot API"""
+
+    __slots__ = ('args', 'attempts', 'callbacks', 'kwargs', 'method')
+
+    def __init__(self, method: str, args: tuple, kwargs: dict, on_done: Callable | None = None):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.callbacks = [on_done] if on_done else []
+        self.attempts = 0
+
+    def can_absorb(self, other: "OutgoingRequest") -> bool:
+        """Можно ли дописать текст other в это сообщение"""
+        if self.method != 'send_message' or other.method != 'send_message':
+            return False
+        if self.kwargs.get('reply_markup') is not None:
+            return False
+        if self.kwargs.get('parse_mode') != other.kwargs.get('parse_mode'):
+            return False
+        length = len(self.args[1]) + len(COALESCE_SEPARATOR) + len(other.args[1])
+        return length <= MAX_MESSAGE_LENGTH
+
+    def absorb(self, other: "OutgoingRequest"):
+        """Склеить текст; клавиатура и параметры берутся из последнего сообщения"""
+        chat_id, text = self.args
+        self.args = (chat_id, text + COALESCE_SEPARATOR + other.args[1])
+        self.kwargs = other.kwargs
+        self.callbacks.extend(other.callbacks)
+
+
+class Outbox:
+    """Планировщик исходящих сообщений с пулом фоновых отправителей"""
+
+    def __init__(
+        self,
+        bot: telebot.TeleBot,
+        workers: int = 4,
+        global_rate: float = 30,
+        per_chat_rate: float = 1,
+        per_chat_burst: float = 3,
+        max_retries: int = 5,
+    ):
+        self._bot = bot
+        self._workers_count = workers
+        self._per_chat_rate = per_chat_rate
+        self._per_chat_burst = per_chat_burst
+        self._max_retries = max_retries
+
+        self._cond = threading.Condition()
+        self._queues: dict = {}
+        self._ready: deque = deque()
+        self._busy: set = set()
+        self._not_before: dict = {}
+        self._chat_buckets: dict = {}
+        self._global_bucket = TokenBucket(global_rate, global_rate)
+        self._evict_at = time.monotonic() + EVICT_INTERVAL
+        self._pending = 0
+        self._running = False
+        self._threads: list[threading.Thread] = []
+
+    def submit(self, key, method: str, *args, on_done: Callable | None = None, **kwargs):
+        """
+        Поставить вызов в очередь.
+
+        Args:
+            key: Ключ очереди (chat_id); вызовы с одним ключом выполняются по порядку
+            method: Имя метода TeleBot
+            on_done: Вызывается после выполнения с аргументом error (None при успехе)
+        """
+        request = OutgoingRequest(method, args, kwargs, on_done)
+        with self._cond:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = deque()
+            queue.append(request)
+            self._pending += 1
+            if len(queue) == 1 and key not in self._busy:
+                self._ready.append(key)
+            self._cond.notify()
+
+    def start(self):
+        """Запустить фоновые потоки отправки"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        for i in range(self._workers_count):
+            thread = threading.Thread(target=self._worker, name=f"outbox-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Дождаться отправки всех сообщений. Возвращает False по таймауту"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout: float | None = 5.0):
+        """Дождаться отправки очереди (не дольше timeout) и остановить потоки"""
+        if not self.flush(timeout):
+            logger.warning(f"Outbox stopped with {self._pending} unsent requests")
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads.clear()
+
+    @property
+    def pending(self) -> int:
+        """Количество ещё не выполненных вызовов"""
+        return self._pending
+
+    def _chat_bucket(self, key) -> TokenBucket:
+        bucket = self._chat_buckets.get(key)
+        if bucket is None:
+            bucket = self._chat_buckets[key] = TokenBucket(self._per_chat_rate, self._per_chat_burst)
+        return bucket
+
+    def _evict_idle(self, now: float):
+        """Удалить полные корзины и истёкшие отсрочки чатов без очереди (под self._cond)"""
+        self._evict_at = now + EVICT_INTERVAL
+        for key in [key for key, until in self._not_before.items() if until <= now]:
+            del self._not_before[key]
+        for key in [
+            key for key, bucket in self._chat_buckets.items()
+            if key not in self._queues and bucket.is_full(now)
+        ]:
+            del self._chat_buckets[key]
+
+    def _take(self, now: float):
+        """
+        Выбрать чат, которому можно отправлять прямо сейчас.
+
+        Returns:
+            (key, request) или (None, секунды ожидания)
+        """
+        wait = None
+        global_delay = self._global_bucket.delay(now)
+
+        for _ in range(len(self._ready)):
+            key = self._ready.popleft()
+            request = self._queues[key][0]
+
+            delay = self._not_before.get(key, 0) - now
+            if request.method in RATE_LIMITED_METHODS:
+                delay = max(delay, self._chat_bucket(key).delay(now), global_delay)
+
+            if delay <= 0:
+                queue = self._queues[key]
+                queue.popleft()
+                # Склеиваем подряд идущие сообщения в этот чат
+                while queue and request.can_absorb(queue[0]):
+                    request.absorb(queue.popleft())
+                    self._pending -= 1
+                if request.method in RATE_LIMITED_METHODS:
+                    self._chat_bucket(key).consume(now)
+                    self._global_bucket.consume(now)
+                self._busy.add(key)
+                return key, request
+
+            self._ready.append(key)
+            wait = delay if wait is None else min(wait, delay)
+
+        return None, wait
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running:
+                        return
+                    now = time.monotonic()
+                    if now >= self._evict_at:
+                        self._evict_idle(now)
+                    key, request = self._take(now)
+                    if key is not None:
+                        break
+                    self._cond.wait(request)
+
+            error = self._execute(key, request)
+
+            with self._cond:
+                self._busy.discard(key)
+                queue = self._queues[key]
+                if error is _RETRY:
+                    queue.appendleft(request)
+                else:
+                    self._pending -= 1
+                if queue:
+                    self._ready.append(key)
+                else:
+                    del self._queues[key]
+                self._cond.notify_all()
+
+            if error is not _RETRY:
+                for callback in request.callbacks:
+                    try:
+                        callback(error)
+                    except Exception as e:
+                        logger.error(f"Outbox callback failed: {type(e).__name__}: {e!s}")
+
+    def _execute(self, key, request: OutgoingRequest):
+        """Выполнить вызов. Возвращает None, исключение или _RETRY"""
+        request.attempts += 1
+        try:
+            getattr(self._bot, request.method)(*request.args, **request.kwargs)
+            return None
+        except ApiTelegramException as e:
+            if e.error_code == 429 and request.attempts <= self._max_retries:
+                retry_after = (e.result_json.get('parameters') or {}).get('retry_after', 1)
+                logger.warning(f"Flood limit for chat {key}: retry after {retry_after}s")
+                with self._cond:
+                    self._not_before[key] = time.monotonic() + retry_after
+                return _RETRY
+            logger.error(f"Outbox {request.method} to {key} failed: {e.description}")
+            return e
+        except Exception as e:
+            logger.error(f"Outbox {request.method} to {key} failed: {type(e).__name__}: {e!s}")
+            return e
+
+
+# Маркер повторной отправки после 429
+_RETRY = object()
+
+
+class QueuedBot:
+    """
+    Прокси над TeleBot для обработчиков.
+
+    Методы отправки ставят вызов в Outbox и сразу возвращают управление,
+    остальные атрибуты берутся у исходного бота.
+    """
+
+    def __init__(self, bot: telebot.TeleBot, outbox: Outbox):
+        self._bot = bot
+        self.outbox = outbox
+
+    def send_message(self, chat_id, text, **kwargs):
+        """Отправить сообщение через очередь"""
+        self.outbox.submit(chat_id, 'send_message', chat_id, text, **kwargs)
+
+    def edit_message_text(self, text, chat_id=None, message_id=None, **kwargs):
+        """Изменить текст сообщения через очередь"""
+        self.outbox.submit(chat_id, 'edit_message_text', text, chat_id, message_id, **kwargs)
+
+    def answer_callback_query(self, callback_query_id, text=None, **kwargs):
+        """Ответить на callback-запрос через очередь (без лимитов на чат)"""
+        key = (ANSWERS_KEY, callback_query_id)
+        self.outbox.submit(key, 'answer_callback_query', callback_query_id, text, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._bot, name)
@@ -0,0 +1,279 @@
+"""
+Рассылка напоминаний о несданных отчётах по спринтам.
+
+Участники без отчёта выбираются одним запросом (db.report_get_missing_submitters),
+сообщения отправляются через Outbox с его лимитами Telegram. Отправленные
+student_id сохраняются в файл прогресса, поэтому прерванная рассылка
+продолжается с места остановки и никому не приходит дважды. Студенты, до
+которых не дошло сообщение из-за временной ошибки (429 после всех повторов,
+5xx, сеть), в файл не попадают и получат напоминание при следующем запуске.
+
+Сроки сдачи в конфиге - местное время сервера.
+
+Запуск вручную:
+    PYTHONPATH=src python -m bot.reminders --sprint 3
+"""
+
+import argparse
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import loguru
+from telebot.apihelper import ApiTelegramException
+
+from bot import db, tgtexts
+from bot.outbox import Outbox
+from config import config
+
+logger = loguru.logger
+
+# Формат сроков сдачи в конфиге и в тексте напоминания
+DEADLINE_FORMAT = "%Y-%m-%d %H:%M"
+DISPLAY_FORMAT = "%d.%m.%Y %H:%M"
+
+# Сколько ждать подтверждения отправки от Outbox, секунд
+DELIVERY_TIMEOUT = 120
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """Отказ Telegram, который не исправится повтором: бот заблокирован, чат не найден"""
+    if not isinstance(error, ApiTelegramException):
+        return False
+    if error.error_code == 403:
+        return True
+    return error.error_code == 400 and "chat not found" in (error.description or "").lower()
+
+
+class ReminderCheckpoint:
+    """Файл прогресса рассылки по одному спринту"""
+
+    def __init__(self, path: str | Path, save_every: int = 50):
+        self.path = Path(path)
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._sent: set[int] = set()
+        self._unsaved = 0
+
+        if self.path.exists():
+            try:
+                self._sent = set(json.loads(self.path.read_text())['sent'])
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Broken reminder checkpoint {self.path}: {e!s}")
+
+    def is_sent(self, student_id: int) -> bool:
+        """Напоминание студенту уже отправлено"""
+        return student_id in self._sent
+
+    def mark_sent(self, student_id: int):
+        """Отметить отправку; файл сохраняется каждые save_every отметок"""
+        with self._lock:
+            self._sent.add(student_id)
+            self._unsaved += 1
+            if self._unsaved >= self.save_every:
+                self._save_locked()
+
+    def save(self):
+        """Сохранить прогресс на диск"""
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Пишем во временный файл и атомарно подменяем, чтобы не потерять прогресс при падении
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({'sent': sorted(self._sent)}))
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    @property
+    def sent_count(self) -> int:
+        """Количество отправленных напоминаний"""
+        return len(self._sent)
+
+
+def broadcast_reminders(
+    outbox: Outbox,
+    sprint_num: int,
+    deadline: datetime | None,
+    checkpoint: ReminderCheckpoint,
+    max_in_flight: int = 20,
+    delivery_timeout: float = DELIVERY_TIMEOUT,
+) -> int:
+    """
+    Разослать напоминания студентам без отчёта по спринту.
+
+    В Outbox одновременно находится не больше max_in_flight напоминаний,
+    чтобы рассылка не задерживала ответы пользователям, работающим с ботом.
+    Если Outbox не подтверждает отправку дольше delivery_timeout (например,
+    остановлен с неотправленной очередью), рассылка прерывается; прогресс
+    сохраняется.
+
+    Returns:
+        Количество отправленных напоминаний
+    """
+    students = db.report_get_missing_submitters(sprint_num)
+    pending = [s for s in students if s['tg_id'] and not checkpoint.is_sent(s['student_id'])]
+    logger.info(
+        f"Sprint {sprint_num} reminders: {len(students)} missing reports, "
+        f"{len(pending)} to notify, {checkpoint.sent_count} already notified"
+    )
+
+    deadline_text = deadline.strftime(DISPLAY_FORMAT) if deadline else "уточните у преподавателя"
+    slots = threading.Semaphore(max_in_flight)
+    delivered = 0
+    delivered_lock = threading.Lock()
+
+    def on_done(student_id: int, error: Exception | None):
+        nonlocal delivered
+        if error is None or is_permanent_failure(error):
+            checkpoint.mark_sent(student_id)
+        if error is None:
+            with delivered_lock:
+                delivered += 1
+        slots.release()
+
+    for student in pending:
+        if not slots.acquire(timeout=delivery_timeout):
+            logger.warning(f"Sprint {sprint_num} reminders: outbox does not respond, broadcast interrupted")
+            break
+        text = tgtexts.REPORT_REMINDER_MESSAGE.format(
+            sprint_num=sprint_num,
+            team_name=student['team_name'],
+            deadline=deadline_text,
+        )
+        student_id = student['student_id']
+        outbox.submit(
+            student['tg_id'], 'send_message', student['tg_id'], text,
+            on_done=lambda error, student_id=student_id: on_done(student_id, error),
+        )
+
+    # Дожидаемся последних отправок
+    for _ in range(max_in_flight):
+        if not slots.acquire(timeout=delivery_timeout):
+            logger.warning(f"Sprint {sprint_num} reminders: outbox does not respond, some results are unknown")
+            break
+    checkpoint.save()
+
+    logger.info(f"Sprint {sprint_num} reminders: {delivered} of {len(pending)} delivered")
+    return delivered
+
+
+def parse_deadlines(raw) -> dict[int, datetime]:
+    """Преобразовать {номер спринта: 'YYYY-MM-DD HH:MM'} (местное время) из конфига"""
+    if not raw:
+        return {}
+    return {int(sprint): parse_deadline(str(value)) for sprint, value in raw.items()}
+
+
+def parse_deadline(value: str) -> datetime:
+    """Срок сдачи 'YYYY-MM-DD HH:MM' в местном времени сервера"""
+    return datetime.strptime(value, DEADLINE_FORMAT).astimezone()
+
+
+def due_sprints(deadlines: dict[int, datetime], now: datetime, lead: timedelta) -> list[int]:
+    """Спринты, до сдачи которых осталось не больше lead"""
+    return sorted(sprint for sprint, deadline in deadlines.items() if deadline - lead <= now < deadline)
+
+
+class ReminderScheduler:
+    """Фоновый поток, запускающий рассылку перед сроком сдачи отчётов"""
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        deadlines: dict[int, datetime],
+        lead_hours: float = 24,
+        check_interval: float = 600,
+        checkpoint_dir: str | Path = "data/reminders",
+    ):
+        self.outbox = outbox
+        self.deadlines = deadlines
+        self.lead = timedelta(hours=lead_hours)
+        self.check_interval = check_interval
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_config(cls, outbox: Outbox) -> "ReminderScheduler":
+        """Создать планировщик по секции reminders конфига"""
+        return cls(
+            outbox,
+            parse_deadlines(config.get('reminders.deadlines')),
+            lead_hours=config.get('reminders.lead_hours', 24),
+            check_interval=config.get('reminders.check_interval', 600),
+            checkpoint_dir=config.get('reminders.checkpoint_dir', "data/reminders"),
+        )
+
+    def checkpoint_for(self, sprint_num: int) -> ReminderCheckpoint:
+        """Файл прогресса рассылки по спринту"""
+        return ReminderCheckpoint(self.checkpoint_dir / f"sprint_{sprint_num}.json")
+
+    def run_pending(self, now: datetime | None = None):
+        """Разослать напоминания по всем спринтам, срок которых подходит"""
+        for sprint_num in due_sprints(self.deadlines, now or datetime.now().astimezone(), self.lead):
+            if self._stop.is_set():
+                return
+            try:
+                broadcast_reminders(
+                    self.outbox, sprint_num, self.deadlines[sprint_num], self.checkpoint_for(sprint_num)
+                )
+            except Exception as e:
+                logger.error(f"Sprint {sprint_num} reminders failed: {type(e).__name__}: {e!s}")
+
+    def start(self):
+        """Запустить фоновую проверку сроков"""
+        self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Остановить фоновую проверку"""
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_pending()
+            self._stop.wait(self.check_interval)
+
+
+def main():
+    """Ручной запуск рассылки по одному спринту"""
+    import telebot
+
+    parser = argparse.ArgumentParser(description="Напоминания о несданных отчётах")
+    parser.add_argument("--sprint", type=int, required=True, help="Номер спринта")
+    parser.add_argument("--deadline", help=f"Срок сдачи в формате '{DEADLINE_FORMAT}'")
+    parser.add_argument("--dry-run", action="store_true", help="Только посчитать получателей")
+    args = parser.parse_args()
+
+    if args.deadline:
+        deadline = parse_deadline(args.deadline)
+    else:
+        deadline = parse_deadlines(config.get('reminders.deadlines')).get(args.sprint)
+
+    if args.dry_run:
+        students = db.report_get_missing_submitters(args.sprint)
+        logger.info(f"Sprint {args.sprint}: {len(students)} students without report")
+        return
+
+    outbox = Outbox(
+        telebot.TeleBot(config.bot.token),
+        workers=config.outbox.workers,
+        global_rate=config.outbox.global_rate,
+        per_chat_rate=config.outbox.per_chat_rate,
+        per_chat_burst=config.outbox.per_chat_burst,
+        max_retries=config.outbox.max_retries,
+    )
+    outbox.start()
+    try:
+        scheduler = ReminderScheduler.from_config(outbox)
+        broadcast_reminders(outbox, args.sprint, deadline, scheduler.checkpoint_for(args.sprint))
+    finally:
+        outbox.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Состав команд (roster).
+
+Команда студента определяется один раз (по индексу team_members.student_id),
+состав команды читается одним запросом: teams по первичному ключу,
+соединение с team_members и students тоже по ключам, без DISTINCT,
+вложенных IN и OR. Составы кэшируются в памяти бота по team_id и
+сбрасываются функциями bot.db при изменении состава (team_add_member,
+team_remove_member); время жизни записи - страховка от изменений в обход
+бота.
+
+Списки участников (сокомандники, неоценённые сокомандники, все участники
+с администратором) строятся из состава фильтрацией в памяти.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from config import config
+from myconn import select_all, select_one
+
+# Роль администратора в списке всех участников команды
+ADMIN_ROLE = "Scrum Master"
+
+
+class Roster:
+    """Состав команды: администратор и участники (student_id, name, role)"""
+
+    __slots__ = ('admin_name', 'admin_student_id', 'members', 'team_id')
+
+    def __init__(self, team_id: int, admin_student_id: int, admin_name: str, members: tuple[dict, ...]):
+        self.team_id = team_id
+        self.admin_student_id = admin_student_id
+        self.admin_name = admin_name
+        self.members = members
+
+    def member_ids(self) -> set[int]:
+        return {member['student_id'] for member in self.members}
+
+
+class RosterCache:
+    """
+    Кэш составов команд (LRU по team_id) и команд студентов.
+
+    Студент без команды тоже кэшируется: team_add_member сбрасывает запись.
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 1000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._rosters: OrderedDict[int, tuple[float, Roster]] = OrderedDict()
+        self._teams: OrderedDict[int, tuple[float, int | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, entries: OrderedDict, key: int):
+        entry = entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires < time.monotonic():
+            del entries[key]
+            return False, None
+        entries.move_to_end(key)
+        return True, value
+
+    def _put(self, entries: OrderedDict, key: int, value):
+        entries[key] = (time.monotonic() + self.ttl, value)
+        entries.move_to_end(key)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def get_roster(self, team_id: int) -> Roster | None:
+        with self._lock:
+            return self._get(self._rosters, team_id)[1]
+
+    def put_roster(self, roster: Roster):
+        with self._lock:
+            self._put(self._rosters, roster.team_id, roster)
+
+    def get_team_id(self, student_id: int) -> tuple[bool, int | None]:
+        """(найдено в кэше, team_id или None)"""
+        with self._lock:
+            return self._get(self._teams, student_id)
+
+    def put_team_id(self, student_id: int, team_id: int | None):
+        with self._lock:
+            self._put(self._teams, student_id, team_id)
+
+    def invalidate(self, team_id: int, student_id: int | None = None):
+        """Сбросить состав команды и команду студента"""
+        with self._lock:
+            self._rosters.pop(team_id, None)
+            if student_id is not None:
+                self._teams.pop(student_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._rosters.clear()
+            self._teams.clear()
+
+
+cache = RosterCache(
+    ttl=config.get('roster.cache_ttl', 300),
+    max_size=config.get('roster.cache_size', 1000),
+)
+
+
+def load_roster(team_id: int) -> Roster | None:
+    """Состав команды из БД одним запросом (None, если команды нет)"""
+    rows = select_all(
+        """
+        SELECT t.admin_student_id, a.name AS admin_name, s.student_id, s.name, tm.role
+        FROM teams t
+        JOIN students a ON a.student_id = t.admin_student_id
+        LEFT JOIN team_members tm ON tm.team_id = t.team_id
+        LEFT JOIN students s ON s.student_id = tm.student_id
+        WHERE t.team_id = %s
+    """, (team_id,), prepared=True
+    )
+    if not rows:
+        return None
+    members = tuple(
+        {'student_id': row['student_id'], 'name': row['name'], 'role': row['role']}
+        for row in rows if row['student_id'] is not None
+    )
+    return Roster(team_id, rows[0]['admin_student_id'], rows[0]['admin_name'], members)
+
+
+def get_roster(team_id: int) -> Roster | None:
+    """Состав команды (через кэш)"""
+    roster = cache.get_roster(team_id)
+    if roster is None:
+        roster = load_roster(team_id)
+        if roster is not None:
+            cache.put_roster(roster)
+    return roster
+
+
+def team_id_of(student_id: int) -> int | None:
+    """Команда студента (через кэш)"""
+    cached, team_id = cache.get_team_id(student_id)
+    if not cached:
+        row = select_one(
+            "SELECT team_id FROM team_members WHERE student_id = %s LIMIT 1", (student_id,), use_dict=False,
+            prepared=True,
+        )
+        team_id = row[0] if row else None
+        cache.put_team_id(student_id, team_id)
+    return team_id
+
+
+def invalidate(team_id: int, student_id: int | None = None):
+    """Сбросить кэш после изменения состава команды"""
+    cache.invalidate(team_id, student_id)
+
+
+def teammates(team_id: int, student_id: int) -> list[dict]:
+    """Участники команды кроме студента: student_id, name, role"""
+    roster = get_roster(team_id)
+    if roster is None:
+        return []
+    return [dict(member) for member in roster.members if member['student_id'] != student_id]
+
+
+def teammates_not_rated(team_id: int, assessor_id: int) -> list[dict]:
+    """Участники команды, которых студент ещё не оценил: student_id, name"""
+    roster = get_roster(team_id)
+    if roster is None:
+        return []
+    # Оценки меняются чаще состава и не кэшируются; поиск по префиксу первичного ключа
+    rated = {
+        row[0] for row in select_all(
+            "SELECT assessored_student_id FROM team_members_ratings WHERE assessor_student_id = %s",
+            (assessor_id,), use_dict=False, prepared=True,
+        )
+    }
+    return [
+        {'student_id': member['student_id'], 'name': member['name']}
+        for member in roster.members
+        if member['student_id'] != assessor_id and member['student_id'] not in rated
+    ]
+
+
+def all_members(team_id: int) -> list[dict]:
+    """Все участники команды, включая администратора (с ролью ADMIN_ROLE): student_id, name, role"""
+    roster = get_roster(team_id)
+    if roster is None:
+        return []
+    members = [
+        {**member, 'role': ADMIN_ROLE} if member['student_id'] == roster.admin_student_id else dict(member)
+        for member in roster.members
+    ]
+    if roster.admin_student_id not in roster.member_ids():
+        members.insert(0, {'student_id': roster.admin_student_id, 'name': roster.admin_name, 'role': ADMIN_ROLE})
+    return members
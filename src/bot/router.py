@@ -0,0 +1,120 @@
+"""
+Маршрутизатор входящих сообщений и callback-запросов.
+
+Вместо десятков lambda-предикатов, которые telebot перебирает линейно для
+каждого апдейта, все маршруты хранятся в таблицах:
+- состояние FSM пользователя → обработчик (список по ID состояния, bot.fsm);
+- точный текст кнопки → обработчик;
+- точное значение callback_data → обработчик;
+- тип упакованных callback_data (bot.callback_data) → обработчик.
+
+На callback-запрос без маршрута (устаревшая или испорченная кнопка)
+бот отвечает уведомлением, чтобы у пользователя не зависал индикатор
+загрузки на кнопке.
+
+В telebot регистрируется по одному обработчику на тип апдейта, поэтому
+стоимость диспетчеризации не зависит от количества обработчиков.
+"""
+
+from collections.abc import Callable
+
+import loguru
+import telebot
+
+from bot import callback_data
+from bot.fsm import FSM, fsm
+
+logger = loguru.logger
+
+Handler = Callable[..., None]
+
+# Ответ на нажатие кнопки, для которой нет маршрута
+OUTDATED_BUTTON_TEXT = "⚠️ Кнопка устарела. Откройте меню заново."
+
+
+class Router:
+    """Таблица маршрутов с поиском по словарям"""
+
+    def __init__(self, state_machine: FSM | None = None):
+        self.fsm = state_machine or fsm
+        self._texts: dict[str, Handler] = {}
+        self._callbacks: dict[str, Handler] = {}
+        self._callback_kinds: dict[callback_data.CallbackKind, Handler] = {}
+        self._bot: telebot.TeleBot | None = None
+
+    def text(self, text: str, handler: Handler):
+        """Обработчик нажатия reply-кнопки с точным текстом"""
+        self._add(self._texts, text, handler)
+
+    def callback(self, data: str, handler: Handler):
+        """Обработчик callback-запроса с точным значением callback_data"""
+        self._add(self._callbacks, data, handler)
+
+    def callback_kind(self, kind: callback_data.CallbackKind, handler: Handler):
+        """
+        Обработчик упакованных callback_data указанного типа.
+
+        Распакованные данные передаются обработчику в атрибуте callback.payload.
+        """
+        self._add(self._callback_kinds, kind, handler)
+
+    @staticmethod
+    def _add(table: dict, key: str | int, handler: Handler):
+        if key in table:
+            raise ValueError(f"Route {key!r} is already registered")
+        table[key] = handler
+
+    def resolve_message(self, message: telebot.types.Message) -> Handler | None:
+        """Найти обработчик сообщения: состояние FSM имеет приоритет над кнопками"""
+        handler = self.fsm.handler(self.fsm.get_state(message.from_user.id))
+        if handler:
+            return handler
+        return self._texts.get(message.text)
+
+    def resolve_callback(self, callback: telebot.types.CallbackQuery) -> Handler | None:
+        """Найти обработчик callback-запроса: по типу упакованных данных или точному значению"""
+        data = callback.data
+        if not data:
+            return None
+
+        if callback_data.is_packed(data):
+            payload = callback_data.unpack(data)
+            if payload is None:
+                return None
+            # Распаковываем один раз здесь, обработчики читают callback.payload
+            callback.payload = payload
+            return self._callback_kinds.get(payload.kind)
+
+        return self._callbacks.get(data)
+
+    def dispatch_message(self, message: telebot.types.Message):
+        """Передать сообщение найденному обработчику"""
+        handler = self.resolve_message(message)
+        if handler is None:
+            logger.debug(f"No route for message from user_id={message.from_user.id}")
+            return
+        handler(message)
+
+    def dispatch_callback(self, callback: telebot.types.CallbackQuery):
+        """Передать callback-запрос найденному обработчику"""
+        handler = self.resolve_callback(callback)
+        if handler is None:
+            logger.debug(f"No route for callback data='{callback.data}' from user_id={callback.from_user.id}")
+            if self._bot is not None:
+                self._bot.answer_callback_query(callback.id, OUTDATED_BUTTON_TEXT)
+            return
+        handler(callback)
+
+    def install(self, bot_instance: telebot.TeleBot):
+        """
+        Зарегистрировать маршрутизатор в боте.
+
+        Вызывается ПОСЛЕ обработчиков команд (/start, /help), чтобы они сохраняли приоритет.
+        """
+        self._bot = bot_instance
+        bot_instance.register_message_handler(self.dispatch_message, content_types=['text'])
+        bot_instance.register_callback_query_handler(self.dispatch_callback, func=lambda c: True)
+
+
+# Глобальный экземпляр маршрутизатора
+router = Router()
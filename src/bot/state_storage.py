@@ -2,6 +2,7 @@
 Простое хранилище состояний для телебота.
 
 Используется для хранения состояний пользователей и данных между шагами диалога.
+Состояние хранится как целочисленный ID (bot.fsm.State).
 """
 
 from typing import Any
@@ -14,14 +15,14 @@ class StateStorage:
         self._states = {}
         self._data = {}
 
-    def set_state(self, user_id: int, state: str | None):
+    def set_state(self, user_id: int, state: int | None):
         """Установить состояние пользователя"""
         if state is None:
             self._states.pop(user_id, None)
         else:
             self._states[user_id] = state
 
-    def get_state(self, user_id: int) -> str | None:
+    def get_state(self, user_id: int) -> int | None:
         """Получить состояние пользователя"""
         return self._states.get(user_id)
 
@@ -1,44 +1,47 @@
 """
 Состояния FSM для бота.
 
-Определяет строковые константы для состояний бота (используются с state_storage).
+Каждое состояние - State, небольшой целочисленный ID с именем для логов.
+Обработчики и переходы состояний объявлены в таблице bot.handlers.dialogs.
 """
 
+from bot.fsm import State
+
 
 # Состояния для регистрации команды
 class TeamRegistration:
-    team_name = "TeamRegistration:team_name"
-    product_name = "TeamRegistration:product_name"
-    user_name = "TeamRegistration:user_name"
-    user_group = "TeamRegistration:user_group"
-    confirm = "TeamRegistration:confirm"
+    team_name = State("TeamRegistration:team_name")
+    product_name = State("TeamRegistration:product_name")
+    user_name = State("TeamRegistration:user_name")
+    user_group = State("TeamRegistration:user_group")
+    confirm = State("TeamRegistration:confirm")
 
 
 # Состояния для присоединения к команде
 class JoinTeam:
-    user_name = "JoinTeam:user_name"
-    user_group = "JoinTeam:user_group"
-    user_role = "JoinTeam:user_role"
-    confirm = "JoinTeam:confirm"
+    user_name = State("JoinTeam:user_name")
+    user_group = State("JoinTeam:user_group")
+    user_role = State("JoinTeam:user_role")
+    confirm = State("JoinTeam:confirm")
 
 
 # Состояния для создания отчета
 class ReportCreation:
-    sprint_selection = "ReportCreation:sprint_selection"
-    report_text = "ReportCreation:report_text"
+    sprint_selection = State("ReportCreation:sprint_selection")
+    report_text = State("ReportCreation:report_text")
 
 
 # Состояния для процесса оценки
 class ReviewProcess:
-    teammate_selection = "ReviewProcess:teammate_selection"
-    rating_input = "ReviewProcess:rating_input"
-    advantages_input = "ReviewProcess:advantages_input"
-    disadvantages_input = "ReviewProcess:disadvantages_input"
-    confirmation = "ReviewProcess:confirmation"
+    teammate_selection = State("ReviewProcess:teammate_selection")
+    rating_input = State("ReviewProcess:rating_input")
+    advantages_input = State("ReviewProcess:advantages_input")
+    disadvantages_input = State("ReviewProcess:disadvantages_input")
+    confirmation = State("ReviewProcess:confirmation")
 
 
 # Состояния для административных действий
 class AdminActions:
-    select_member = "AdminActions:select_member"
-    confirm_removal = "AdminActions:confirm_removal"
-    select_member_stats = "AdminActions:select_member_stats"
+    select_member = State("AdminActions:select_member")
+    confirm_removal = State("AdminActions:confirm_removal")
+    select_member_stats = State("AdminActions:select_member_stats")
@@ -28,3 +28,9 @@ HELP_MESSAGE = """
 """
 
 WELCOME_MESSAGE = "👋 Добро пожаловать в StudHelper!\n\nВыберите действие из меню:"
+
+REPORT_REMINDER_MESSAGE = (
+    "⏰ Напоминание: вы ещё не отправили отчёт за спринт {sprint_num} "
+    "(команда «{team_name}»).\n\n"
+    "Срок сдачи: {deadline}. Отправить отчёт можно кнопкой «Отправить отчет»."
+)
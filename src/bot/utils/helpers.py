@@ -5,10 +5,9 @@
 """
 
 import datetime
-import random
-import string
 
 from bot import db as db
+from bot import invites, roster
 from config import config
 
 
@@ -39,11 +38,8 @@ def extract_sprint_number(text: str) -> int | None:
 
 
 def generate_invite_code(length: int = 8) -> str:
-    """Генерирует случайный код приглашения"""
-    characters = string.ascii_uppercase + string.digits
-    # Исключаем похожие символы: 0, O, I, l
-    characters = characters.replace('0', '').replace('O', '').replace('I', '').replace('l', '')
-    return ''.join(random.choice(characters) for _ in range(length))
+    """Генерирует случайный код приглашения (см. bot.invites)"""
+    return invites.generate_code(length)
 
 
 def format_datetime(dt: str | datetime.datetime) -> str:
@@ -172,7 +168,7 @@ def get_team_display_data(student_id: str, tg_id: int):
     team = student['team']
 
     # Получаем всех участников команды, включая администратора
-    all_members = db.team_get_all_members(team['team_id'])
+    all_members = roster.all_members(team['team_id'])
 
     # Проверяем права администратора
     is_admin = team['admin_student_id'] == student['student_id']
@@ -181,7 +177,7 @@ def get_team_display_data(student_id: str, tg_id: int):
 
     # Добавляем inline клавиатуру для управления участниками (только для админов)
     keyboard = inline_keyboards.get_team_member_management_keyboard(
-        all_members, student['student_id'], is_admin,
+        all_members, student['student_id'], is_admin, team['team_id'],
     )
 
     return {
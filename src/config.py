@@ -8,12 +8,83 @@
 - secrets-tgbot.yaml / secrets-webapp.yaml - специфичные секреты
 
 Все ключи объединяются в общем корне без лишней иерархии.
+
+YAML читается при первом обращении к конфигу. Из объединённого конфига один
+раз строится неизменяемый снимок (settings) из frozen-датаклассов со
+__slots__, поэтому config.features.max_sprint_number в обработчиках - это
+обычный доступ к атрибутам, без динамического __getattr__ OmegaConf.
+
+Config.reload() перечитывает YAML и подменяет снимок целиком: новый словарь
+атрибутов экземпляра (все секции сразу) публикуется одним присваиванием
+__dict__, поэтому читатель видит либо только старые, либо только новые
+секции. Для нескольких чтений, которые должны быть согласованы между собой,
+берите снимок один раз: s = config.settings. Подписчики on_reload()
+получают список изменённых ключей (например, чтобы сбросить
+закэшированные клавиатуры). ConfigWatcher вызывает reload() при изменении
+файлов конфига или по запросу (SIGHUP).
 """
 
+import copy
+import dataclasses
+import keyword
+import threading
+from collections.abc import Callable
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
+from loguru import logger
 from omegaconf import OmegaConf
 
+# Части ключей, значения которых не выводятся в лог
+SECRET_KEY_PARTS = ("token", "password", "secret")
+
+
+def _is_attribute_name(key) -> bool:
+    return isinstance(key, str) and key.isidentifier() and not keyword.iskeyword(key)
+
+
+def freeze(value: Any, name: str = "settings") -> Any:
+    """
+    Неизменяемая копия значения конфига.
+
+    Словари с ключами-идентификаторами становятся frozen-датаклассами со
+    __slots__, остальные словари - MappingProxyType, списки - кортежами.
+    """
+    if isinstance(value, dict):
+        if value and all(_is_attribute_name(key) for key in value):
+            class_name = "".join(part.title() for part in name.split('_')) + "Settings"
+            cls = dataclasses.make_dataclass(class_name, list(value), frozen=True, slots=True)
+            return cls(**{key: freeze(item, key) for key, item in value.items()})
+        return MappingProxyType({key: freeze(item, str(key)) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item, name) for item in value)
+    return value
+
+
+def flatten(value: Any, prefix: str = "") -> dict[str, Any]:
+    """{'a': {'b': 1}} -> {'a.b': 1}"""
+    if isinstance(value, dict) and value:
+        flat = {}
+        for key, item in value.items():
+            flat.update(flatten(item, f"{prefix}{key}."))
+        return flat
+    return {prefix.rstrip('.'): value}
+
+
+def diff_configs(old: dict, new: dict) -> dict[str, tuple[Any, Any]]:
+    """Изменённые ключи: {ключ: (старое значение, новое значение)}"""
+    old_flat, new_flat = flatten(old), flatten(new)
+    return {
+        key: (old_flat.get(key), new_flat.get(key))
+        for key in sorted(old_flat.keys() | new_flat.keys())
+        if old_flat.get(key) != new_flat.get(key)
+    }
+
+
+def _loggable(key: str, value: Any) -> Any:
+    return "***" if any(part in key.lower() for part in SECRET_KEY_PARTS) else value
+
 
 class Config:
     """Класс для работы с конфигурацией приложения."""
@@ -29,34 +100,119 @@ class Config:
         # Путь к конфигу - на уровень выше src/, в корне проекта
         self.config_dir = Path(__file__).parent.parent / "config"
         self._config = None
-        self._load_configs()
+        self._settings = None
+        self._sections: set[str] = set()
+        self._listeners: list[Callable[[dict], None]] = []
+        # Перезагрузка, update() и первое построение снимка выполняются по одному
+        # (RLock: подписчик on_reload может вызвать update())
+        self._reload_lock = threading.RLock()
+
+    def source_files(self) -> list[Path]:
+        """Файлы конфига компонента в порядке наложения."""
+        return [
+            self.config_dir / "common.yaml",
+            self.config_dir / f"{self.component}.yaml",
+            self.config_dir / "secrets.yaml",
+            self.config_dir / f"secrets-{self.component}.yaml",
+        ]
 
     def _load_configs(self):
         """Загрузка конфигов послойно."""
-        configs = []
+        self._config = self._read_configs()
+
+    def _read_configs(self):
+        """
+        Прочитать и объединить слои конфига:
+        common -> компонент -> секреты -> секреты компонента
+        (последующие перезаписывают предыдущие).
+        """
+        configs = [OmegaConf.load(path) for path in self.source_files() if path.exists()]
+        return OmegaConf.merge(*configs) if configs else OmegaConf.create()
+
+    def _build_settings(self):
+        """Построить снимок настроек и сделать секции атрибутами экземпляра (под _reload_lock)."""
+        if self._config is None:
+            self._load_configs()
+        self._swap(self._config, freeze(OmegaConf.to_container(self._config, resolve=True)))
+
+    def _swap(self, merged, settings):
+        """
+        Подменить конфиг и снимок (под _reload_lock).
+
+        Новый словарь атрибутов собирается целиком и публикуется одним
+        присваиванием __dict__: читатели не видят смесь старых и новых секций.
+        """
+        fields = dataclasses.fields(settings) if dataclasses.is_dataclass(settings) else ()
+        # Имена методов класса (get, to_dict, ...) не перекрываем
+        names = {field.name for field in fields if not hasattr(type(self), field.name)}
+        state = {key: value for key, value in self.__dict__.items() if key not in self._sections}
+        state.update({name: getattr(settings, name) for name in names})
+        state.update(_config=merged, _settings=settings, _sections=names)
+        self.__dict__ = state
 
-        # 1. Загружаем общий конфиг
-        common_path = self.config_dir / "common.yaml"
-        if common_path.exists():
-            configs.append(OmegaConf.load(common_path))
+    @property
+    def settings(self):
+        """Неизменяемый снимок всего конфига."""
+        settings = self._settings
+        if settings is None:
+            with self._reload_lock:
+                if self._settings is None:
+                    self._build_settings()
+                settings = self._settings
+        return settings
 
-        # 2. Загружаем специфичный конфиг компонента (перезаписывает common)
-        component_path = self.config_dir / f"{self.component}.yaml"
-        if component_path.exists():
-            configs.append(OmegaConf.load(component_path))
+    def update(self, key: str, value):
+        """
+        Изменить значение в памяти и перестроить снимок (для тестов и бенчмарков).
 
-        # 3. Загружаем общие секреты
-        secrets_path = self.config_dir / "secrets.yaml"
-        if secrets_path.exists():
-            configs.append(OmegaConf.load(secrets_path))
+        Args:
+            key: Путь к значению через точку (например, 'features.enable_reviews')
+            value: Новое значение
+        """
+        with self._reload_lock:
+            old_value = self.get(key)
+            # Изменяем копию: объединённый конфиг подменяется вместе со снимком в _swap
+            merged = copy.deepcopy(self._config)
+            OmegaConf.update(merged, key, value)
+            self._swap(merged, freeze(OmegaConf.to_container(merged, resolve=True)))
+            if old_value != value:
+                self._notify({key: (old_value, value)})
 
-        # 4. Загружаем специфичные секреты компонента (перезаписывают общие секреты)
-        component_secrets_path = self.config_dir / f"secrets-{self.component}.yaml"
-        if component_secrets_path.exists():
-            configs.append(OmegaConf.load(component_secrets_path))
+    def on_reload(self, callback: Callable[[dict], None]):
+        """Подписаться на перезагрузку: callback(diff) вызывается после подмены снимка."""
+        self._listeners.append(callback)
+        return callback
 
-        # Объединяем все конфиги (последующие перезаписывают предыдущие)
-        self._config = OmegaConf.merge(*configs) if configs else OmegaConf.create()
+    def reload(self) -> dict[str, tuple[Any, Any]]:
+        """
+        Перечитать YAML и атомарно подменить снимок настроек.
+
+        Returns:
+            Изменённые ключи: {ключ: (старое значение, новое значение)}
+        """
+        with self._reload_lock:
+            old = self.to_dict()
+            merged = self._read_configs()
+            new = OmegaConf.to_container(merged, resolve=True)
+            changes = diff_configs(old, new)
+            if not changes:
+                logger.info(f"Config {self.component}: no changes")
+                return changes
+
+            self._swap(merged, freeze(new))
+            for key, (old_value, new_value) in changes.items():
+                old_value, new_value = _loggable(key, old_value), _loggable(key, new_value)
+                logger.info(f"Config {self.component}: {key}: {old_value!r} -> {new_value!r}")
+
+            self._notify(changes)
+            return changes
+
+    def _notify(self, changes: dict):
+        for callback in self._listeners:
+            try:
+                callback(changes)
+            except Exception as e:
+                logger.error(f"Config reload listener {callback!r} failed: {e}")
 
     def get(self, key: str, default=None):
         """
@@ -70,24 +226,86 @@ class Config:
             Значение конфига или default
         """
         try:
-            # OmegaConf.select может принимать None если конфиг не загружен
             if self._config is None:
-                return default
+                self._load_configs()
             return OmegaConf.select(self._config, key, default=default)
         except Exception:
             return default
 
     def __getattr__(self, name):
-        """Позволяет обращаться к конфигу через точку."""
+        """
+        Позволяет обращаться к конфигу через точку.
+
+        Вызывается только до построения снимка: после него секции лежат
+        в __dict__ экземпляра и находятся без вызова этого метода.
+        """
         if name.startswith('_'):
             return object.__getattribute__(self, name)
-        return getattr(self._config, name)
+        return getattr(self.settings, name)
 
     def to_dict(self):
         """Преобразовать конфиг в словарь."""
+        if self._config is None:
+            self._load_configs()
         return OmegaConf.to_container(self._config, resolve=True)
 
 
+class ConfigWatcher:
+    """
+    Фоновая перезагрузка конфига: при изменении mtime файлов конфига
+    (раз в interval секунд, 0 - не следить) или по request_reload().
+    """
+
+    def __init__(self, config: Config, interval: float = 5):
+        self.config = config
+        self.interval = interval
+        # Загружаем конфиг сразу, чтобы снимок соответствовал запомненным mtime
+        config.settings  # noqa: B018
+        self._mtimes = self._read_mtimes()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _read_mtimes(self) -> dict[Path, float]:
+        return {path: path.stat().st_mtime for path in self.config.source_files() if path.exists()}
+
+    def check(self, force: bool = False) -> dict | None:
+        """Перезагрузить конфиг, если файлы изменились (или force). Возвращает diff"""
+        mtimes = self._read_mtimes()
+        if not force and mtimes == self._mtimes:
+            return None
+        self._mtimes = mtimes
+        try:
+            return self.config.reload()
+        except Exception as e:
+            # Ошибка в YAML не должна ронять бота: продолжаем со старым снимком
+            logger.error(f"Config {self.config.component} reload failed: {e}")
+            return None
+
+    def request_reload(self):
+        """Запросить перезагрузку (безопасно вызывать из обработчика сигнала)."""
+        self._wakeup.set()
+
+    def start(self):
+        """Запустить фоновый поток"""
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Остановить фоновый поток"""
+        self._stop.set()
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            requested = self._wakeup.wait(self.interval or None)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            if requested or self.interval:
+                self.check(force=requested)
+
+
 # Глобальные экземпляры конфигов для разных компонентов
 _tgbot_config = None
 _webapp_config = None
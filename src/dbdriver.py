@@ -0,0 +1,386 @@
+"""
+Драйверы базы данных для myconn.
+
+Драйвер выбирается настройкой database.driver в config/common.yaml
+(или переменной окружения STUDTEAMS_DB_DRIVER):
+- mysql-connector      - mysql.connector, C-расширение, если оно собрано (иначе протокол на Python)
+- mysql-connector-pure - mysql.connector, протокол на Python
+- pymysql              - PyMySQL (pip install PyMySQL)
+- mysqlclient          - MySQLdb на libmysqlclient (pip install mysqlclient)
+- sqlite               - встроенная база SQLite в файле (один сервер, CI, разработка)
+
+Драйвер отвечает только за различия библиотек: подключение, виды курсоров,
+проверку соединения и коды ошибок. Запросы пишутся на диалекте MySQL (с
+плейсхолдерами %s); драйвер SQLite переводит их при выполнении. Сравнение
+скорости на запросах бота: benchmarks/db_drivers.py.
+"""
+
+import abc
+import datetime
+import functools
+import importlib
+import re
+import sqlite3
+from pathlib import Path
+from typing import ClassVar
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# Код ошибки MySQL "Duplicate entry" (одинаков для всех библиотек)
+ER_DUP_ENTRY = 1062
+
+
+class Driver(abc.ABC):
+    """Базовый драйвер: DB-API модуль и особенности библиотеки"""
+
+    name = ""
+    module_name = ""
+    # Подготовленные запросы на стороне сервера (myconn.PreparedStatements)
+    supports_prepared = False
+
+    def __init__(self):
+        # ImportError, если библиотека не установлена
+        self.module = importlib.import_module(self.module_name)
+        self.Error = self.module.Error
+        self.IntegrityError = self.module.IntegrityError
+
+    def credentials(self, db_cfg) -> dict:
+        """Параметры подключения из секции database.prod / database.test"""
+        # auth_plugin не передаём: пусть драйвер определяет его автоматически
+        return {
+            'host': db_cfg.host,
+            'user': db_cfg.user,
+            'password': db_cfg.password,
+            'database': db_cfg.database,
+            'charset': db_cfg.charset or 'utf8mb4',
+            'collation': db_cfg.collation or 'utf8mb4_unicode_ci',
+            'autocommit': db_cfg.autocommit if hasattr(db_cfg, 'autocommit') else True,
+        }
+
+    @abc.abstractmethod
+    def connect(self, credentials: dict):
+        """Новое соединение с параметрами из credentials()"""
+
+    @abc.abstractmethod
+    def cursor(self, connection, dictionary: bool = False, streaming: bool = False, prepared: bool = False):
+        """
+        Курсор соединения.
+
+        Args:
+            dictionary: Строки-словари вместо кортежей
+            streaming: Небуферизованный курсор (строки читаются с сервера по мере fetch)
+            prepared: Подготовленный запрос (только если supports_prepared)
+        """
+
+    def is_connected(self, connection) -> bool:
+        try:
+            connection.ping()
+            return True
+        except self.Error:
+            return False
+
+    def begin(self, connection):
+        """Начать транзакцию на соединении в режиме autocommit"""
+        cursor = connection.cursor()
+        try:
+            cursor.execute("START TRANSACTION")
+        finally:
+            cursor.close()
+
+    def abort(self, connection):
+        """Закрыть соединение, не дочитывая текущий результат"""
+        try:
+            connection.close()
+        except self.Error:
+            pass
+
+    def error_code(self, error: Exception) -> int | None:
+        return error.args[0] if error.args and isinstance(error.args[0], int) else None
+
+    def duplicate_key_matches(self, error: Exception, key: str) -> bool:
+        """Ошибка ER_DUP_ENTRY относится к ключу key"""
+        return key in str(error)
+
+    @property
+    def description(self) -> str:
+        return self.name
+
+
+class MySQLConnectorDriver(Driver):
+    """mysql-connector-python"""
+
+    name = "mysql-connector"
+    module_name = "mysql.connector"
+    supports_prepared = True
+    use_pure = False
+
+    def connect(self, credentials: dict):
+        # consume_results: непрочитанный результат дочитывается перед следующим запросом
+        return self.module.connect(**credentials, consume_results=True, use_pure=self.use_pure)
+
+    def cursor(self, connection, dictionary: bool = False, streaming: bool = False, prepared: bool = False):
+        buffered = False if streaming else None
+        return connection.cursor(dictionary=dictionary, prepared=prepared or None, buffered=buffered)
+
+    def is_connected(self, connection) -> bool:
+        return connection.is_connected()
+
+    def begin(self, connection):
+        connection.start_transaction()
+
+    def abort(self, connection):
+        # Закрывает сокет без COM_QUIT и не дочитывает результат
+        connection.shutdown()
+
+    def error_code(self, error: Exception) -> int | None:
+        return getattr(error, 'errno', None)
+
+    @property
+    def description(self) -> str:
+        return f"{self.name} (C extension: {self.module.HAVE_CEXT and not self.use_pure})"
+
+
+class MySQLConnectorPureDriver(MySQLConnectorDriver):
+    name = "mysql-connector-pure"
+    use_pure = True
+
+
+class PyMySQLDriver(Driver):
+    """PyMySQL (протокол на Python)"""
+
+    name = "pymysql"
+    module_name = "pymysql"
+
+    def connect(self, credentials: dict):
+        return self.module.connect(**credentials)
+
+    def cursor(self, connection, dictionary: bool = False, streaming: bool = False, prepared: bool = False):
+        cursors = self.module.cursors
+        if streaming:
+            return connection.cursor(cursors.SSDictCursor if dictionary else cursors.SSCursor)
+        return connection.cursor(cursors.DictCursor if dictionary else cursors.Cursor)
+
+    def is_connected(self, connection) -> bool:
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except self.Error:
+            return False
+
+
+class MySQLClientDriver(Driver):
+    """mysqlclient (MySQLdb, C-библиотека libmysqlclient)"""
+
+    name = "mysqlclient"
+    module_name = "MySQLdb"
+
+    def __init__(self):
+        super().__init__()
+        self.cursors = importlib.import_module("MySQLdb.cursors")
+
+    def connect(self, credentials: dict):
+        credentials = dict(credentials)
+        collation = credentials.pop('collation', None)
+        if collation:
+            credentials['init_command'] = f"SET collation_connection = '{collation}'"
+        return self.module.connect(**credentials)
+
+    def cursor(self, connection, dictionary: bool = False, streaming: bool = False, prepared: bool = False):
+        if streaming:
+            return connection.cursor(self.cursors.SSDictCursor if dictionary else self.cursors.SSCursor)
+        return connection.cursor(self.cursors.DictCursor if dictionary else self.cursors.Cursor)
+
+
+# Перевод запросов с диалекта MySQL: (шаблон, замена)
+SQLITE_DIALECT = (
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "datetime('now', 'localtime')"),
+    # LENGTH в MySQL - длина в байтах, в SQLite - в символах
+    (re.compile(r"\bLENGTH\(", re.IGNORECASE), "OCTET_LENGTH("),
+    (re.compile(r"\bCHAR_LENGTH\(", re.IGNORECASE), "LENGTH("),
+)
+
+# Расширенные коды SQLITE_CONSTRAINT_PRIMARYKEY и SQLITE_CONSTRAINT_UNIQUE
+SQLITE_DUPLICATE_CODES = (1555, 2067)
+
+
+@functools.lru_cache(maxsize=1024)
+def translate_to_sqlite(query: str) -> str:
+    """Запрос на диалекте MySQL -> SQLite (результат кэшируется по тексту запроса)"""
+    for pattern, replacement in SQLITE_DIALECT:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+def _octet_length(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return len(value.encode())
+    return len(value) if isinstance(value, bytes) else len(str(value))
+
+
+@functools.lru_cache(maxsize=256)
+def _like_pattern(pattern: str, escape: str | None) -> re.Pattern:
+    parts = []
+    chars = iter(pattern)
+    for char in chars:
+        if char == escape:
+            parts.append(re.escape(next(chars, "")))
+        elif char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def _like(pattern, value, escape=None):
+    # Встроенный LIKE в SQLite не различает регистр только для ASCII, а utf8mb4_unicode_ci - для всех букв
+    if pattern is None or value is None:
+        return None
+    return _like_pattern(str(pattern), escape).fullmatch(str(value)) is not None
+
+
+def _parse_timestamp(value: bytes) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value.decode())
+
+
+# Колонки TIMESTAMP читаются как datetime, как у MySQL
+sqlite3.register_converter("TIMESTAMP", _parse_timestamp)
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+
+
+class SQLiteCursor(sqlite3.Cursor):
+    """Курсор SQLite, принимающий запросы на диалекте MySQL"""
+
+    dictionary = False
+    _inserted = False
+
+    def execute(self, query: str, params=()):
+        self._inserted = query.lstrip()[:6].upper() == "INSERT"
+        if self.dictionary:
+            self.row_factory = None
+        super().execute(translate_to_sqlite(query), params)
+        if self.dictionary and self.description:
+            columns = tuple(column[0] for column in self.description)
+            self.row_factory = lambda cursor, row: dict(zip(columns, row, strict=True))
+        return self
+
+    def executemany(self, query: str, params):
+        self._inserted = False
+        return super().executemany(translate_to_sqlite(query), params)
+
+    @property
+    def lastrowid(self):
+        # SQLite сохраняет id прошлого INSERT и после UPDATE/DELETE; MySQL возвращает 0
+        return super().lastrowid if self._inserted else 0
+
+
+class SQLiteDriver(Driver):
+    """
+    Встроенная база SQLite (модуль sqlite3 стандартной библиотеки).
+
+    Файл базы - database.prod.sqlite_path / database.test.sqlite_path (от
+    корня проекта). Пустая база создаётся по dbschema/sqlite.sql. Журнал
+    WAL: читатели не блокируют писателя, бот и веб-воркеры работают с одним
+    файлом без сетевых запросов.
+    """
+
+    name = "sqlite"
+    module_name = "sqlite3"
+    schema_path = PROJECT_DIR / "dbschema" / "sqlite.sql"
+
+    PRAGMAS: ClassVar[dict[str, str | int]] = {
+        'journal_mode': "WAL",
+        'synchronous': "NORMAL",  # В WAL устойчиво к падению процесса, fsync только на checkpoint
+        'foreign_keys': "ON",
+        'cache_size': -16384,  # 16 МБ кэша страниц на соединение
+        'temp_store': "MEMORY",
+        'mmap_size': 256 * 1024 * 1024,
+    }
+
+    def credentials(self, db_cfg) -> dict:
+        default_path = f"data/{db_cfg.database}.sqlite3"
+        return {
+            'path': PROJECT_DIR / (getattr(db_cfg, 'sqlite_path', None) or default_path),
+            'autocommit': db_cfg.autocommit if hasattr(db_cfg, 'autocommit') else True,
+        }
+
+    def connect(self, credentials: dict):
+        path = Path(credentials['path'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self.module.connect(
+            path,
+            timeout=5,
+            detect_types=self.module.PARSE_DECLTYPES,
+            isolation_level=None if credentials.get('autocommit', True) else "DEFERRED",
+            # Соединение общее для потоков бота, как и у MySQL
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        for pragma, value in self.PRAGMAS.items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+        connection.create_function("OCTET_LENGTH", 1, _octet_length, deterministic=True)
+        connection.create_function("LIKE", 2, _like, deterministic=True)
+        connection.create_function("LIKE", 3, _like, deterministic=True)
+        if not connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'students'").fetchone():
+            connection.executescript(self.schema_path.read_text(encoding="utf-8"))
+        return connection
+
+    def cursor(self, connection, dictionary: bool = False, streaming: bool = False, prepared: bool = False):
+        # Курсор SQLite и так читает строки по мере fetch, statement кэшируются соединением
+        cursor = connection.cursor(SQLiteCursor)
+        cursor.dictionary = dictionary
+        return cursor
+
+    def is_connected(self, connection) -> bool:
+        try:
+            connection.execute("SELECT 1")
+            return True
+        except self.Error:
+            return False
+
+    def begin(self, connection):
+        # Без autocommit модуль sqlite3 сам открывает транзакцию перед изменением данных
+        if not connection.in_transaction:
+            connection.execute("BEGIN")
+
+    def error_code(self, error: Exception) -> int | None:
+        code = getattr(error, 'sqlite_errorcode', None)
+        return ER_DUP_ENTRY if code in SQLITE_DUPLICATE_CODES else code
+
+    def duplicate_key_matches(self, error: Exception, key: str) -> bool:
+        # "UNIQUE constraint failed: teams.invite_code" -> uk_teams_invite_code (см. dbschema/sqlite.sql)
+        if getattr(error, 'sqlite_errorcode', None) == SQLITE_DUPLICATE_CODES[0]:
+            return key == "PRIMARY"
+        columns = [column.strip().split('.') for column in str(error).partition(':')[2].split(',')]
+        if not columns or len(columns[0]) != 2:
+            return False
+        return key == f"uk_{columns[0][0]}_{'_'.join(column[-1] for column in columns)}"
+
+    @property
+    def description(self) -> str:
+        return f"{self.name} (SQLite {self.module.sqlite_version})"
+
+
+DRIVERS: dict[str, type[Driver]] = {
+    cls.name: cls
+    for cls in (MySQLConnectorDriver, MySQLConnectorPureDriver, PyMySQLDriver, MySQLClientDriver, SQLiteDriver)
+}
+
+
+@functools.cache
+def get_driver(name: str) -> Driver:
+    """
+    Драйвер по имени из DRIVERS.
+
+    Raises:
+        ValueError: Неизвестное имя драйвера
+        ImportError: Библиотека драйвера не установлена
+    """
+    if name not in DRIVERS:
+        raise ValueError(f"Unknown database driver {name!r}, expected one of: {', '.join(DRIVERS)}")
+    return DRIVERS[name]()
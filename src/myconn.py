@@ -1,17 +1,36 @@
 """
 Менеджер соединений / курсоров к MySQL
+
+Библиотека для подключения выбирается настройкой database.driver (см. dbdriver);
+с драйвером sqlite вместо сервера MySQL используется встроенная база в файле.
 """
 
+import contextlib
+import dataclasses
+import functools
+import itertools
 import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
 
-import mysql.connector
-from mysql.connector import Error
-
+import dbdriver
 from config import config
 
 # Глобальная переменная для хранения соединения с базой данных
 conn = None
 
+# Свободные соединения для потокового чтения (select_iter)
+STREAM_POOL_SIZE = 2
+_stream_connections = []
+_stream_lock = threading.Lock()
+
+# Общее соединение conn и его курсоры используются из потоков обработчиков
+# (пул потоков TeleBot), поэтому запросы через них выполняются по одному
+_lock = threading.RLock()
+
 
 def get_db_credentials():
     """
@@ -19,26 +38,20 @@ def get_db_credentials():
     Выбирает между продакшен и тестовой базой данных в зависимости от контекста.
     """
     # Определяем, использовать ли тестовую базу данных
-    # Это будет True при запуске pytest тестов
-    use_test_db = 'PYTEST_CURRENT_TEST' in os.environ
+    # Это будет True при запуске pytest тестов или с переменной STUDTEAMS_DB=test (бенчмарки)
+    use_test_db = 'PYTEST_CURRENT_TEST' in os.environ or os.environ.get('STUDTEAMS_DB') == 'test'
 
     # Выбираем конфигурацию в зависимости от контекста
     db_cfg = config.database.test if use_test_db else config.database.prod
 
-    credentials = {
-        'host': db_cfg.host,
-        'user': db_cfg.user,
-        'password': db_cfg.password,
-        'database': db_cfg.database,
-        'charset': db_cfg.charset or 'utf8mb4',
-        'collation': db_cfg.collation or 'utf8mb4_unicode_ci',
-        'autocommit': db_cfg.autocommit if hasattr(db_cfg, 'autocommit') else True,
-        'consume_results': True,
-    }
+    # Набор параметров зависит от драйвера (MySQL - сервер и учётная запись, SQLite - файл)
+    return get_driver().credentials(db_cfg)
+
 
-    # Удаляем auth_plugin из параметров подключения
-    # Пусть mysql.connector определяет его автоматически
-    return credentials
+def get_driver() -> dbdriver.Driver:
+    """Драйвер из переменной окружения STUDTEAMS_DB_DRIVER или настройки database.driver"""
+    name = os.environ.get('STUDTEAMS_DB_DRIVER') or config.get('database.driver', "mysql-connector")
+    return dbdriver.get_driver(name)
 
 
 def get_connection():
@@ -48,17 +61,15 @@ def get_connection():
     """
     global conn
 
+    driver = get_driver()
+
     # Проверяем, есть ли активное соединение
-    if conn and conn.is_connected():
+    if conn and driver.is_connected(conn):
         return conn
 
-    try:
-        # Получаем учетные данные при каждом подключении
-        db_credentials = get_db_credentials()
-        conn = mysql.connector.connect(**db_credentials)
-        return conn
-    except Error:
-        raise
+    # Получаем учетные данные при каждом подключении
+    conn = driver.connect(get_db_credentials())
+    return conn
 
 
 def cursor():
@@ -66,7 +77,7 @@ def cursor():
     Возвращает обычный курсор для выполнения SQL запросов
     """
     conn = get_connection()
-    return conn.cursor()
+    return get_driver().cursor(conn)
 
 
 def dict_cursor():
@@ -74,14 +85,14 @@ def dict_cursor():
     Возвращает курсор, который возвращает результаты в виде словарей
     """
     conn = get_connection()
-    return conn.cursor(dictionary=True)
+    return get_driver().cursor(conn, dictionary=True)
 
 
 def rollback():
     """
     Откатывает текущую транзакцию
     """
-    if conn and conn.is_connected():
+    if conn and get_driver().is_connected(conn):
         conn.rollback()
 
 
@@ -89,18 +100,44 @@ def commit():
     """
     Подтверждает текущую транзакцию
     """
-    if conn and conn.is_connected():
+    if conn and get_driver().is_connected(conn):
         conn.commit()
 
 
+@contextlib.contextmanager
+def transaction():
+    """
+    Выполняет запросы блока в одной транзакции: commit при выходе, rollback при исключении.
+
+    Общее соединение заблокировано до конца блока, поэтому запросы других
+    потоков не попадают в транзакцию.
+    """
+    with _lock:
+        connection = get_connection()
+        get_driver().begin(connection)
+        try:
+            yield
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+
+
 def close_connection():
     """
     Закрывает соединение с базой данных
     """
     global conn
-    if conn and conn.is_connected():
+    if prepared_statements is not None:
+        prepared_statements.close_all()
+    if conn and get_driver().is_connected(conn):
         conn.close()
         conn = None
+    with _stream_lock:
+        idle = _stream_connections[:]
+        _stream_connections.clear()
+    for connection in idle:
+        connection.close()
 
 
 class GlobalCursors:
@@ -173,7 +210,148 @@ class GlobalCursors:
 cursors = GlobalCursors()
 
 
-def select_one(query: str, params=None, use_dict=True):
+class PreparedStatements:
+    """
+    LRU подготовленных запросов одного соединения.
+
+    Для каждого текста SQL держится свой курсор с prepared=True: запрос
+    разбирается сервером один раз, дальше выполняется по handle с передачей
+    параметров и результатов в бинарном протоколе. Вытесненный курсор
+    закрывается, и сервер освобождает statement.
+    """
+
+    def __init__(self, connection, size: int):
+        self.connection = connection
+        self.size = size
+        self._cursors: OrderedDict[tuple[str, bool], tuple[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str, use_dict: bool):
+        """Курсор с подготовленным запросом и текст запроса для execute"""
+        key = (query, use_dict)
+        entry = self._cursors.get(key)
+        if entry is not None:
+            self._cursors.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        if len(self._cursors) >= self.size:
+            _, (_, evicted) = self._cursors.popitem(last=False)
+            evicted.close()
+        # Курсор повторно использует statement, только если ему передан тот же объект строки,
+        # поэтому execute всегда получает строку, сохранённую здесь
+        entry = (query, get_driver().cursor(self.connection, dictionary=use_dict, prepared=True))
+        self._cursors[key] = entry
+        return entry
+
+    def close_all(self):
+        """Закрывает курсоры (statement на сервере освобождаются)"""
+        for _, cursor in self._cursors.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._cursors.clear()
+
+
+# Подготовленные запросы текущего соединения conn
+prepared_statements: PreparedStatements | None = None
+
+
+def _prepared_cursor(query: str, use_dict: bool):
+    """Курсор подготовленного запроса для текущего соединения (LRU пересоздаётся при переподключении)"""
+    global prepared_statements
+    if not get_driver().supports_prepared:
+        # Драйвер без подготовленных запросов: обычный текстовый протокол
+        return query, cursors.dict_cur if use_dict else cursors.cur
+    connection = get_connection()
+    if prepared_statements is None or prepared_statements.connection is not connection:
+        prepared_statements = PreparedStatements(connection, config.get('database.prepared_cache_size', 64))
+    return prepared_statements.get(query, use_dict)
+
+
+class QueryStats:
+    """Счётчики выполненных запросов (для бенчмарков и диагностики)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Обнуляет счётчики."""
+        self.count = 0
+        self.total_time = 0.0
+
+    def record(self, elapsed: float):
+        """Учитывает выполненный запрос."""
+        self.count += 1
+        self.total_time += elapsed
+
+
+# Глобальные счётчики запросов
+query_stats = QueryStats()
+
+
+def _execute(cursor, query: str, params):
+    """Выполняет запрос с учётом в query_stats."""
+    started = time.perf_counter()
+    try:
+        cursor.execute(query, params or ())
+    finally:
+        query_stats.record(time.perf_counter() - started)
+
+
+class Record(Mapping):
+    """
+    Компактная строка результата вместо словаря.
+
+    Классы записей генерируются по набору колонок запроса (record_class) и
+    хранят значения в __slots__, без словаря с ключами в каждой строке.
+    Доступ как к словарю (row['name'], row.get(), keys(), items()) и как
+    к атрибутам (row.name), поэтому шаблоны и обработчики работают без изменений.
+    """
+
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __repr__(self):
+        return f"Record({dict(self.items())!r})"
+
+    def __reduce__(self):
+        # Класс создаётся динамически, поэтому pickle (общий кэш) восстанавливает его по колонкам
+        return _make_record, (self._fields, tuple(getattr(self, field) for field in self._fields))
+
+
+@functools.lru_cache(maxsize=256)
+def record_class(fields: tuple[str, ...]) -> type[Record]:
+    """Класс записи для набора колонок (один на форму запроса)"""
+    cls = dataclasses.make_dataclass(
+        "Row", fields, bases=(Record,), slots=True, eq=False, repr=False, match_args=False,
+    )
+    cls._fields = fields
+    return cls
+
+
+def _make_record(fields: tuple[str, ...], values: tuple) -> Record:
+    return record_class(fields)(*values)
+
+
+def select_one(query: str, params=None, use_dict=True, prepared=False):
     """
     Выполняет SELECT запрос и возвращает одну запись.
 
@@ -181,16 +359,21 @@ def select_one(query: str, params=None, use_dict=True):
         query: SQL запрос
         params: Параметры для запроса
         use_dict: Использовать словарный курсор (True) или обычный (False)
+        prepared: Выполнить как подготовленный запрос (для частых запросов с постоянным текстом)
 
     Returns:
         Одна запись или None
     """
-    cursor = cursors.dict_cur if use_dict else cursors.cur
-    cursor.execute(query, params or ())
-    return cursor.fetchone()
+    with _lock:
+        if prepared:
+            query, cursor = _prepared_cursor(query, use_dict)
+        else:
+            cursor = cursors.dict_cur if use_dict else cursors.cur
+        _execute(cursor, query, params)
+        return cursor.fetchone()
 
 
-def select_all(query: str, params=None, use_dict=True):
+def select_all(query: str, params=None, use_dict=True, records=False, prepared=False):
     """
     Выполняет SELECT запрос и возвращает все записи.
 
@@ -198,13 +381,98 @@ def select_all(query: str, params=None, use_dict=True):
         query: SQL запрос
         params: Параметры для запроса
         use_dict: Использовать словарный курсор (True) или обычный (False)
+        records: Вернуть компактные записи Record вместо словарей
+            (имена колонок должны быть идентификаторами, записи нельзя дополнять новыми ключами)
+        prepared: Выполнить как подготовленный запрос (для частых запросов с постоянным текстом)
 
     Returns:
         Список записей
     """
-    cursor = cursors.dict_cur if use_dict else cursors.cur
-    cursor.execute(query, params or ())
-    return cursor.fetchall()
+    with _lock:
+        # Записи Record строятся из кортежей, словарный курсор для них не нужен
+        use_dict = use_dict and not records
+        if prepared:
+            query, cursor = _prepared_cursor(query, use_dict)
+        else:
+            cursor = cursors.dict_cur if use_dict else cursors.cur
+        _execute(cursor, query, params)
+
+        if records:
+            cls = record_class(tuple(column[0] for column in cursor.description))
+            return list(itertools.starmap(cls, cursor.fetchall()))
+        return cursor.fetchall()
+
+
+def _checkout_connection():
+    """Берёт свободное соединение для потокового чтения или открывает новое"""
+    with _stream_lock:
+        while _stream_connections:
+            connection = _stream_connections.pop()
+            if get_driver().is_connected(connection):
+                return connection
+    return get_driver().connect(get_db_credentials())
+
+
+def _checkin_connection(connection):
+    """Возвращает соединение в пул (лишние закрываются)"""
+    with _stream_lock:
+        if len(_stream_connections) < STREAM_POOL_SIZE:
+            _stream_connections.append(connection)
+            return
+    connection.close()
+
+
+def select_iter(query: str, params=None, use_dict=True, batch_size: int = 500) -> Iterator:
+    """
+    Выполняет SELECT запрос и отдаёт записи по одной, не загружая весь результат в память.
+
+    Запрос выполняется на отдельном соединении небуферизованным курсором,
+    строки читаются пачками по batch_size. Общие курсоры (cursors) не
+    используются, поэтому внутри цикла можно выполнять другие запросы.
+
+    Если перебор прерван (break, исключение, close() генератора), непрочитанные
+    строки не дочитываются: соединение закрывается без возврата в пул.
+    Для немедленного освобождения соединения используйте
+    `with contextlib.closing(select_iter(...)) as rows:`.
+
+    Args:
+        query: SQL запрос
+        params: Параметры для запроса
+        use_dict: Возвращать словари (True) или кортежи (False)
+        batch_size: Сколько строк читать с сервера за раз
+
+    Yields:
+        Записи результата
+    """
+    connection = _checkout_connection()
+    finished = False
+    try:
+        cursor = get_driver().cursor(connection, dictionary=use_dict, streaming=True)
+        _execute(cursor, query, params)
+        while rows := cursor.fetchmany(batch_size):
+            yield from rows
+        cursor.close()
+        finished = True
+    finally:
+        if finished:
+            _checkin_connection(connection)
+        else:
+            # Закрываем соединение, не дочитывая остаток результата
+            get_driver().abort(connection)
+
+
+def is_duplicate_key(error: Exception, key: str | None = None) -> bool:
+    """
+    Проверяет, что ошибка - нарушение уникального ключа (1062 ER_DUP_ENTRY).
+
+    Args:
+        error: Исключение, полученное при INSERT/UPDATE
+        key: Имя ключа; если указано, проверяется именно этот ключ
+    """
+    driver = get_driver()
+    if not isinstance(error, driver.IntegrityError) or driver.error_code(error) != dbdriver.ER_DUP_ENTRY:
+        return False
+    return key is None or driver.duplicate_key_matches(error, key)
 
 
 def insert_update(query: str, params=None):
@@ -218,5 +486,35 @@ def insert_update(query: str, params=None):
     Returns:
         ID последней вставленной записи (для INSERT) или None
     """
-    cursors.cur.execute(query, params or ())
-    return cursors.cur.lastrowid or None
+    with _lock:
+        _execute(cursors.cur, query, params)
+        return cursors.cur.lastrowid or None
+
+
+def insert_many(query: str, rows: Iterable, batch_size: int = 1000) -> int:
+    """
+    Выполняет INSERT для множества строк пачками (executemany).
+
+    mysql.connector отправляет пачку INSERT ... VALUES одним многострочным
+    INSERT, поэтому загрузка больших объёмов (benchmarks/datagen.py) идёт
+    в десятки раз быстрее insert_update в цикле.
+
+    Args:
+        query: SQL запрос INSERT ... VALUES (%s, ...)
+        rows: Параметры для каждой строки
+        batch_size: Строк в одном запросе
+
+    Returns:
+        Количество вставленных строк
+    """
+    total = 0
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, batch_size)):
+        with _lock:
+            started = time.perf_counter()
+            try:
+                cursors.cur.executemany(query, batch)
+            finally:
+                query_stats.record(time.perf_counter() - started)
+        total += len(batch)
+    return total
@@ -0,0 +1,146 @@
+"""
+Общий для процессов кэш на SQLite (бот и все воркеры веб-приложения).
+
+Данные кэшируются в пространствах имён ('teams', 'reports'), у каждого есть
+счётчик версии. Бот после записи в БД вызывает bump(): версия растёт,
+и все воркеры при следующем запросе видят новую версию и перестают
+использовать старые записи - без рассылки сообщений между процессами.
+
+Файл лежит локально (shared_cache.path в common.yaml), база в режиме WAL:
+чтения не блокируют друг друга. Записи сброшенного пространства имён
+удаляются в bump(), просроченные - не чаще раза в PURGE_INTERVAL при set(). Любая ошибка SQLite записывается в лог,
+а данные загружаются из MySQL напрямую - кэш не может сломать страницу.
+"""
+
+# Файл кэша пишут и читают только процессы приложения
+import pickle  # noqa: S403
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from config import config
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+PURGE_INTERVAL = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    namespace TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+class SharedCache:
+    """Кэш с версиями пространств имён в файле SQLite"""
+
+    def __init__(self, path: str | Path, ttl: float = 300, enabled: bool = True):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.enabled = enabled
+        self._purge_at = 0.0
+        # Соединение на поток: sqlite3 не разрешает общее соединение между потоками
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def version(self, namespace: str) -> int:
+        """Текущая версия пространства имён"""
+        row = self._connection().execute(
+            "SELECT version FROM versions WHERE namespace = ?", (namespace,),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, *namespaces: str):
+        """Сделать недействительными все записи указанных пространств имён"""
+        if not self.enabled:
+            return
+        try:
+            conn = self._connection()
+            for namespace in namespaces:
+                conn.execute(
+                    "INSERT INTO versions (namespace, version) VALUES (?, 1) "
+                    "ON CONFLICT (namespace) DO UPDATE SET version = version + 1",
+                    (namespace,),
+                )
+                # Записи прежних версий больше не читаются
+                prefix = f"{namespace}:"
+                conn.execute("DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache bump {namespaces} failed: {e}")
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """(найдено, значение)"""
+        row = self._connection().execute(
+            "SELECT value, expires FROM entries WHERE key = ?", (key,),
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return False, None
+        # Файл кэша пишут только процессы приложения
+        return True, pickle.loads(row[0])  # noqa: S301
+
+    def set(self, key: str, value: Any, ttl: float | None = None):
+        now = time.time()
+        if now >= self._purge_at:
+            self._purge_at = now + PURGE_INTERVAL
+            self.purge_expired()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), now + (self.ttl if ttl is None else ttl)),
+        )
+
+    def purge_expired(self) -> int:
+        """Удалить просроченные записи"""
+        cursor = self._connection().execute("DELETE FROM entries WHERE expires < ?", (time.time(),))
+        return cursor.rowcount
+
+    def cached(self, namespace: str, key: str, loader: Callable[[], Any], ttl: float | None = None) -> Any:
+        """
+        Значение из кэша или результат loader().
+
+        Ключ записи включает версию пространства имён, поэтому после bump()
+        старые записи не читаются, даже если другой процесс ещё не успел их удалить.
+        """
+        if not self.enabled:
+            return loader()
+        try:
+            full_key = f"{namespace}:{self.version(namespace)}:{key}"
+            found, value = self.get(full_key)
+            if found:
+                return value
+        except (sqlite3.Error, pickle.UnpicklingError) as e:
+            logger.warning(f"Shared cache read {namespace}:{key} failed: {e}")
+            return loader()
+
+        value = loader()
+        try:
+            self.set(full_key, value, ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache write {namespace}:{key} failed: {e}")
+        return value
+
+
+shared_cache = SharedCache(
+    PROJECT_DIR / config.get('shared_cache.path', "cache/shared.sqlite3"),
+    ttl=config.get('shared_cache.ttl', 300),
+    enabled=config.get('shared_cache.enabled', True),
+)
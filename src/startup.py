@@ -0,0 +1,143 @@
+"""
+Профилирование запуска бота и веб-приложения.
+
+StartupTimer замеряет фазы запуска (загрузка конфига, подключение к БД,
+регистрация обработчиков, загрузка шаблонов); bot/main.py и web/app.py
+пишут итог в лог при каждом старте.
+
+Подробный отчёт с временем импорта модулей:
+
+    PYTHONPATH=src python -m startup bot
+    PYTHONPATH=src python -m startup web --top 30
+
+Запуск выполняется в отдельном процессе с `python -X importtime` (холодный
+старт) и останавливается до polling / запуска сервера.
+
+Модуль импортируется ботом и веб-приложением при каждом старте ради
+StartupTimer, поэтому argparse, json и subprocess (около 15 мс импорта)
+нужные только профилировщику, импортируются внутри функций.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+SRC_DIR = Path(__file__).resolve().parent
+
+# Признак строки с фазами в выводе дочернего процесса
+PHASES_MARKER = "STARTUP_PHASES "
+
+# Код запуска точек входа без polling / сервера
+ENTRY_POINTS = {
+    'bot': "from bot.main import start\nstart()",
+    'web': "from web.app import startup\nstartup()",
+}
+
+
+class StartupTimer:
+    """Замер фаз запуска"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        """'config 12 ms, db 30 ms, ... (total 450 ms)'"""
+        phases = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items())
+        return f"{phases} (total {self.total * 1000:.0f} ms)"
+
+    def emit(self):
+        """Вывести фазы для родительского процесса профилировщика"""
+        import json
+
+        sys.stdout.write(PHASES_MARKER + json.dumps({**self.phases, 'total': self.total}) + "\n")
+        sys.stdout.flush()
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+class StartupProfile(NamedTuple):
+    phases: dict[str, float]
+    imports: list[ImportTime]
+    wall: float
+
+
+def parse_importtime(stderr: str) -> list[ImportTime]:
+    """Разобрать вывод -X importtime"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split('|', 2)
+        imports.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def profile(entry_point: str) -> StartupProfile:
+    """Запустить точку входа в новом процессе и собрать фазы и время импортов"""
+    import json
+    import subprocess  # noqa: S404 - запускается только интерпретатор проекта
+
+    env = {**os.environ, 'PYTHONPATH': str(SRC_DIR), 'STUDTEAMS_PROFILE_STARTUP': "1"}
+    started = time.perf_counter()
+    # Аргументы фиксированы: sys.executable -X importtime -c <код точки входа из ENTRY_POINTS>
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", ENTRY_POINTS[entry_point]],
+        capture_output=True, text=True, env=env, check=False,
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"{entry_point} startup failed:\n{result.stderr[-2000:]}")
+
+    phases = {}
+    for line in result.stdout.splitlines():
+        if line.startswith(PHASES_MARKER):
+            phases = json.loads(line[len(PHASES_MARKER):])
+    return StartupProfile(phases, parse_importtime(result.stderr), wall)
+
+
+def format_report(entry_point: str, startup: StartupProfile, top: int = 20) -> str:
+    lines = [
+        f"Startup profile: {entry_point} (wall {startup.wall * 1000:.0f} ms, including interpreter)", "", "Phases:",
+    ]
+    lines += [f"  {name:24} {seconds * 1000:8.1f} ms" for name, seconds in startup.phases.items()]
+
+    total_us = sum(item.self_us for item in startup.imports)
+    lines += ["", f"Imports: {len(startup.imports)} modules, {total_us / 1000:.1f} ms", ""]
+    lines.append(f"  {'self, ms':>9} {'cumul., ms':>11}  module")
+    for item in sorted(startup.imports, key=lambda item: item.self_us, reverse=True)[:top]:
+        lines.append(f"  {item.self_us / 1000:9.1f} {item.cumulative_us / 1000:11.1f}  {item.module}")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Профиль запуска бота и веб-приложения")
+    parser.add_argument("entry_point", choices=list(ENTRY_POINTS))
+    parser.add_argument("--top", type=int, default=20, help="Сколько самых медленных импортов показать")
+    args = parser.parse_args()
+    sys.stdout.write(format_report(args.entry_point, profile(args.entry_point), args.top) + "\n")
+
+
+if __name__ == "__main__":
+    main()
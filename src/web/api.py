@@ -0,0 +1,137 @@
+"""
+JSON API веб-приложения: /api/v1/teams и /api/v1/reports.
+
+- fields=team_id,team_name - в SQL выбираются только запрошенные поля;
+- постраничная выборка по курсору (keyset): next_cursor из ответа передаётся
+  в cursor= следующего запроса, OFFSET не используется;
+- строки сериализуются orjson как есть, datetime - в RFC 3339 без
+  форматирования каждой строки на Python.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any
+
+import orjson
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from web.db import (
+    REPORT_API_FIELDS,
+    REPORT_API_KEY,
+    TEAM_API_FIELDS,
+    TEAM_API_KEY,
+    get_members_by_teams,
+    get_reports_page,
+    get_teams_page,
+)
+
+API_PREFIX = "/api/v1"
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Поле, которое не выбирается из таблицы teams, а собирается отдельным запросом
+MEMBERS_FIELD = 'members'
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON-ответ, сериализуемый orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+router = APIRouter(prefix=API_PREFIX, tags=["api"])
+
+
+def parse_fields(fields: str | None, available: list[str], default: list[str] | None = None) -> list[str]:
+    """Разобрать параметр fields=a,b,c. Без параметра - default или все поля"""
+    if not fields:
+        return list(default or available)
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+    unknown = [name for name in requested if name not in available]
+    if unknown or not requested:
+        raise HTTPException(400, f"Неизвестные поля: {', '.join(unknown)}. Доступные: {', '.join(available)}")
+    return requested
+
+
+def encode_cursor(row: dict[str, Any], key: tuple[str, ...]) -> str:
+    """Курсор - значения ключа сортировки последней строки страницы"""
+    return base64.urlsafe_b64encode(orjson.dumps([row[name] for name in key])).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str | None, key: tuple[str, ...]) -> tuple | None:
+    """Значения ключа сортировки из курсора. datetime приходят строками RFC 3339"""
+    if not cursor:
+        return None
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(key):
+            raise ValueError("wrong cursor length")
+        return tuple(
+            datetime.fromisoformat(value) if name.endswith('_date') else int(value)
+            for name, value in zip(key, values, strict=True)
+        )
+    except (ValueError, TypeError, binascii.Error, orjson.JSONDecodeError):
+        raise HTTPException(400, "Некорректный курсор") from None
+
+
+def make_page(rows: list[dict[str, Any]], fields: list[str], key: tuple[str, ...], limit: int) -> dict[str, Any]:
+    """
+    Ответ со страницей: лишняя (limit+1) строка означает, что есть следующая страница.
+
+    Ответ отдаётся как ORJSONResponse напрямую, минуя jsonable_encoder FastAPI,
+    который обходил бы каждую строку на Python.
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1], key) if has_more else None
+    extra = [name for name in key if name not in fields]
+    for row in rows:
+        for name in extra:
+            del row[name]
+    return {'items': rows, 'next_cursor': next_cursor}
+
+
+@router.get("/teams")
+async def api_teams(
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+):
+    """Команды. Участники (members) - только по запросу, одним запросом на страницу"""
+    selected = parse_fields(fields, [*TEAM_API_FIELDS, MEMBERS_FIELD], default=list(TEAM_API_FIELDS))
+    columns = [name for name in selected if name != MEMBERS_FIELD]
+    rows = get_teams_page(columns, decode_cursor(cursor, TEAM_API_KEY), limit + 1)
+    team_ids = [row['team_id'] for row in rows[:limit]]
+    page = make_page(rows, selected, TEAM_API_KEY, limit)
+
+    if MEMBERS_FIELD in selected:
+        members = get_members_by_teams(team_ids)
+        for team, team_id in zip(page['items'], team_ids, strict=True):
+            team[MEMBERS_FIELD] = members[team_id]
+    return ORJSONResponse(page)
+
+
+@router.get("/reports")
+async def api_reports(
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    team_id: int | None = None,
+    sprint: int | None = None,
+    student_id: int | None = None,
+):
+    """Отчеты о спринтах, новые первыми"""
+    selected = parse_fields(fields, list(REPORT_API_FIELDS))
+    rows = get_reports_page(
+        selected,
+        decode_cursor(cursor, REPORT_API_KEY),
+        limit + 1,
+        team_id=team_id,
+        sprint_num=sprint,
+        student_id=student_id,
+    )
+    return ORJSONResponse(make_page(rows, selected, REPORT_API_KEY, limit))
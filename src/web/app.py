@@ -5,25 +5,65 @@ Web-приложение StudTeams.
 """
 
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from loguru import logger
 
 import myconn
+from sharedcache import shared_cache
+from startup import StartupTimer
+from web.api import router as api_router
+from web.assets import HashedStaticFiles, manifest
 from web.db import get_all_reports, get_teams_count, get_teams_list, get_teams_with_members, get_total_students_count
+from web.middleware import CompressionMiddleware
+from web.rendering import StaticPage, config, precompile_templates, render_static_page, templates
 
-app = FastAPI(title="StudTeams Web")
+# Заранее отрендеренные страницы без данных из БД
+static_pages: dict[str, StaticPage] = {}
 
-# Определяем базовую директорию web приложения
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Mount static files
-app.mount("/static", StaticFiles(directory=os.path.join(BASE_DIR, "static")), name="static")
+def startup(timer: StartupTimer | None = None):
+    """Подготовка приложения к приёму запросов (вызывается из lifespan)"""
+    timer = timer or StartupTimer()
+    with timer.phase("config"):
+        config.settings  # noqa: B018
+    with timer.phase("static manifest"):
+        # Хэши статических файлов должны быть известны до рендеринга страниц
+        manifest.refresh()
+    with timer.phase("templates"):
+        # Компилируем шаблоны при старте, а не на первом запросе
+        precompile_templates()
+    with timer.phase("static pages"):
+        static_pages["/faq"] = render_static_page("faq.jinja", "/faq")
 
-# Jinja2 templates
-templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
+    logger.info(f"Startup: {timer.summary()}")
+    if os.environ.get('STUDTEAMS_PROFILE_STARTUP'):
+        timer.emit()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):  # noqa: RUF029 - FastAPI принимает только асинхронный lifespan
+    startup()
+    yield
+
+
+app = FastAPI(title="StudTeams Web", lifespan=lifespan)
+
+# Сжатие ответов (HTML-таблицы, CSS, JS)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=config.get('web.compression.minimum_size', 1024),
+    gzip_level=config.get('web.compression.gzip_level', 6),
+    brotli_quality=config.get('web.compression.brotli_quality', 4),
+)
+
+# Mount static files (пути с хэшем содержимого кэшируются браузером навсегда)
+app.mount("/static", HashedStaticFiles(manifest=manifest), name="static")
+
+# JSON API для дашбордов
+app.include_router(api_router)
 
 
 @app.get("/", include_in_schema=False)
@@ -37,7 +77,7 @@ async def health_check():
     try:
         # Проверяем подключение к БД
         conn = myconn.get_connection()
-        db_status = "healthy" if conn and conn.is_connected() else "unhealthy"
+        db_status = "healthy" if conn and myconn.get_driver().is_connected(conn) else "unhealthy"
     except Exception as e:
         db_status = f"unhealthy: {e!s}"
 
@@ -53,16 +93,20 @@ async def health_check():
 
 @app.get("/faq", response_class=HTMLResponse)
 async def faq(request: Request):
-    params = {"request": request}
-    return templates.TemplateResponse("faq.jinja", params)
+    page = static_pages.get("/faq")
+    if page is None:
+        page = static_pages["/faq"] = render_static_page("faq.jinja", "/faq")
+    return page.response(request)
 
 
 @app.get("/teams", response_class=HTMLResponse)
 async def teams(request: Request):
 
-    teams_data = get_teams_with_members()
-    teams_count = get_teams_count()
-    students_count = get_total_students_count()
+    # Данные общие для всех воркеров и сбрасываются ботом при записи в БД
+    teams_data, teams_count, students_count = shared_cache.cached(
+        'teams', "page",
+        lambda: (get_teams_with_members(), get_teams_count(), get_total_students_count()),
+    )
 
     params = {
         "request": request,
@@ -70,7 +114,7 @@ async def teams(request: Request):
         "teams_count": teams_count,
         "students_count": students_count,
     }
-    return templates.TemplateResponse("teams.jinja", params)
+    return templates.TemplateResponse(request, "teams.jinja", params)
 
 
 @app.get("/reports", response_class=HTMLResponse)
@@ -81,15 +125,24 @@ async def reports(request: Request, team: str = "", sprint: str = "", student: s
     sprint_filter = int(sprint) if sprint and sprint.isdigit() else None
     student_filter = student or None
 
-    # Получаем отчеты с фильтрацией
-    reports_data = get_all_reports(
-        team_filter=team_filter,
-        sprint_filter=sprint_filter,
-        student_filter=student_filter,
-    )
-
     # Получаем список команд для фильтра
-    teams_list = get_teams_list()
+    teams_list = shared_cache.cached('reports', "teams_list", get_teams_list)
+
+    # Получаем отчеты с фильтрацией
+    def load_reports():
+        return get_all_reports(
+            team_filter=team_filter,
+            sprint_filter=sprint_filter,
+            student_filter=student_filter,
+        )
+
+    # Кэшируем только выбор из списков: произвольный текст в фильтрах
+    # давал бы новую запись кэша на каждый запрос
+    team_names = {t['team_name'] for t in teams_list}
+    if student_filter is None and (team_filter is None or team_filter in team_names):
+        reports_data = shared_cache.cached('reports', f"page:{(team_filter, sprint_filter)!r}", load_reports)
+    else:
+        reports_data = load_reports()
 
     params = {
         "request": request,
@@ -101,7 +154,7 @@ async def reports(request: Request, team: str = "", sprint: str = "", student: s
             "student": student_filter,
         },
     }
-    return templates.TemplateResponse("reports.jinja", params)
+    return templates.TemplateResponse(request, "reports.jinja", params)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+"""
+Статические файлы с хэшем содержимого в имени.
+
+static_url('css/custom.css') возвращает '/static/css/custom.<хэш>.css'.
+Такие URL меняются вместе с содержимым файла, поэтому отдаются с
+Cache-Control: immutable на год; запросы без хэша получают no-cache.
+"""
+
+import hashlib
+from pathlib import Path
+
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+STATIC_URL_PREFIX = "/static"
+
+# Длина хэша в имени файла
+HASH_LENGTH = 10
+
+# Зафиксированные версии сторонних библиотек (собираются в бандлы web.build_assets)
+VENDOR_PACKAGES = {
+    'bootstrap': "5.3.3",
+    'bootstrap-icons': "1.11.3",
+    'jquery': "3.7.1",
+}
+
+CDN_URL = "https://cdn.jsdelivr.net/npm/{package}@{version}/{path}"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def hashed_name(path: str, digest: str) -> str:
+    """'css/custom.css' -> 'css/custom.<digest>.css'"""
+    directory, _, filename = path.rpartition('/')
+    stem, dot, suffix = filename.partition('.')
+    hashed = f"{stem}.{digest}{dot}{suffix}" if dot else f"{stem}.{digest}"
+    return f"{directory}/{hashed}" if directory else hashed
+
+
+class AssetManifest:
+    """Соответствие исходных путей статических файлов и путей с хэшем"""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self._hashed: dict[str, str] = {}
+        self._original: dict[str, str] = {}
+        self.refresh()
+
+    def refresh(self):
+        """Пересчитать хэши всех файлов каталога"""
+        hashed, original = {}, {}
+        for file in sorted(self.directory.rglob('*')):
+            if not file.is_file():
+                continue
+            path = file.relative_to(self.directory).as_posix()
+            digest = hashlib.sha256(file.read_bytes()).hexdigest()[:HASH_LENGTH]
+            hashed[path] = hashed_name(path, digest)
+            original[hashed[path]] = path
+        self._hashed, self._original = hashed, original
+
+    def url(self, path: str) -> str:
+        """URL файла с хэшем; для неизвестных файлов - обычный URL"""
+        path = path.lstrip('/')
+        return f"{STATIC_URL_PREFIX}/{self._hashed.get(path, path)}"
+
+    def exists(self, path: str) -> bool:
+        """Файл есть в каталоге статики"""
+        return path.lstrip('/') in self._hashed
+
+    def resolve(self, hashed_path: str) -> str | None:
+        """Исходный путь по пути с хэшем или None"""
+        return self._original.get(hashed_path)
+
+
+class HashedStaticFiles(StaticFiles):
+    """StaticFiles, понимающий пути с хэшем и выставляющий заголовки кэширования"""
+
+    def __init__(self, *, manifest: AssetManifest, **kwargs):
+        super().__init__(directory=manifest.directory, **kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        original = self.manifest.resolve(path.replace('\\', '/'))
+        if original is None:
+            response = await super().get_response(path, scope)
+            response.headers.setdefault('Cache-Control', REVALIDATE_CACHE_CONTROL)
+            return response
+
+        response = await super().get_response(original, scope)
+        if response.status_code in (200, 304):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+# Манифест каталога web/static
+manifest = AssetManifest(Path(__file__).resolve().parent / "static")
+
+
+def static_url(path: str) -> str:
+    """Хелпер для шаблонов: {{ static_url('css/custom.css') }}"""
+    return manifest.url(path)
+
+
+def has_asset(path: str) -> bool:
+    """Хелпер для шаблонов: собран ли файл (например, бандл dist/app.css)"""
+    return manifest.exists(path)
+
+
+def cdn_url(package: str, path: str) -> str:
+    """Хелпер для шаблонов: URL зафиксированной версии библиотеки на CDN (запасной вариант)"""
+    return CDN_URL.format(package=package, version=VENDOR_PACKAGES[package], path=path)
@@ -0,0 +1,210 @@
+"""
+Сборка фронтенд-бандлов веб-приложения.
+
+    PYTHONPATH=src python -m web.build_assets
+
+1. скачивает зафиксированные версии библиотек (VENDOR_PACKAGES) в static/vendor/
+   (уже скачанные файлы не загружаются повторно, --offline запрещает загрузку);
+2. оставляет в bootstrap-icons.css только иконки, используемые в шаблонах и
+   своих скриптах, и урезает шрифт до этих глифов (если установлен fontTools);
+3. минифицирует и склеивает CSS и JS в static/dist/app.css и static/dist/app.js.
+
+Хэш содержимого в URL бандлов добавляет манифест web.assets, поэтому
+браузер кэширует их навсегда и получает новую версию после пересборки.
+"""
+
+import argparse
+import re
+import shutil
+import sys
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+from loguru import logger
+
+from web.assets import VENDOR_PACKAGES, cdn_url
+
+BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / "static"
+TEMPLATES_DIR = BASE_DIR / "templates"
+VENDOR_DIR = STATIC_DIR / "vendor"
+DIST_DIR = STATIC_DIR / "dist"
+
+# Файлы библиотек, которые скачиваются с CDN
+VENDOR_FILES = {
+    'bootstrap': ["dist/css/bootstrap.min.css", "dist/js/bootstrap.bundle.min.js"],
+    'bootstrap-icons': ["font/bootstrap-icons.css", "font/fonts/bootstrap-icons.woff2"],
+    'jquery': ["dist/jquery.min.js"],
+}
+
+# Порядок склейки бандлов: (библиотека или None для своих файлов, путь)
+CSS_BUNDLE = [
+    ('bootstrap', "dist/css/bootstrap.min.css"),
+    ('bootstrap-icons', "font/bootstrap-icons.css"),
+    (None, "css/custom.css"),
+]
+JS_BUNDLE = [
+    ('jquery', "dist/jquery.min.js"),
+    ('bootstrap', "dist/js/bootstrap.bundle.min.js"),
+    (None, "js/base.js"),
+]
+
+ICON_FONT = "font/fonts/bootstrap-icons.woff2"
+ICON_FONT_SUBSET = "bootstrap-icons.subset.woff2"
+
+ICON_CLASS_RE = re.compile(r"\bbi-([a-z0-9]+(?:-[a-z0-9]+)*)")
+ICON_RULE_RE = re.compile(r'\.bi-([a-z0-9-]+)::?before\s*\{\s*content:\s*"\\([0-9a-f]+)";?\s*\}', re.IGNORECASE)
+FONT_SRC_RE = re.compile(r"src:\s*url\([^;]*;")
+CSS_COMMENT_RE = re.compile(r"/\*(?!!).*?\*/", re.DOTALL)
+CSS_SPACE_RE = re.compile(r"\s*([{};,>])\s*")
+
+
+def vendor_path(package: str, path: str) -> Path:
+    """Локальный путь файла библиотеки: static/vendor/<пакет>-<версия>/<путь>"""
+    return VENDOR_DIR / f"{package}-{VENDOR_PACKAGES[package]}" / path
+
+
+def fetch_vendor_files(offline: bool = False):
+    """Скачать недостающие файлы библиотек"""
+    for package, paths in VENDOR_FILES.items():
+        for path in paths:
+            target = vendor_path(package, path)
+            if target.exists():
+                continue
+            if offline:
+                raise FileNotFoundError(f"{target} не найден, а загрузка запрещена (--offline)")
+            url = cdn_url(package, path)
+            # urlopen открывает и file://, и ftp://: загружаем только по https
+            if urllib.parse.urlsplit(url).scheme != "https":
+                raise ValueError(f"Библиотеки загружаются только по https: {url}")
+            logger.info(f"Загрузка {url}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with urllib.request.urlopen(url, timeout=30) as response:  # noqa: S310 - схема https проверена выше
+                data = response.read()
+            target.write_bytes(data)
+
+
+def collect_used_icons(*directories: Path) -> set[str]:
+    """Имена иконок (без префикса bi-), встречающихся в шаблонах и скриптах"""
+    icons = set()
+    for directory in directories:
+        for file in directory.rglob('*'):
+            if file.suffix in ('.jinja', '.html', '.js') and 'vendor' not in file.parts and 'dist' not in file.parts:
+                icons.update(ICON_CLASS_RE.findall(file.read_text(encoding="utf-8")))
+    return icons
+
+
+def subset_icons_css(css: str, icons: set[str], font_url: str | None = None) -> tuple[str, set[int]]:
+    """
+    Оставить в bootstrap-icons.css только правила для нужных иконок.
+
+    Возвращает CSS и коды глифов, которые нужно сохранить в шрифте.
+    font_url заменяет ссылки на файлы шрифта (урезанный woff2).
+    """
+    codepoints = set()
+
+    def keep(match: re.Match) -> str:
+        if match.group(1) not in icons:
+            return ""
+        codepoints.add(int(match.group(2), 16))
+        return match.group(0)
+
+    css = ICON_RULE_RE.sub(keep, css)
+    if font_url is not None:
+        # В бандле остаётся только woff2 (поддерживается всеми актуальными браузерами)
+        css = FONT_SRC_RE.sub(f'src: url("{font_url}") format("woff2");', css)
+    return css, codepoints
+
+
+def subset_font(source: Path, target: Path, codepoints: set[int]) -> bool:
+    """Урезать шрифт до указанных глифов. Без fontTools копирует шрифт целиком"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        from fontTools import subset
+    except ImportError:  # fontTools - необязательная зависимость
+        logger.warning("fontTools не установлен, шрифт иконок копируется целиком")
+        shutil.copyfile(source, target)
+        return False
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    font = subset.load_font(str(source), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    subset.save_font(font, str(target), options)
+    return True
+
+
+def minify_css(css: str) -> str:
+    """Удалить комментарии (кроме /*! лицензий */) и лишние пробелы"""
+    css = CSS_COMMENT_RE.sub("", css)
+    css = CSS_SPACE_RE.sub(r"\1", css)
+    css = re.sub(r"\s+", " ", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_js(js: str) -> str:
+    """
+    Консервативная минификация своих скриптов: убрать отступы, пустые строки и
+    строки, целиком состоящие из // комментария. Код внутри строк не трогается.
+    """
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        if line and not line.startswith("//"):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def read_bundle_part(package: str | None, path: str) -> str:
+    source = vendor_path(package, path) if package else STATIC_DIR / path
+    return source.read_text(encoding="utf-8")
+
+
+def build(offline: bool = False) -> dict[str, int]:
+    """Собрать dist/app.css и dist/app.js. Возвращает размеры файлов"""
+    fetch_vendor_files(offline)
+    DIST_DIR.mkdir(parents=True, exist_ok=True)
+
+    icons = collect_used_icons(TEMPLATES_DIR, STATIC_DIR)
+    # Ссылка на шрифт относительно dist/app.css
+    icons_css, codepoints = subset_icons_css(
+        read_bundle_part('bootstrap-icons', "font/bootstrap-icons.css"), icons, font_url=ICON_FONT_SUBSET,
+    )
+    subset_font(vendor_path('bootstrap-icons', ICON_FONT), DIST_DIR / ICON_FONT_SUBSET, codepoints)
+    logger.info(f"Иконок в бандле: {len(codepoints)} из {len(icons)} найденных в шаблонах")
+
+    css_parts = []
+    for package, path in CSS_BUNDLE:
+        css = icons_css if package == 'bootstrap-icons' else read_bundle_part(package, path)
+        css_parts.append(css if package == 'bootstrap' else minify_css(css))
+    js_parts = []
+    for package, path in JS_BUNDLE:
+        js = read_bundle_part(package, path)
+        # Файлы библиотек уже минифицированы
+        js_parts.append(js if package else minify_js(js))
+
+    (DIST_DIR / "app.css").write_text("\n".join(css_parts) + "\n", encoding="utf-8")
+    # ';' между частями защищает от склейки выражений из соседних файлов
+    (DIST_DIR / "app.js").write_text("\n;".join(js_parts) + "\n", encoding="utf-8")
+
+    return {file.name: file.stat().st_size for file in sorted(DIST_DIR.iterdir())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сборка CSS/JS бандлов веб-приложения")
+    parser.add_argument("--offline", action="store_true", help="Не скачивать библиотеки, только собрать")
+    args = parser.parse_args()
+
+    try:
+        sizes = build(offline=args.offline)
+    except (OSError, ValueError) as e:
+        logger.error(f"Сборка не удалась: {e}")
+        sys.exit(1)
+    sys.stdout.write("".join(f"{name:40} {size / 1024:8.1f} KB\n" for name, size in sizes.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@
 
 from typing import Any
 
-from myconn import select_all, select_one
+from myconn import Record, select_all, select_one
 
 
 def get_teams_with_members() -> list[dict[str, Any]]:
@@ -145,7 +145,7 @@ def get_all_reports(
     team_filter: str | None = None,
     sprint_filter: int | None = None,
     student_filter: str | None = None,
-) -> list[dict[str, Any]]:
+) -> list[Record]:
     """
     Получить все отчеты с фильтрацией
 
@@ -155,22 +155,23 @@ def get_all_reports(
         student_filter: Фильтр по имени студента
 
     Returns:
-        List[Dict]: Список отчетов
+        Список отчетов (записи Record с доступом по ключу и атрибуту)
     """
     query = """
     SELECT
         sr.student_id,
         sr.sprint_num,
         sr.report_date,
-        sr.report_text,
+        b.report_text,
         s.name as student_name,
         s.group_num,
         t.team_name,
         t.product_name,
         tm.role,
         CASE WHEN t.admin_student_id = s.student_id THEN 1 ELSE 0 END as is_admin,
-        LENGTH(sr.report_text) as report_length
+        sr.report_length
     FROM sprint_reports sr
+    JOIN sprint_report_bodies b ON b.student_id = sr.student_id AND b.sprint_num = sr.sprint_num
     JOIN students s ON sr.student_id = s.student_id
     JOIN team_members tm ON s.student_id = tm.student_id
     JOIN teams t ON tm.team_id = t.team_id
@@ -193,7 +194,8 @@ def get_all_reports(
 
     query += " ORDER BY sr.report_date DESC, t.team_name, s.name"
 
-    return select_all(query, params)
+    # Список может содержать тысячи строк: компактные записи вместо словарей
+    return select_all(query, params, records=True)
 
 
 def get_reports_statistics() -> dict[str, Any]:
@@ -221,8 +223,8 @@ def get_reports_statistics() -> dict[str, Any]:
     else:
         stats['current_sprint_reports'] = 0
 
-    # Средняя длина отчета
-    result = select_one("SELECT AVG(LENGTH(report_text)) FROM sprint_reports", use_dict=False)
+    # Средняя длина отчета (по метаданным, без чтения текстов)
+    result = select_one("SELECT AVG(report_length) FROM sprint_reports", use_dict=False)
     stats['avg_report_length'] = int(result[0]) if result and result[0] else 0
 
     # Команды с полными отчетами в последнем спринте
@@ -253,3 +255,154 @@ def get_teams_list() -> list[dict[str, Any]]:
     """
     query = "SELECT team_id, team_name FROM teams ORDER BY team_name"
     return select_all(query)
+
+
+# Поля JSON API и соответствующие им выражения SQL
+TEAM_API_FIELDS = {
+    'team_id': "t.team_id",
+    'team_name': "t.team_name",
+    'product_name': "t.product_name",
+    'admin_student_id': "t.admin_student_id",
+    'admin_name': "s_admin.name",
+    'members_count': "(SELECT COUNT(*) FROM team_members tm WHERE tm.team_id = t.team_id)",
+}
+
+REPORT_API_FIELDS = {
+    'student_id': "sr.student_id",
+    'sprint_num': "sr.sprint_num",
+    'report_date': "sr.report_date",
+    'report_text': "b.report_text",
+    'report_length': "sr.report_length",
+    'student_name': "s.name",
+    'group_num': "s.group_num",
+    'team_id': "t.team_id",
+    'team_name': "t.team_name",
+    'role': "tm.role",
+}
+
+# Ключи сортировки для постраничной выборки по курсору
+TEAM_API_KEY = ('team_id',)
+REPORT_API_KEY = ('report_date', 'student_id', 'sprint_num', 'team_id')
+
+
+def _select_list(fields: list[str], available: dict[str, str], key: tuple[str, ...]) -> str:
+    """
+    SELECT-список из запрошенных полей и полей ключа сортировки.
+
+    В запрос попадают только выражения и имена из словаря available
+    (TEAM_API_FIELDS, REPORT_API_FIELDS), значения от клиента - никогда.
+    """
+    columns = list(dict.fromkeys([*fields, *key]))
+    unknown = [name for name in columns if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ",\n        ".join(f"{available[name]} AS {name}" for name in columns)
+
+
+def get_teams_page(fields: list[str], after: tuple | None = None, limit: int = 50) -> list[dict[str, Any]]:
+    """
+    Страница списка команд для API (сортировка по team_id)
+
+    Args:
+        fields: Поля из TEAM_API_FIELDS
+        after: Значение ключа TEAM_API_KEY последней строки предыдущей страницы
+        limit: Количество строк
+
+    Returns:
+        List[Dict]: Команды с запрошенными полями и полями ключа
+    """
+    query = f"""
+    SELECT
+        {_select_list(fields, TEAM_API_FIELDS, TEAM_API_KEY)}
+    FROM teams t
+    JOIN students s_admin ON t.admin_student_id = s_admin.student_id
+    """  # noqa: S608 - колонки только из TEAM_API_FIELDS (_select_list)
+    params = []
+    if after is not None:
+        query += " WHERE t.team_id > %s"
+        params.extend(after)
+    query += " ORDER BY t.team_id LIMIT %s"
+    params.append(limit)
+    return select_all(query, params)
+
+
+def get_members_by_teams(team_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+    """
+    Участники нескольких команд одним запросом
+
+    Returns:
+        Dict: team_id -> список участников
+    """
+    members = {team_id: [] for team_id in team_ids}
+    if not team_ids:
+        return members
+
+    placeholders = ", ".join(["%s"] * len(team_ids))
+    query = f"""
+    SELECT tm.team_id, s.student_id, s.name, s.group_num, tm.role
+    FROM team_members tm
+    JOIN students s ON tm.student_id = s.student_id
+    WHERE tm.team_id IN ({placeholders})
+    ORDER BY tm.team_id, s.name
+    """  # noqa: S608 - подставляются только плейсхолдеры %s, значения передаются параметрами
+    for row in select_all(query, team_ids):
+        members[row.pop('team_id')].append(row)
+    return members
+
+
+def get_reports_page(
+    fields: list[str],
+    after: tuple | None = None,
+    limit: int = 50,
+    team_id: int | None = None,
+    sprint_num: int | None = None,
+    student_id: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Страница отчетов для API (новые первыми)
+
+    Args:
+        fields: Поля из REPORT_API_FIELDS
+        after: Значение ключа REPORT_API_KEY последней строки предыдущей страницы
+        limit: Количество строк
+        team_id, sprint_num, student_id: Фильтры
+
+    Returns:
+        List[Dict]: Отчеты с запрошенными полями и полями ключа
+    """
+    # Таблица текстов присоединяется, только если текст запрошен
+    bodies_join = (
+        "JOIN sprint_report_bodies b ON b.student_id = sr.student_id AND b.sprint_num = sr.sprint_num"
+        if 'report_text' in fields else ""
+    )
+    query = f"""
+    SELECT
+        {_select_list(fields, REPORT_API_FIELDS, REPORT_API_KEY)}
+    FROM sprint_reports sr
+    {bodies_join}
+    JOIN students s ON sr.student_id = s.student_id
+    JOIN team_members tm ON s.student_id = tm.student_id
+    JOIN teams t ON tm.team_id = t.team_id
+    WHERE 1=1
+    """  # noqa: S608 - колонки только из REPORT_API_FIELDS (_select_list), JOIN - константа
+    params = []
+
+    if team_id is not None:
+        query += " AND t.team_id = %s"
+        params.append(team_id)
+
+    if sprint_num is not None:
+        query += " AND sr.sprint_num = %s"
+        params.append(sprint_num)
+
+    if student_id is not None:
+        query += " AND sr.student_id = %s"
+        params.append(student_id)
+
+    if after is not None:
+        query += " AND (sr.report_date, sr.student_id, sr.sprint_num, t.team_id) < (%s, %s, %s, %s)"
+        params.extend(after)
+
+    query += " ORDER BY sr.report_date DESC, sr.student_id DESC, sr.sprint_num DESC, t.team_id DESC LIMIT %s"
+    params.append(limit)
+    return select_all(query, params)
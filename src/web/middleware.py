@@ -0,0 +1,153 @@
+"""
+ASGI middleware веб-приложения.
+
+CompressionMiddleware сжимает ответы (brotli, если пакет установлен и клиент
+его принимает, иначе gzip), если тело больше порога и тип содержимого текстовый.
+Ответы, уже имеющие Content-Encoding (например, заранее сжатые страницы из
+web.rendering), пропускаются без изменений.
+"""
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+# Типы содержимого, которые имеет смысл сжимать
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits=31 - формат gzip (заголовок и CRC)
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """Сжатие gzip/brotli для ответов больше minimum_size байт"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def select_encoding(self, accept_encoding: str) -> str | None:
+        """Выбрать сжатие по заголовку Accept-Encoding"""
+        accepted = {part.split(';')[0].strip() for part in accept_encoding.lower().split(',')}
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(Headers(scope=scope).get('accept-encoding', ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Перехватывает сообщения ответа и сжимает тело"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Message | None = None
+        self._encoder = None
+        self._passthrough = False
+
+    def _create_encoder(self):
+        if self.encoding == 'br':
+            return _BrotliEncoder(self.middleware.brotli_quality)
+        return _GzipEncoder(self.middleware.gzip_level)
+
+    def _should_compress(self, status: int, headers: Headers) -> bool:
+        if 'content-encoding' in headers:
+            return False
+        # Части файла (Range) отдаются как есть: Content-Range указывает на байты несжатого файла
+        if status == 206 or 'content-range' in headers:
+            return False
+        content_type = headers.get('content-type', "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send(self, message: Message):
+        if message['type'] == 'http.response.start':
+            # Откладываем заголовки до первого фрагмента тела
+            self._start = message
+            self._passthrough = not self._should_compress(message['status'], Headers(raw=message['headers']))
+            return
+
+        if message['type'] != 'http.response.body':
+            await self._send(message)
+            return
+
+        body = message.get('body', b"")
+        more_body = message.get('more_body', False)
+
+        if self._start is not None:
+            # Первый фрагмент: решаем, сжимать ли ответ
+            start, self._start = self._start, None
+            if self._passthrough or (not more_body and len(body) < self.middleware.minimum_size):
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self._encoder = self._create_encoder()
+            headers = MutableHeaders(raw=start['headers'])
+            headers['Content-Encoding'] = self.encoding
+            headers.add_vary_header('Accept-Encoding')
+            del headers['Content-Length']
+            if not more_body:
+                body = self._encoder.compress(body) + self._encoder.finish()
+                headers['Content-Length'] = str(len(body))
+                await self._send(start)
+                await self._send({'type': 'http.response.body', 'body': body})
+                return
+            await self._send(start)
+
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        chunk = self._encoder.compress(body)
+        if not more_body:
+            chunk += self._encoder.finish()
+        await self._send({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
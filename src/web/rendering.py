@@ -0,0 +1,111 @@
+"""
+Слой рендеринга шаблонов веб-приложения.
+
+- шаблоны компилируются при старте, байткод кэшируется на диске
+  (FileSystemBytecodeCache), поэтому холодный старт не разбирает .jinja заново;
+- полностью статические страницы (FAQ) рендерятся один раз в байты вместе со
+  сжатыми вариантами (gzip, brotli при наличии пакета) и ETag.
+"""
+
+import gzip
+import hashlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import jinja2
+from fastapi import Request
+from fastapi.responses import Response
+from fastapi.templating import Jinja2Templates
+
+from config import get_config
+from web.assets import cdn_url, has_asset, static_url
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+config = get_config("webapp")
+
+BASE_DIR = Path(__file__).resolve().parent
+TEMPLATES_DIR = BASE_DIR / "templates"
+PROJECT_DIR = BASE_DIR.parent.parent
+
+# Кэш байткода шаблонов (путь относительно корня проекта)
+BYTECODE_CACHE_DIR = PROJECT_DIR / config.get('web.templates.bytecode_cache_dir', "cache/jinja")
+
+# Время кэширования статических страниц браузером, секунд
+STATIC_PAGE_MAX_AGE = config.get('web.templates.static_page_max_age', 3600)
+
+
+def create_environment() -> jinja2.Environment:
+    """Окружение Jinja с кэшем байткода на диске"""
+    BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+        autoescape=True,
+    )
+    env.globals.update(static_url=static_url, has_asset=has_asset, cdn_url=cdn_url)
+    return env
+
+
+environment = create_environment()
+templates = Jinja2Templates(env=environment)
+
+
+def precompile_templates() -> int:
+    """Скомпилировать все шаблоны (байткод попадает в кэш). Возвращает их количество"""
+    names = environment.list_templates(extensions=["jinja"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)
+
+
+class StaticPage:
+    """Заранее отрендеренная страница с готовыми сжатыми вариантами"""
+
+    def __init__(self, body: bytes, max_age: int = STATIC_PAGE_MAX_AGE):
+        self.body = body
+        self.variants = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body)
+        # Слабый ETag: сжатые варианты семантически совпадают с исходным телом
+        self.etag = 'W/"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        self.headers = {
+            'ETag': self.etag,
+            'Cache-Control': f"public, max-age={max_age}",
+            'Vary': "Accept-Encoding",
+        }
+
+    def select_encoding(self, accept_encoding: str) -> str | None:
+        """Выбрать сжатие по заголовку Accept-Encoding (brotli предпочтительнее)"""
+        accepted = {part.split(';')[0].strip() for part in accept_encoding.lower().split(',')}
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return None
+
+    def response(self, request: Request) -> Response:
+        """Ответ с учётом If-None-Match и Accept-Encoding"""
+        if_none_match = request.headers.get('if-none-match', "")
+        if self.etag in (tag.strip() for tag in if_none_match.split(',')):
+            return Response(status_code=304, headers=self.headers)
+
+        encoding = self.select_encoding(request.headers.get('accept-encoding', ""))
+        if encoding is None:
+            return Response(self.body, media_type="text/html", headers=self.headers)
+        headers = {**self.headers, 'Content-Encoding': encoding}
+        return Response(self.variants[encoding], media_type="text/html", headers=headers)
+
+
+def render_static_page(template_name: str, path: str, **context) -> StaticPage:
+    """
+    Отрендерить страницу без данных из БД.
+
+    Шаблону передаётся заглушка request, в которой есть только url.path
+    (нужен base.jinja для подсветки пункта меню).
+    """
+    request = SimpleNamespace(url=SimpleNamespace(path=path))
+    html = environment.get_template(template_name).render(request=request, **context)
+    return StaticPage(html.encode("utf-8"))
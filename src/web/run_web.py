@@ -1,13 +1,69 @@
 #!/usr/bin/env python3
 """
 Скрипт для запуска web-сервера StudTeams в prod режиме.
+
+Запускает несколько процессов-воркеров uvicorn: web.workers в webapp.yaml
+(0 - по числу доступных процессу ядер) или --workers. Перед запуском
+воркеров приложение один раз загружается в главном процессе: ошибка
+в конфиге или шаблонах видна сразу, а воркеры берут уже скомпилированные
+шаблоны из кэша байткода. Данные страниц воркеры кэшируют в общем
+кэше (sharedcache), который бот сбрасывает при записи в БД.
 """
+
+import argparse
+import os
+
 import uvicorn
+from loguru import logger
+
+from config import get_config
+from sharedcache import shared_cache
+
+config = get_config("webapp")
+
+
+def available_cpus() -> int:
+    """Число ядер, доступных процессу (с учётом ограничений taskset/cgroup cpuset)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count(configured: int | None = None) -> int:
+    """Число воркеров: заданное явно или по числу ядер"""
+    if configured is None:
+        configured = config.get('web.workers', 0)
+    return configured if configured > 0 else available_cpus()
+
+
+def preload():
+    """Загрузить приложение в главном процессе до запуска воркеров"""
+    from web.app import startup
+
+    startup()
+    # Просроченные записи удаляются и при записи в кэш, здесь - сразу при запуске
+    removed = shared_cache.purge_expired()
+    logger.info(f"Shared cache: {shared_cache.path}, removed {removed} expired entries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Запуск web-сервера StudTeams")
+    parser.add_argument("--workers", type=int, default=None, help="Число воркеров (0 - по числу ядер)")
+    args = parser.parse_args()
+
+    workers = worker_count(args.workers)
+    preload()
+    logger.info(f"Starting {workers} web worker(s)")
+    uvicorn.run(
+        "web.app:app",
+        host=config.get('web.host', "127.0.0.1"),
+        port=config.get('web.port', 8000),
+        workers=workers,
+        reload=False,
+        log_level="info",
+    )
+
 
-uvicorn.run(
-    "web.app:app",
-    host="localhost",
-    port=8000,
-    reload=False,
-    log_level="info",
-)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+$(document).ready(function() {
+    // Инициализация тултипов
+    var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));
+    tooltipTriggerList.map(function (tooltipTriggerEl) {
+        return new bootstrap.Tooltip(tooltipTriggerEl);
+    });
+
+    // Обработчик для нереализованных пунктов меню
+    $('.not-implemented').on('click', function(e) {
+        e.preventDefault();
+        return false;
+    });
+});
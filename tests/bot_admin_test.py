@@ -27,13 +27,16 @@ def test_get_team_member_stats():
             },
         ]
         mock_ratings_received = [
-            {'assessor_name': 'Student 4', 'overall_rating': 7, 'rate_date': '2023-01-01'},
             {'assessor_name': 'Student 5', 'overall_rating': 8, 'rate_date': '2023-01-02'},
+            {'assessor_name': 'Student 4', 'overall_rating': 7, 'rate_date': '2023-01-01'},
         ]
 
         mock_db.report_get_by_student.return_value = mock_reports
         mock_db.rating_get_given_by_student.return_value = mock_ratings_given
-        mock_db.rating_get_who_rated_me.return_value = mock_ratings_received
+        mock_db.rating_get_stats.return_value = {
+            'count': 2, 'average': 7.5, 'min': 7, 'max': 8,
+            'distribution': {7: 1, 8: 1}, 'assessors': mock_ratings_received, 'total_teammates': 4,
+        }
 
         # Вызываем тестируемую функцию
         result = get_team_member_stats(123)
@@ -47,6 +50,10 @@ def test_get_team_member_stats():
         assert result['ratings_received'] == mock_ratings_received
         assert result['ratings_received_count'] == 2
         assert result['average_rating'] == 7.5  # (7 + 8) / 2
+        assert result['min_rating'] == 7
+        assert result['max_rating'] == 8
+        assert result['rating_distribution'] == {7: 1, 8: 1}
+        mock_db.rating_get_stats.assert_called_once_with(123)
 
 
 def test_get_team_member_stats_with_no_ratings():
@@ -62,7 +69,10 @@ def test_get_team_member_stats_with_no_ratings():
 
         mock_db.report_get_by_student.return_value = mock_reports
         mock_db.rating_get_given_by_student.return_value = mock_ratings_given
-        mock_db.rating_get_who_rated_me.return_value = mock_ratings_received
+        mock_db.rating_get_stats.return_value = {
+            'count': 0, 'average': 0, 'min': None, 'max': None,
+            'distribution': {}, 'assessors': mock_ratings_received, 'total_teammates': 3,
+        }
 
         # Вызываем тестируемую функцию
         result = get_team_member_stats(123)
@@ -98,35 +108,21 @@ def test_get_team_overall_stats():
     with patch('bot.handlers.admin.db') as mock_db:
         # Настраиваем возвращаемые значения для моков
         mock_members = [
-            {'student_id': 1, 'name': 'Student 1', 'role': 'Developer'},
-            {'student_id': 2, 'name': 'Student 2', 'role': 'Tester'},
-        ]
-        mock_reports_1 = [
-            {'sprint_num': 1, 'report_text': 'Report 1', 'report_date': '2023-01-01'},
-            {'sprint_num': 2, 'report_text': 'Report 2', 'report_date': '2023-01-08'},
-        ]
-        mock_reports_2 = [
-            {'sprint_num': 1, 'report_text': 'Report 1', 'report_date': '2023-01-01'},
-        ]
-        mock_ratings_given_1 = [
             {
-                'assessed_name': 'Student 2', 'overall_rating': 8, 'advantages': 'Good',
-                'disadvantages': 'Bad', 'rate_date': '2023-01-01',
+                'student_id': 1, 'name': 'Student 1', 'role': 'Developer', 'reports_count': 2,
+                'ratings_given_count': 1, 'ratings_received_count': 1, 'avg_rating': 7.0,
+            },
+            {
+                'student_id': 2, 'name': 'Student 2', 'role': 'Tester', 'reports_count': 1,
+                'ratings_given_count': 0, 'ratings_received_count': 2, 'avg_rating': 8.5,
+            },
+            {
+                'student_id': 3, 'name': 'Student 3', 'role': 'Developer', 'reports_count': 0,
+                'ratings_given_count': 0, 'ratings_received_count': 0, 'avg_rating': None,
             },
-        ]
-        mock_ratings_given_2 = []
-        mock_ratings_received_1 = [
-            {'assessor_name': 'Student 2', 'overall_rating': 7, 'rate_date': '2023-01-01'},
-        ]
-        mock_ratings_received_2 = [
-            {'assessor_name': 'Student 1', 'overall_rating': 8, 'rate_date': '2023-01-01'},
-            {'assessor_name': 'Student 3', 'overall_rating': 9, 'rate_date': '2023-01-02'},
         ]
 
-        mock_db.team_get_all_members.return_value = mock_members
-        mock_db.report_get_by_student.side_effect = [mock_reports_1, mock_reports_2]
-        mock_db.rating_get_given_by_student.side_effect = [mock_ratings_given_1, mock_ratings_given_2]
-        mock_db.rating_get_who_rated_me.side_effect = [mock_ratings_received_1, mock_ratings_received_2]
+        mock_db.team_get_member_stats.return_value = mock_members
 
         # Вызываем тестируемую функцию
         result = get_team_overall_stats(456)
@@ -134,7 +130,8 @@ def test_get_team_overall_stats():
         # Проверяем результаты
         assert result['success'] is True
         assert result['members'] == mock_members
-        assert len(result['stats']) == 2
+        assert len(result['stats']) == 3
+        mock_db.team_get_member_stats.assert_called_once_with(456)
 
         # Проверяем статистику первого участника
         stat1 = result['stats'][0]
@@ -154,12 +151,15 @@ def test_get_team_overall_stats():
         assert stat2['ratings_received_count'] == 2
         assert stat2['avg_rating'] == 8.5  # (8 + 9) / 2
 
+        # Без полученных оценок средняя равна 0
+        assert result['stats'][2]['avg_rating'] == 0
+
 
 def test_get_team_overall_stats_with_no_members():
     """Тест функции получения общей статистики команды без участников"""
     # Мокаем зависимости
     with patch('bot.handlers.admin.db') as mock_db:
-        mock_db.team_get_all_members.return_value = []
+        mock_db.team_get_member_stats.return_value = []
 
         # Вызываем тестируемую функцию
         result = get_team_overall_stats(456)
@@ -173,7 +173,7 @@ def test_get_team_overall_stats_with_exception():
     """Тест функции получения общей статистики команды при возникновении исключения"""
     # Мокаем зависимости, чтобы вызвать исключение
     with patch('bot.handlers.admin.db') as mock_db:
-        mock_db.team_get_all_members.side_effect = Exception("Database error")
+        mock_db.team_get_member_stats.side_effect = Exception("Database error")
 
         # Вызываем тестируемую функцию
         result = get_team_overall_stats(456)
@@ -0,0 +1,45 @@
+"""
+Тесты для упаковки callback_data из bot/callback_data.py
+"""
+
+from bot import callback_data
+from bot.callback_data import MAX_CALLBACK_DATA_SIZE, CallbackKind, pack, unpack
+
+
+def test_pack_and_unpack():
+    """Тест упаковки и распаковки callback_data"""
+    data = pack(CallbackKind.REMOVE_MEMBER, 12, 345678)
+
+    assert callback_data.is_packed(data)
+    payload = unpack(data)
+    assert payload is not None
+    assert payload.kind is CallbackKind.REMOVE_MEMBER
+    assert payload.args == (12, 345678)
+
+
+def test_packed_size_limit():
+    """Тест ограничения Telegram на длину callback_data"""
+    data = pack(CallbackKind.EDIT_MEMBER, 2**31 - 1, 2**31 - 1)
+    assert len(data.encode()) <= MAX_CALLBACK_DATA_SIZE
+
+
+def test_unpack_rejects_tampered_data():
+    """Тест отклонения подделанных и чужих данных"""
+    data = pack(CallbackKind.SPRINT, 3)
+
+    # Меняем один символ в середине - подпись не сходится
+    middle = len(data) // 2
+    tampered = data[:middle] + ("A" if data[middle] != "A" else "B") + data[middle + 1:]
+    assert unpack(tampered) is None
+
+    # Старые строковые форматы и мусор не распаковываются
+    assert unpack("sprint_3") is None
+    assert unpack("~") is None
+    assert unpack("~not-base64!") is None
+
+
+def test_unpack_rejects_other_version(monkeypatch):
+    """Тест инвалидации кнопок при смене версии формата"""
+    data = pack(CallbackKind.RATING, 7)
+    monkeypatch.setattr(callback_data, "VERSION", callback_data.VERSION + 1)
+    assert unpack(data) is None
@@ -0,0 +1,43 @@
+"""
+Тесты для обработчиков callback-запросов из bot/handlers/callbacks.py
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from bot.handlers import callbacks
+from bot.states.user_states import JoinTeam
+
+
+def make_callback(data="cancel"):
+    message = SimpleNamespace(chat=SimpleNamespace(id=10), message_id=20)
+    return SimpleNamespace(id="cb", data=data, from_user=SimpleNamespace(id=1, username="student"), message=message)
+
+
+def test_cancel_during_join_team_runs_join_cleanup():
+    """Тест: отмена на выборе роли завершает присоединение к команде"""
+    with patch.object(callbacks.fsm, 'in_group', return_value=True) as in_group, \
+            patch.object(callbacks, 'callback_cancel_join_team') as cancel_join, \
+            patch.object(callbacks, 'db') as mock_db:
+        callbacks.callback_cancel_action(make_callback())
+
+    in_group.assert_called_once_with(1, callbacks.JOIN_TEAM_STATES)
+    assert JoinTeam.user_role in callbacks.JOIN_TEAM_STATES
+    cancel_join.assert_called_once()
+    mock_db.student_get_by_tg_id.assert_not_called()
+
+
+def test_cancel_outside_join_team():
+    """Тест: в остальных состояниях отмена возвращает главное меню"""
+    with patch.object(callbacks.fsm, 'in_group', return_value=False), \
+            patch.object(callbacks, 'callback_cancel_join_team') as cancel_join, \
+            patch.object(callbacks, 'state_storage') as storage, \
+            patch.object(callbacks, 'bot') as mock_bot, \
+            patch.object(callbacks, 'db') as mock_db:
+        mock_db.student_get_by_tg_id.return_value = None
+        callbacks.callback_cancel_action(make_callback())
+
+    cancel_join.assert_not_called()
+    storage.clear_state.assert_called_once_with(1)
+    mock_bot.edit_message_text.assert_called_once_with("❌ Действие отменено.", 10, 20)
+    mock_bot.answer_callback_query.assert_called_once_with("cb")
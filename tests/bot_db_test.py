@@ -2,8 +2,12 @@
 Тесты для модуля bot/db.py - работы с базой данных MySQL
 """
 
+from unittest.mock import patch
+
+import pytest
+
 import myconn
-from bot import db
+from bot import db, roster
 
 
 def setup_function():
@@ -17,6 +21,8 @@ def teardown_function():
     # Не закрываем соединение между тестами, пусть myconn управляет этим
     # Но очищаем тестовые данные
     cleanup_test_data()
+    # Данные удалены в обход bot.db: сбрасываем кэш составов команд
+    roster.cache.clear()
 
 
 def cleanup_test_data():
@@ -35,19 +41,28 @@ def cleanup_test_data():
             "123456789, 123456790, 123456791, 123456792, 123456793, 123456794, "
             "123456795, 123456796, 123456797, 123456798, 999999999, 888888888)",
         )
+        cur.execute(
+            "DELETE FROM sprint_reports WHERE student_id IN ("
+            "SELECT student_id FROM students WHERE tg_id IN (777777771, 777777772))",
+        )
+        cur.execute(
+            "DELETE FROM team_members_ratings WHERE assessor_student_id IN ("
+            "SELECT student_id FROM students WHERE tg_id IN (123456794, 123456795, 123456796))",
+        )
         cur.execute(
             "DELETE FROM team_members WHERE team_id IN ("
             "SELECT team_id FROM teams WHERE invite_code IN ("
-            "'INV123', 'INV456', 'INV789', 'TEST123'))",
+            "'INV123', 'INV456', 'INV789', 'TEST123', 'REMIND1', 'INVDUP1'))",
         )
         cur.execute(
             "DELETE FROM teams WHERE invite_code IN ("
-            "'INV123', 'INV456', 'INV789', 'TEST123')",
+            "'INV123', 'INV456', 'INV789', 'TEST123', 'REMIND1', 'INVDUP1')",
         )
         cur.execute(
             "DELETE FROM students WHERE tg_id IN ("
             "123456789, 123456790, 123456791, 123456792, 123456793, 123456794, "
-            "123456795, 123456796, 123456797, 123456798, 999999999, 888888888)",
+            "123456795, 123456796, 123456797, 123456798, 999999999, 888888888, "
+            "777777771, 777777772)",
         )
         # Убран вызов myconn.commit() так как у нас включен autocommit
     except Exception:
@@ -117,6 +132,16 @@ def test_get_nonexistent_team():
     assert team is None
 
 
+def test_team_invite_code_is_unique():
+    """Тест уникального индекса на код приглашения (dbschema/migrations/001)"""
+    admin = db.student_create(123456790, "Петр Петров", "ГРП-02")
+    db.team_create("Команда А", "Проект Б", "INVDUP1", admin['student_id'])
+
+    with pytest.raises(myconn.get_driver().IntegrityError) as error:
+        db.team_create("Команда Б", "Проект В", "INVDUP1", admin['student_id'])
+    assert myconn.is_duplicate_key(error.value, "uk_teams_invite_code")
+
+
 def test_add_and_remove_team_member():
     """Тест добавления и удаления участника команды"""
     # Создаем студентов
@@ -156,19 +181,22 @@ def test_create_and_manage_report():
     # Создаем отчет
     db.report_create_or_update(student['student_id'], 1, "Текст отчета за спринт 1")
 
-    # Получаем отчеты студента
+    # Получаем отчеты студента: метаданные без текста
     reports = db.report_get_by_student(student['student_id'])
     assert len(reports) == 1
     assert reports[0]['sprint_num'] == 1
-    assert reports[0]['report_text'] == "Текст отчета за спринт 1"
+    assert reports[0]['report_length'] == len("Текст отчета за спринт 1")
+    assert 'report_text' not in reports[0]
+    assert db.report_get_text(student['student_id'], 1) == "Текст отчета за спринт 1"
 
     # Обновляем отчет
     db.report_create_or_update(student['student_id'], 1, "Обновленный текст отчета за спринт 1")
 
     # Проверяем обновление
-    reports = db.report_get_by_student(student['student_id'])
+    reports = db.report_get_with_text_by_student(student['student_id'])
     assert len(reports) == 1
     assert reports[0]['report_text'] == "Обновленный текст отчета за спринт 1"
+    assert reports[0]['report_length'] == len("Обновленный текст отчета за спринт 1")
 
     # Удаляем отчет
     db.report_delete(student['student_id'], 1)
@@ -176,6 +204,49 @@ def test_create_and_manage_report():
     # Проверяем удаление
     reports = db.report_get_by_student(student['student_id'])
     assert len(reports) == 0
+    assert db.report_get_text(student['student_id'], 1) is None
+
+
+def test_report_create_or_update_is_atomic():
+    """Тест: метаданные отчёта не сохраняются, если не удалось записать текст"""
+    student = db.student_create(123456793, "Отчетов Отчетов", "ГРП-05")
+    execute = myconn._execute
+
+    def failing(cursor, query, params):
+        if "sprint_report_bodies" in query:
+            raise RuntimeError("connection lost")
+        return execute(cursor, query, params)
+
+    with patch('myconn._execute', failing), pytest.raises(RuntimeError, match="connection lost"):
+        db.report_create_or_update(student['student_id'], 1, "Текст отчета за спринт 1")
+
+    assert db.report_get_by_student(student['student_id']) == []
+    # После отката соединение снова работает в autocommit
+    db.report_create_or_update(student['student_id'], 1, "Текст отчета за спринт 1")
+    assert db.report_get_text(student['student_id'], 1) == "Текст отчета за спринт 1"
+
+
+def test_get_missing_report_submitters():
+    """Тест поиска участников команд без отчёта по спринту"""
+    admin = db.student_create(777777771, "Напоминаний Админ", "ГРП-14")
+    member = db.student_create(777777772, "Напоминаний Участник", "ГРП-15")
+    team = db.team_create("Команда Напоминаний", "Проект Напоминаний", "REMIND1", admin['student_id'])
+    # Администратор - тоже участник команды (как при регистрации через бота)
+    db.team_add_member(team['team_id'], admin['student_id'], "Scrum Master")
+    db.team_add_member(team['team_id'], member['student_id'], "Разработчик")
+
+    # Отчёт за спринт 1 сдал только администратор
+    db.report_create_or_update(admin['student_id'], 1, "Отчёт администратора")
+
+    missing = {s['student_id']: s for s in db.report_get_missing_submitters(1)}
+    assert member['student_id'] in missing
+    assert admin['student_id'] not in missing
+    assert missing[member['student_id']]['tg_id'] == 777777772
+    assert missing[member['student_id']]['team_name'] == "Команда Напоминаний"
+
+    # По спринту 2 отчётов нет ни у кого
+    missing = {s['student_id'] for s in db.report_get_missing_submitters(2)}
+    assert {admin['student_id'], member['student_id']} <= missing
 
 
 def test_create_and_get_ratings():
@@ -245,6 +316,59 @@ def test_get_teammates_not_rated():
     assert not_rated[0]['name'] == "Участник 2"
 
 
+def test_rating_stats():
+    """Тест сводки полученных оценок и статистики команды"""
+    admin = db.student_create(123456794, "Сводки Админ", "ГРП-16")
+    member1 = db.student_create(123456795, "Сводки Первый", "ГРП-16")
+    member2 = db.student_create(123456796, "Сводки Второй", "ГРП-16")
+    team = db.team_create("Команда Сводки", "Проект Сводки", "INV456", admin['student_id'])
+    db.team_add_member(team['team_id'], admin['student_id'], "Scrum Master")
+    db.team_add_member(team['team_id'], member1['student_id'], "Разработчик")
+    db.team_add_member(team['team_id'], member2['student_id'], "Разработчик")
+
+    # Без оценок сводка пустая, но размер команды известен
+    stats = db.rating_get_stats(admin['student_id'])
+    assert stats['count'] == 0
+    assert stats['average'] == 0
+    assert stats['assessors'] == []
+    assert stats['total_teammates'] == 2
+
+    db.rating_create(member1['student_id'], admin['student_id'], 7, "Хорошо планирует", "Мало кода")
+    db.rating_create(member2['student_id'], admin['student_id'], 8, "Помогает команде", "Опаздывает")
+
+    stats = db.rating_get_stats(admin['student_id'])
+    assert stats['count'] == 2
+    assert stats['average'] == 7.5
+    assert stats['min'] == 7
+    assert stats['max'] == 8
+    assert stats['distribution'] == {7: 1, 8: 1}
+    assert {a['assessor_name'] for a in stats['assessors']} == {"Сводки Первый", "Сводки Второй"}
+
+    members = {m['student_id']: m for m in db.team_get_member_stats(team['team_id'])}
+    assert members[admin['student_id']]['role'] == 'Scrum Master'
+    assert members[admin['student_id']]['ratings_received_count'] == 2
+    assert float(members[admin['student_id']]['avg_rating']) == 7.5
+    assert members[member1['student_id']]['ratings_given_count'] == 1
+    assert members[member1['student_id']]['avg_rating'] is None
+
+
+def test_member_stats_include_admin_without_member_row():
+    """Тест: администратор без строки в team_members есть в статистике команды"""
+    admin = db.student_create(888888888, "Админ Команды Тест", "ГРП-11")
+    member = db.student_create(123456797, "Участник Статистики", "ГРП-12")
+    team = db.team_create("Команда Тест", "Проект Тест", "TEST123", admin['student_id'])
+    db.team_add_member(team['team_id'], member['student_id'], "Разработчик")
+
+    members = db.team_get_member_stats(team['team_id'])
+    assert [m['student_id'] for m in members] == [admin['student_id'], member['student_id']]
+    assert members[0]['role'] == 'Scrum Master'
+    assert members[1]['role'] == 'Разработчик'
+
+    # Администратор со строкой участника не дублируется
+    db.team_add_member(team['team_id'], admin['student_id'], "Scrum Master")
+    assert len(db.team_get_member_stats(team['team_id'])) == 2
+
+
 def test_get_all_team_members():
     """Тест получения всех участников команды, включая администратора"""
     # Создаем студентов
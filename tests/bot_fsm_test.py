@@ -0,0 +1,86 @@
+"""
+Тесты для FSM диалогов из bot/fsm.py и таблицы bot/handlers/dialogs.py
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from bot.fsm import FSM, State, StateRow, states_of
+from bot.handlers.dialogs import DIALOGS
+from bot.state_storage import StateStorage
+from bot.states import user_states
+from bot.states.user_states import JoinTeam, ReportCreation, TeamRegistration
+
+USER_ID = 777
+
+
+def make_fsm(*rows):
+    state_machine = FSM(StateStorage())
+    state_machine.load(rows)
+    return state_machine
+
+
+def test_states_are_small_ints():
+    """Тест: состояния - различные небольшие целые числа с именами"""
+    states = [state for group in vars(user_states).values() if isinstance(group, type) for state in states_of(group)]
+    assert len(set(states)) == len(states)
+    assert all(isinstance(state, int) and 0 <= state < 256 for state in states)
+    assert str(JoinTeam.confirm) == "JoinTeam:confirm"
+    assert JoinTeam.confirm.group == "JoinTeam"
+
+    with pytest.raises(ValueError, match="already declared"):
+        State("JoinTeam:confirm")
+
+
+def test_dialogs_table_covers_all_states():
+    """Тест: каждое объявленное состояние есть в таблице ровно один раз"""
+    declared = set()
+    for group in vars(user_states).values():
+        if isinstance(group, type) and group.__module__ == user_states.__name__:
+            declared |= states_of(group)
+
+    assert sorted(row.state for row in DIALOGS) == sorted(declared)
+    make_fsm(*DIALOGS)
+
+
+def test_handler_lookup():
+    """Тест поиска обработчика по состоянию"""
+    handler = MagicMock()
+    state_machine = make_fsm(StateRow(ReportCreation.report_text, handler))
+
+    assert state_machine.handler(ReportCreation.report_text) is handler
+    assert state_machine.handler(ReportCreation.sprint_selection) is None
+    assert state_machine.handler(None) is None
+    assert state_machine.handler(10_000) is None
+
+
+def test_load_rejects_unknown_transition_and_duplicates():
+    """Тест проверки таблицы при загрузке"""
+    with pytest.raises(ValueError, match="target is not registered"):
+        make_fsm(StateRow(TeamRegistration.team_name, None, (TeamRegistration.product_name,)))
+    with pytest.raises(ValueError, match="already registered"):
+        make_fsm(StateRow(TeamRegistration.team_name), StateRow(TeamRegistration.team_name))
+
+
+def test_set_state_transitions():
+    """Тест: необъявленный переход выполняется, но пишется в лог"""
+    state_machine = make_fsm(
+        StateRow(JoinTeam.user_name, None, (JoinTeam.user_group,), entry=True),
+        StateRow(JoinTeam.user_group),
+        StateRow(ReportCreation.sprint_selection, entry=True),
+    )
+
+    with patch('bot.fsm.logger') as mock_logger:
+        state_machine.set_state(USER_ID, JoinTeam.user_name)
+        state_machine.set_state(USER_ID, JoinTeam.user_group)
+        # Вход в начало другого диалога разрешён из любого состояния
+        state_machine.set_state(USER_ID, ReportCreation.sprint_selection)
+        mock_logger.warning.assert_not_called()
+
+        state_machine.set_state(USER_ID, JoinTeam.user_group)
+        mock_logger.warning.assert_called_once()
+
+    assert state_machine.get_state(USER_ID) == JoinTeam.user_group
+    assert state_machine.in_group(USER_ID, states_of(JoinTeam))
+    assert not state_machine.in_group(USER_ID, states_of(ReportCreation))
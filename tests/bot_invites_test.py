@@ -0,0 +1,99 @@
+"""
+Тесты для кодов приглашения из bot/invites.py
+"""
+
+from unittest.mock import patch
+
+import pytest
+from mysql.connector import IntegrityError, errorcode
+
+from bot import invites
+from bot.invites import InviteCache
+
+
+@pytest.fixture(autouse=True)
+def mysql_driver(monkeypatch):
+    """Тесты подменяют объекты mysql.connector: драйвер не зависит от STUDTEAMS_DB_DRIVER"""
+    monkeypatch.setenv('STUDTEAMS_DB_DRIVER', "mysql-connector")
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    invites.cache.clear()
+    yield
+    invites.cache.clear()
+
+
+def duplicate_error(key):
+    return IntegrityError(
+        msg=f"Duplicate entry 'ABC' for key 'teams.{key}'", errno=errorcode.ER_DUP_ENTRY,
+    )
+
+
+def test_generate_code():
+    """Тест алфавита и длины кода"""
+    code = invites.generate_code()
+    assert len(code) == invites.CODE_LENGTH
+    assert set(code) <= set(invites.ALPHABET)
+    assert not set("0OI") & set(invites.ALPHABET)
+
+
+def test_find_team_caches_hits_and_misses():
+    """Тест: повторный поиск (в т.ч. несуществующего кода) не обращается к БД"""
+    team = {'team_id': 1, 'team_name': "Alpha", 'invite_code': "ABCD2345"}
+    with patch('bot.invites.db') as mock_db:
+        mock_db.team_get_by_invite_code.side_effect = lambda code: team if code == "ABCD2345" else None
+
+        assert invites.find_team("ABCD2345") == team
+        assert invites.find_team("ABCD2345") == team
+        assert invites.find_team("WRONG123") is None
+        assert invites.find_team("WRONG123") is None
+
+        assert mock_db.team_get_by_invite_code.call_count == 2
+
+
+def test_find_team_rejects_malformed_codes():
+    """Тест: коды неподходящего вида отклоняются без запроса к БД"""
+    with patch('bot.invites.db') as mock_db:
+        assert invites.find_team("'; DROP TABLE teams; --") is None
+        assert invites.find_team("A" * 100) is None
+        mock_db.team_get_by_invite_code.assert_not_called()
+
+
+def test_cache_expiration_and_size():
+    """Тест времени жизни и ограничения размера кэша"""
+    cache = InviteCache(ttl=10, negative_ttl=1, max_size=2)
+    with patch('bot.invites.time.monotonic', return_value=100):
+        cache.put("A", {'team_id': 1})
+        cache.put("B", None)
+    with patch('bot.invites.time.monotonic', return_value=102):
+        assert cache.get("A") == (True, {'team_id': 1})
+        assert cache.get("B") == (False, None)  # отрицательная запись истекла
+        cache.put("C", None)
+        cache.put("D", None)
+        assert cache.get("A") == (False, None)  # вытеснена
+
+
+def test_create_team_retries_on_collision():
+    """Тест: при совпадении кода INSERT повторяется с новым кодом"""
+    invites.cache.put("SECOND22", None)
+    created = {'team_id': 5, 'invite_code': "SECOND22"}
+    with patch('bot.invites.db') as mock_db, \
+            patch('bot.invites.generate_code', side_effect=["FIRST111", "SECOND22"]):
+        mock_db.team_create.side_effect = [duplicate_error(invites.INVITE_CODE_KEY), created]
+
+        assert invites.create_team("Alpha", "Product", 7) == created
+
+        assert mock_db.team_create.call_count == 2
+        mock_db.team_create.assert_called_with("Alpha", "Product", "SECOND22", 7)
+    # Код мог быть закэширован как несуществующий
+    assert invites.cache.get("SECOND22") == (False, None)
+
+
+def test_create_team_reraises_other_errors():
+    """Тест: другие нарушения ключей не маскируются повтором"""
+    with patch('bot.invites.db') as mock_db:
+        mock_db.team_create.side_effect = duplicate_error("PRIMARY")
+        with pytest.raises(IntegrityError):
+            invites.create_team("Alpha", "Product", 7)
+        assert mock_db.team_create.call_count == 1
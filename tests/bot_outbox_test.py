@@ -0,0 +1,141 @@
+"""
+Тесты для очереди исходящих сообщений из bot/outbox.py
+"""
+
+import threading
+from types import SimpleNamespace
+
+from telebot.apihelper import ApiTelegramException
+
+from bot.outbox import Outbox, QueuedBot, TokenBucket
+
+
+class FakeBot:
+    """Бот, записывающий вызовы Bot API"""
+
+    def __init__(self, fail_first_with=None):
+        self.calls = []
+        self.fail_first_with = fail_first_with
+        self.lock = threading.Lock()
+
+    def _record(self, method, *args, **kwargs):
+        with self.lock:
+            if self.fail_first_with is not None:
+                error, self.fail_first_with = self.fail_first_with, None
+                raise error
+            self.calls.append((method, args, kwargs))
+
+    def send_message(self, *args, **kwargs):
+        self._record('send_message', *args, **kwargs)
+
+    def edit_message_text(self, *args, **kwargs):
+        self._record('edit_message_text', *args, **kwargs)
+
+    def answer_callback_query(self, *args, **kwargs):
+        self._record('answer_callback_query', *args, **kwargs)
+
+
+def make_flood_error(retry_after):
+    response = SimpleNamespace(status_code=429, text="Too Many Requests")
+    result_json = {
+        'ok': False,
+        'error_code': 429,
+        'description': "Too Many Requests: retry later",
+        'parameters': {'retry_after': retry_after},
+    }
+    return ApiTelegramException('sendMessage', response, result_json)
+
+
+def test_token_bucket():
+    """Тест накопления и расхода токенов"""
+    bucket = TokenBucket(rate=1, capacity=2, now=0)
+
+    assert bucket.delay(0) == 0
+    bucket.consume(0)
+    bucket.consume(0)
+    assert bucket.delay(0) == 1.0
+    assert bucket.delay(0.5) == 0.5
+    assert bucket.delay(1) == 0
+    # Накопление не превышает capacity
+    assert bucket.delay(100) == 0
+    bucket.consume(100)
+    bucket.consume(100)
+    assert bucket.delay(100) > 0
+
+
+def test_coalesce_messages_to_same_chat():
+    """Тест склейки подряд идущих сообщений в один чат"""
+    fake_bot = FakeBot()
+    outbox = Outbox(fake_bot, workers=1)
+    queued = QueuedBot(fake_bot, outbox)
+
+    # Сообщения ставятся в очередь до запуска потоков
+    queued.send_message(1, "Первое")
+    queued.send_message(1, "Второе", reply_markup="keyboard")
+    queued.send_message(1, "После клавиатуры")
+    queued.send_message(2, "Другой чат", parse_mode="Markdown")
+    assert outbox.pending == 4
+
+    outbox.start()
+    assert outbox.flush(timeout=5)
+    outbox.stop()
+
+    sent = [(args, kwargs) for method, args, kwargs in fake_bot.calls]
+    assert ((1, "Первое\n\nВторое"), {'reply_markup': "keyboard"}) in sent
+    assert ((1, "После клавиатуры"), {}) in sent
+    assert ((2, "Другой чат"), {'parse_mode': "Markdown"}) in sent
+    assert len(sent) == 3
+
+
+def test_retry_after_flood_error():
+    """Тест повторной отправки после ошибки 429"""
+    fake_bot = FakeBot(fail_first_with=make_flood_error(retry_after=0))
+    outbox = Outbox(fake_bot, workers=2)
+    queued = QueuedBot(fake_bot, outbox)
+
+    errors = []
+    outbox.start()
+    outbox.submit(1, 'send_message', 1, "Текст", on_done=errors.append)
+    queued.answer_callback_query("cb-1", "Готово")
+    assert outbox.flush(timeout=5)
+    outbox.stop()
+
+    assert errors == [None]
+    assert ('send_message', (1, "Текст"), {}) in fake_bot.calls
+    assert ('answer_callback_query', ("cb-1", "Готово"), {}) in fake_bot.calls
+
+
+def test_failed_request_reports_error():
+    """Тест передачи ошибки в on_done без повторов"""
+    fake_bot = FakeBot(fail_first_with=RuntimeError("network down"))
+    outbox = Outbox(fake_bot, workers=1)
+
+    errors = []
+    outbox.start()
+    outbox.submit(1, 'send_message', 1, "Текст", on_done=errors.append)
+    assert outbox.flush(timeout=5)
+    outbox.stop()
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], RuntimeError)
+    assert fake_bot.calls == []
+
+
+def test_idle_chat_state_is_evicted():
+    """Тест: корзины простаивающих чатов и истёкшие отсрочки удаляются"""
+    outbox = Outbox(FakeBot(), workers=1, per_chat_rate=1, per_chat_burst=1)
+    outbox._chat_buckets[1] = TokenBucket(rate=1, capacity=1, now=0)
+    outbox._chat_buckets[1].consume(0)
+    outbox._chat_buckets[2] = TokenBucket(rate=1, capacity=1, now=0)
+    outbox._not_before.update({1: 5, 2: 50})
+
+    outbox._evict_idle(10)
+    # Корзина чата 1 успела наполниться, отсрочка чата 2 ещё действует
+    assert outbox._chat_buckets == {}
+    assert outbox._not_before == {2: 50}
+
+    outbox.submit(3, 'send_message', 3, "В очереди")
+    outbox._chat_buckets[3] = TokenBucket(rate=1, capacity=1, now=0)
+    outbox._evict_idle(100)
+    assert list(outbox._chat_buckets) == [3]
+    assert outbox._not_before == {}
@@ -0,0 +1,110 @@
+"""
+Тесты для рассылки напоминаний о несданных отчётах из bot/reminders.py
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from telebot.apihelper import ApiTelegramException
+
+from bot.reminders import ReminderCheckpoint, broadcast_reminders, due_sprints, parse_deadlines
+
+MISSING = [
+    {'student_id': 1, 'tg_id': 101, 'name': "Анна", 'team_name': "Альфа"},
+    {'student_id': 2, 'tg_id': 102, 'name': "Борис", 'team_name': "Альфа"},
+    {'student_id': 3, 'tg_id': 103, 'name': "Вера", 'team_name': "Бета"},
+]
+
+
+class FakeOutbox:
+    """Outbox, сразу вызывающий on_done с заданной ошибкой"""
+
+    def __init__(self, errors=None):
+        self.sent = []
+        self.errors = errors or {}
+
+    def submit(self, key, method, *args, on_done=None, **kwargs):
+        self.sent.append((key, args[1]))
+        on_done(self.errors.get(key))
+
+
+def make_api_error(code, description):
+    response = SimpleNamespace(status_code=code, text=description)
+    return ApiTelegramException('sendMessage', response, {'error_code': code, 'description': description})
+
+
+def test_broadcast_resumes_from_checkpoint(tmp_path):
+    """Тест рассылки с продолжением после прерывания"""
+    checkpoint_path = tmp_path / "sprint_2.json"
+    checkpoint = ReminderCheckpoint(checkpoint_path)
+    checkpoint.mark_sent(1)
+    checkpoint.save()
+
+    outbox = FakeOutbox()
+    with patch('bot.reminders.db.report_get_missing_submitters', return_value=MISSING) as query:
+        delivered = broadcast_reminders(outbox, 2, datetime(2025, 3, 1, 23, 59), ReminderCheckpoint(checkpoint_path))
+
+    query.assert_called_once_with(2)
+    assert delivered == 2
+    assert [key for key, _ in outbox.sent] == [102, 103]
+    assert "спринт 2" in outbox.sent[0][1]
+    assert "01.03.2025 23:59" in outbox.sent[0][1]
+
+    # Повторный запуск никому не отправляет напоминание второй раз
+    outbox = FakeOutbox()
+    with patch('bot.reminders.db.report_get_missing_submitters', return_value=MISSING):
+        assert broadcast_reminders(outbox, 2, None, ReminderCheckpoint(checkpoint_path)) == 0
+    assert outbox.sent == []
+
+
+def test_broadcast_failed_delivery(tmp_path):
+    """Тест: отказ Telegram фиксируется, сетевая ошибка остаётся на повтор"""
+    blocked = make_api_error(403, "Forbidden: bot was blocked by the user")
+    outbox = FakeOutbox(errors={101: blocked, 102: ConnectionError("timeout")})
+
+    checkpoint = ReminderCheckpoint(tmp_path / "sprint_1.json")
+    with patch('bot.reminders.db.report_get_missing_submitters', return_value=MISSING):
+        assert broadcast_reminders(outbox, 1, None, checkpoint) == 1
+
+    assert checkpoint.is_sent(1)
+    assert not checkpoint.is_sent(2)
+    assert checkpoint.is_sent(3)
+
+
+def test_temporary_api_errors_are_retried_later(tmp_path):
+    """Тест: 429 после всех повторов и 5xx не отмечаются, «chat not found» отмечается"""
+    outbox = FakeOutbox(errors={
+        101: make_api_error(429, "Too Many Requests: retry after 5"),
+        102: make_api_error(502, "Bad Gateway"),
+        103: make_api_error(400, "Bad Request: chat not found"),
+    })
+
+    checkpoint = ReminderCheckpoint(tmp_path / "sprint_1.json")
+    with patch('bot.reminders.db.report_get_missing_submitters', return_value=MISSING):
+        assert broadcast_reminders(outbox, 1, None, checkpoint) == 0
+
+    assert not checkpoint.is_sent(1)
+    assert not checkpoint.is_sent(2)
+    assert checkpoint.is_sent(3)
+
+
+def test_broadcast_does_not_hang_on_stopped_outbox(tmp_path):
+    """Тест: рассылка прерывается, если Outbox не подтверждает отправку"""
+    outbox = SimpleNamespace(submit=lambda *args, **kwargs: None)
+
+    checkpoint = ReminderCheckpoint(tmp_path / "sprint_1.json")
+    with patch('bot.reminders.db.report_get_missing_submitters', return_value=MISSING):
+        assert broadcast_reminders(outbox, 1, None, checkpoint, max_in_flight=2, delivery_timeout=0.01) == 0
+    assert checkpoint.sent_count == 0
+
+
+def test_due_sprints():
+    """Тест выбора спринтов, срок сдачи которых подходит"""
+    deadlines = parse_deadlines({'1': "2025-02-01 23:59", '2': "2025-03-01 23:59"})
+    lead = timedelta(hours=24)
+
+    assert due_sprints(deadlines, datetime(2025, 2, 1, 12, 0).astimezone(), lead) == [1]
+    assert due_sprints(deadlines, datetime(2025, 2, 15, 12, 0).astimezone(), lead) == []
+    # После срока сдачи напоминания не отправляются
+    assert due_sprints(deadlines, datetime(2025, 3, 2, 0, 0).astimezone(), lead) == []
@@ -0,0 +1,109 @@
+"""
+Тесты для состава команд из bot/roster.py
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from bot import db, roster
+from bot.roster import ADMIN_ROLE, RosterCache
+
+TEAM_ID = 10
+ADMIN_ID = 1
+
+# Строки запроса load_roster: администратор и участники команды
+ROSTER_ROWS = [
+    {'admin_student_id': ADMIN_ID, 'admin_name': "Админ", 'student_id': 1, 'name': "Админ", 'role': "Разработчик"},
+    {'admin_student_id': ADMIN_ID, 'admin_name': "Админ", 'student_id': 2, 'name': "Бета", 'role': "Аналитик"},
+    {'admin_student_id': ADMIN_ID, 'admin_name': "Админ", 'student_id': 3, 'name': "Гамма", 'role': "Тестировщик"},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    roster.cache.clear()
+    yield
+    roster.cache.clear()
+
+
+def test_roster_is_loaded_once_and_filtered_in_memory():
+    """Тест: состав читается одним запросом, списки строятся из кэша"""
+    with patch('bot.roster.select_all', return_value=ROSTER_ROWS) as mock_select:
+        assert roster.teammates(TEAM_ID, 2) == [
+            {'student_id': 1, 'name': "Админ", 'role': "Разработчик"},
+            {'student_id': 3, 'name': "Гамма", 'role': "Тестировщик"},
+        ]
+        assert [member['role'] for member in roster.all_members(TEAM_ID)] == [ADMIN_ROLE, "Аналитик", "Тестировщик"]
+
+    mock_select.assert_called_once()
+    # Изменение результата не портит кэш
+    roster.teammates(TEAM_ID, 2)[0]['name'] = "Изменено"
+    assert roster.get_roster(TEAM_ID).members[0]['name'] == "Админ"
+
+
+def test_teammates_not_rated_filters_rated():
+    """Тест: оценённые участники исключаются, оценки читаются каждый раз"""
+    with patch('bot.roster.select_all', side_effect=[ROSTER_ROWS, [(3,)], [(1,), (3,)]]):
+        assert roster.teammates_not_rated(TEAM_ID, 2) == [{'student_id': 1, 'name': "Админ"}]
+        assert roster.teammates_not_rated(TEAM_ID, 2) == []
+
+
+def test_admin_outside_team_members_is_listed():
+    """Тест: администратор без записи в team_members всё равно в списке участников"""
+    rows = [
+        {'admin_student_id': 7, 'admin_name': "Админ", 'student_id': None, 'name': None, 'role': None},
+    ]
+    with patch('bot.roster.select_all', return_value=rows):
+        assert roster.all_members(TEAM_ID) == [{'student_id': 7, 'name': "Админ", 'role': ADMIN_ROLE}]
+        assert roster.teammates(TEAM_ID, 7) == []
+
+
+def test_unknown_team_is_not_cached():
+    """Тест: несуществующая команда даёт пустые списки и не кэшируется"""
+    with patch('bot.roster.select_all', return_value=[]) as mock_select:
+        assert roster.all_members(TEAM_ID) == []
+        assert roster.teammates(TEAM_ID, 1) == []
+    assert mock_select.call_count == 2
+
+
+def test_db_functions_use_roster_and_membership_changes_invalidate():
+    """Тест: функции bot.db - поиск команды студента и состава, запись сбрасывает кэш"""
+    with (
+        patch('bot.roster.select_one', return_value=(TEAM_ID,)) as mock_team,
+        patch('bot.roster.select_all', return_value=ROSTER_ROWS) as mock_select,
+        patch('bot.db.insert_update'),
+        patch('bot.db.shared_cache'),
+    ):
+        assert [m['student_id'] for m in db.student_get_teammates(2)] == [1, 3]
+        assert [m['student_id'] for m in db.team_get_all_members(TEAM_ID)] == [1, 2, 3]
+        assert mock_team.call_count == 1
+        assert mock_select.call_count == 1
+
+        db.team_remove_member(TEAM_ID, 3)
+        db.student_get_teammates(2)
+        assert mock_select.call_count == 2
+        # Команда студента 2 не менялась
+        assert mock_team.call_count == 1
+
+
+def test_student_without_team():
+    """Тест: у студента без команды нет сокомандников, отсутствие команды кэшируется"""
+    with patch('bot.roster.select_one', return_value=None) as mock_team, patch('bot.roster.select_all') as mock_select:
+        assert db.student_get_teammates(5) == []
+        assert db.student_get_teammates_not_rated(5) == []
+    mock_team.assert_called_once()
+    mock_select.assert_not_called()
+
+
+def test_cache_expiration_and_size():
+    """Тест времени жизни и размера кэша"""
+    cache = RosterCache(ttl=10, max_size=1)
+    with patch('bot.roster.time.monotonic', return_value=100):
+        cache.put_team_id(1, TEAM_ID)
+        cache.put_team_id(2, None)
+        assert cache.get_team_id(2) == (True, None)
+        assert cache.get_team_id(1) == (False, None)  # вытеснен по размеру
+
+    with patch('bot.roster.time.monotonic', return_value=111):
+        assert cache.get_team_id(2) == (False, None)
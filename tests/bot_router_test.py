@@ -0,0 +1,119 @@
+"""
+Тесты для маршрутизатора сообщений и callback-запросов из bot/router.py
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from bot.callback_data import CallbackKind, pack
+from bot.fsm import FSM, StateRow
+from bot.router import OUTDATED_BUTTON_TEXT, Router
+from bot.state_storage import state_storage
+from bot.states.user_states import ReportCreation, ReviewProcess
+
+USER_ID = 555
+
+
+def make_message(text):
+    return SimpleNamespace(text=text, from_user=SimpleNamespace(id=USER_ID))
+
+
+def make_callback(data):
+    return SimpleNamespace(data=data, from_user=SimpleNamespace(id=USER_ID))
+
+
+def teardown_function():
+    """Очистка состояния тестового пользователя"""
+    state_storage.clear_state(USER_ID)
+
+
+def test_text_route():
+    """Тест маршрутизации по точному тексту кнопки"""
+    router = Router()
+    handler = MagicMock()
+    router.text("Мои отчёты", handler)
+
+    message = make_message("Мои отчёты")
+    router.dispatch_message(message)
+    handler.assert_called_once_with(message)
+
+    # Неизвестный текст никуда не маршрутизируется
+    assert router.resolve_message(make_message("Что-то другое")) is None
+
+
+def test_state_route_has_priority():
+    """Тест приоритета состояния FSM над кнопками"""
+    state_machine = FSM(state_storage)
+    router = Router(state_machine)
+    text_handler = MagicMock()
+    state_handler = MagicMock()
+    router.text("Отмена", text_handler)
+    state_machine.load([
+        StateRow(ReportCreation.report_text, state_handler),
+        StateRow(ReviewProcess.teammate_selection),
+    ])
+
+    state_storage.set_state(USER_ID, ReportCreation.report_text)
+    router.dispatch_message(make_message("Отмена"))
+    state_handler.assert_called_once()
+    text_handler.assert_not_called()
+
+    # Без обработчика для состояния используется маршрут по тексту
+    state_storage.set_state(USER_ID, ReviewProcess.teammate_selection)
+    assert router.resolve_message(make_message("Отмена")) is text_handler
+    state_storage.set_state(USER_ID, ReportCreation.sprint_selection)
+    assert router.resolve_message(make_message("Отмена")) is text_handler
+
+
+def test_callback_exact_route():
+    """Тест маршрутизации callback-запросов по точному значению"""
+    router = Router()
+    cancel = MagicMock()
+    router.callback("cancel", cancel)
+
+    assert router.resolve_callback(make_callback("cancel")) is cancel
+    assert router.resolve_callback(make_callback("member_3")) is None
+    assert router.resolve_callback(make_callback(None)) is None
+
+
+def test_callback_kind_route():
+    """Тест маршрутизации упакованных callback_data по типу"""
+    router = Router()
+    handler = MagicMock()
+    router.callback_kind(CallbackKind.SPRINT, handler)
+
+    callback = make_callback(pack(CallbackKind.SPRINT, 4))
+    router.dispatch_callback(callback)
+    handler.assert_called_once_with(callback)
+    assert callback.payload.args == (4,)
+
+    # Тип без обработчика и испорченные данные не маршрутизируются
+    assert router.resolve_callback(make_callback(pack(CallbackKind.RATING, 5))) is None
+    assert router.resolve_callback(make_callback("~broken")) is None
+
+
+def test_outdated_callback_is_answered():
+    """Тест: на устаревшую кнопку бот отвечает уведомлением"""
+    router = Router()
+    bot = MagicMock()
+    router.install(bot)
+
+    callback = make_callback("~broken")
+    callback.id = "42"
+    router.dispatch_callback(callback)
+    bot.answer_callback_query.assert_called_once_with("42", OUTDATED_BUTTON_TEXT)
+
+
+def test_duplicate_and_invalid_routes():
+    """Тест защиты от повторной регистрации маршрутов"""
+    router = Router()
+    router.text("Помощь", MagicMock())
+
+    with pytest.raises(ValueError, match="already registered"):
+        router.text("Помощь", MagicMock())
+
+    router.callback_kind(CallbackKind.SPRINT, MagicMock())
+    with pytest.raises(ValueError, match="already registered"):
+        router.callback_kind(CallbackKind.SPRINT, MagicMock())
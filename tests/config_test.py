@@ -0,0 +1,124 @@
+"""
+Тесты для модуля конфигурации config.py
+"""
+
+import dataclasses
+import os
+
+import pytest
+
+from config import Config, ConfigWatcher, freeze
+
+
+def test_freeze():
+    """Тест построения неизменяемого снимка"""
+    settings = freeze({'features': {'max_sprint_number': 6, 'groups': ['6401', '6402']}, 'deadlines': {1: "x"}})
+
+    assert settings.features.max_sprint_number == 6
+    assert settings.features.groups == ('6401', '6402')
+    assert settings.deadlines[1] == "x"
+    assert not hasattr(settings.features, '__dict__')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.features.max_sprint_number = 10
+    with pytest.raises(TypeError):
+        settings.deadlines[2] = "y"
+
+
+def test_config_sections_are_snapshot_attributes():
+    """Тест: секции конфига доступны как обычные атрибуты экземпляра"""
+    config = Config("tgbot")
+    assert config._config is None  # YAML читается лениво
+
+    features = config.features
+    assert features is config.settings.features
+    assert config.__dict__['features'] is features
+    assert features.max_sprint_number == config.get('features.max_sprint_number')
+
+
+def test_config_update_rebuilds_snapshot():
+    """Тест изменения значения в памяти"""
+    config = Config("tgbot")
+    enabled = config.features.enable_reviews
+
+    config.update('features.enable_reviews', not enabled)
+
+    assert config.features.enable_reviews is (not enabled)
+    assert config.get('features.enable_reviews') is (not enabled)
+
+
+def make_config(tmp_path, features: str) -> Config:
+    """Конфиг из временного каталога с одним файлом tgbot.yaml"""
+    (tmp_path / "tgbot.yaml").write_text(f"features:\n{features}", encoding="utf-8")
+    config = Config("tgbot")
+    config.config_dir = tmp_path
+    return config
+
+
+def test_config_reload(tmp_path):
+    """Тест перезагрузки: подмена снимка, diff и вызов подписчиков"""
+    config = make_config(tmp_path, "  enable_reviews: false\n  max_sprint_number: 6\n")
+    old_features = config.features
+    received = []
+    config.on_reload(received.append)
+
+    assert config.reload() == {}
+
+    (tmp_path / "tgbot.yaml").write_text("features:\n  enable_reviews: true\n  max_sprint_number: 6\n")
+    changes = config.reload()
+
+    assert changes == {'features.enable_reviews': (False, True)}
+    assert received == [changes]
+    assert config.features.enable_reviews is True
+    assert old_features.enable_reviews is False  # старый снимок не меняется
+
+
+def test_config_reload_publishes_sections_at_once(tmp_path):
+    """Тест: все секции подменяются одним словарём атрибутов, удалённые секции исчезают"""
+    config = make_config(tmp_path, "  max_sprint_number: 6\nlimits:\n  max_sprint_number: 6\n")
+    config.features  # noqa: B018
+    old_state = config.__dict__
+
+    (tmp_path / "tgbot.yaml").write_text("features:\n  max_sprint_number: 8\n")
+    config.reload()
+
+    assert config.__dict__ is not old_state
+    assert old_state['features'].max_sprint_number == old_state['limits'].max_sprint_number == 6
+    assert config.features.max_sprint_number == 8
+    assert 'limits' not in config.__dict__
+    assert config.config_dir == tmp_path
+
+
+def test_config_watcher(tmp_path):
+    """Тест: наблюдатель перезагружает конфиг при изменении файла и не падает на ошибке YAML"""
+    config = make_config(tmp_path, "  max_sprint_number: 6\n")
+    watcher = ConfigWatcher(config, interval=0)
+    assert watcher.check() is None
+
+    path = tmp_path / "tgbot.yaml"
+    path.write_text("features:\n  max_sprint_number: 8\n")
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+    assert watcher.check() == {'features.max_sprint_number': (6, 8)}
+    assert config.features.max_sprint_number == 8
+
+    path.write_text("features: [broken\n")
+    assert watcher.check(force=True) is None
+    assert config.features.max_sprint_number == 8
+
+
+def test_keyboards_rebuilt_after_reload():
+    """Тест: закэшированные клавиатуры сбрасываются при изменении конфига"""
+    from bot.keyboards import inline
+    from config import config
+
+    max_sprint = config.features.max_sprint_number
+    keyboard = inline.get_sprints_inline_keyboard()
+    assert inline.get_sprints_inline_keyboard() is keyboard
+
+    try:
+        config.update('features.max_sprint_number', max_sprint + 3)
+        rebuilt = inline.get_sprints_inline_keyboard()
+        assert rebuilt is not keyboard
+        buttons = [button for row in rebuilt.keyboard for button in row]
+        assert buttons[-2].text == f"Спринт №{max_sprint + 3}"
+    finally:
+        config.update('features.max_sprint_number', max_sprint)
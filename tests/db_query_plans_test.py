@@ -0,0 +1,395 @@
+"""
+Регрессионные тесты планов запросов bot/db.py и web/db.py
+
+Каждая функция модулей выполняется на засеянной тестовой базе, её запросы
+перехватываются и объясняются: EXPLAIN FORMAT=JSON в MySQL, EXPLAIN QUERY
+PLAN в SQLite. План сводится к списку таблиц с типом доступа, индексом и
+оценкой строк и сравнивается с эталоном tests/query_plans/<драйвер>.json.
+Ошибка - более медленный тип доступа (например, ref -> ALL), пропавший
+индекс, рост оценки строк больше чем вдвое или изменение формы плана.
+
+Эталон записывается заново (после осознанного изменения запроса или схемы):
+    QUERY_PLANS_UPDATE=1 PYTHONPATH=src pytest tests/db_query_plans_test.py
+Без файла эталона для текущего драйвера сравнение планов пропускается.
+"""
+
+import inspect
+import itertools
+import json
+import os
+import re
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import myconn
+from bot import db, roster
+from web import db as web_db
+
+BASELINE_DIR = Path(__file__).parent / "query_plans"
+UPDATE = os.environ.get('QUERY_PLANS_UPDATE') == '1'
+
+# Синтетические данные теста (диапазон tg_id и коды приглашения не пересекаются с другими тестами)
+TG_ID_BASE = 7_300_000_000
+INVITE_PREFIX = "P"
+TEAMS = 20
+TEAM_SIZE = 5
+SPRINTS = 3
+
+# Типы доступа MySQL от лучшего к худшему
+ACCESS_TYPES = (
+    "system", "const", "eq_ref", "ref", "fulltext", "ref_or_null", "unique_subquery", "index_subquery",
+    "range", "index_merge", "index", "ALL",
+)
+# Объясняются только запросы с планом (у INSERT ... VALUES его нет)
+EXPLAINED = ("SELECT", "UPDATE", "DELETE")
+
+SQLITE_STEP = re.compile(
+    r"^(?P<op>SCAN|SEARCH) (?P<table>\S+)"
+    r"(?: USING (?:(?:COVERING )?INDEX (?P<index>\S+)|(?P<primary>INTEGER PRIMARY KEY|PRIMARY KEY)))?",
+)
+
+
+# Вызов каждой функции на засеянных данных. Функции записи выполняются парами
+# (добавить/удалить), чтобы не менять данные для остальных случаев.
+CASES = {
+    'bot.student_get_by_tg_id': lambda d: db.student_get_by_tg_id(d.tg_id),
+    'bot.student_get_by_id': lambda d: db.student_get_by_id(d.student_id),
+    'bot.student_create': lambda d: db.student_create(TG_ID_BASE + 9_000, "План Новый", "ГР-99"),
+    'bot.student_get_teammates': lambda d: db.student_get_teammates(d.student_id),
+    'bot.student_get_teammates_not_rated': lambda d: db.student_get_teammates_not_rated(d.student_id),
+    'bot.team_create': lambda d: db.team_create("План", "План", f"{INVITE_PREFIX}9999999", d.spare_id),
+    'bot.team_get_by_invite_code': lambda d: db.team_get_by_invite_code(d.invite_code),
+    'bot.team_add_member': lambda d: (
+        db.team_add_member(d.team_id, d.spare_id, "Разработчик"), db.team_remove_member(d.team_id, d.spare_id),
+    ),
+    'bot.team_remove_member': lambda d: (
+        db.team_add_member(d.team_id, d.spare_id, "Разработчик"), db.team_remove_member(d.team_id, d.spare_id),
+    ),
+    'bot.team_get_all_members': lambda d: db.team_get_all_members(d.team_id),
+    'bot.report_create_or_update': lambda d: (
+        db.report_create_or_update(d.spare_id, 1, "Новый"),
+        db.report_create_or_update(d.spare_id, 1, "Исправленный"),
+        db.report_delete(d.spare_id, 1),
+    ),
+    'bot.report_get_by_student': lambda d: db.report_get_by_student(d.student_id),
+    'bot.report_get_with_text_by_student': lambda d: db.report_get_with_text_by_student(d.student_id),
+    'bot.report_get_text': lambda d: db.report_get_text(d.student_id, 1),
+    'bot.report_get_missing_submitters': lambda d: db.report_get_missing_submitters(SPRINTS),
+    'bot.report_delete': lambda d: (
+        db.report_create_or_update(d.spare_id, 1, "Новый"), db.report_delete(d.spare_id, 1),
+    ),
+    'bot.rating_create': lambda d: db.rating_create(d.spare_id, d.student_id, 7, "Плюсы", "Минусы"),
+    'bot.rating_get_who_rated_me': lambda d: db.rating_get_who_rated_me(d.student_id),
+    'bot.rating_get_stats': lambda d: db.rating_get_stats(d.student_id),
+    'bot.team_get_member_stats': lambda d: db.team_get_member_stats(d.team_id),
+    'bot.rating_get_given_by_student': lambda d: db.rating_get_given_by_student(d.student_id),
+    'web.get_teams_with_members': lambda d: web_db.get_teams_with_members(),
+    'web.get_team_by_id': lambda d: web_db.get_team_by_id(d.team_id),
+    'web.get_teams_count': lambda d: web_db.get_teams_count(),
+    'web.get_total_students_count': lambda d: web_db.get_total_students_count(),
+    'web.get_all_reports': lambda d: (
+        web_db.get_all_reports(), web_db.get_all_reports("Команда", SPRINTS, "Студент"),
+    ),
+    'web.get_reports_statistics': lambda d: web_db.get_reports_statistics(),
+    'web.get_teams_list': lambda d: web_db.get_teams_list(),
+    'web.get_teams_page': lambda d: web_db.get_teams_page(['team_name', 'members_count'], after=(d.team_id,)),
+    'web.get_members_by_teams': lambda d: web_db.get_members_by_teams([d.team_id]),
+    'web.get_reports_page': lambda d: (
+        web_db.get_reports_page(list(web_db.REPORT_API_FIELDS), limit=10),
+        web_db.get_reports_page(['report_length'], after=d.report_key, team_id=d.team_id, sprint_num=1),
+    ),
+}
+
+
+# Удаление синтетических данных теста, параметры - диапазон tg_id
+CLEANUP_QUERIES = (
+    "DELETE FROM team_members_ratings WHERE assessor_student_id IN "
+    "(SELECT student_id FROM students WHERE tg_id BETWEEN %s AND %s)",
+    "DELETE FROM team_members_ratings WHERE assessored_student_id IN "
+    "(SELECT student_id FROM students WHERE tg_id BETWEEN %s AND %s)",
+    "DELETE FROM sprint_reports WHERE student_id IN (SELECT student_id FROM students WHERE tg_id BETWEEN %s AND %s)",
+    "DELETE FROM team_members WHERE student_id IN (SELECT student_id FROM students WHERE tg_id BETWEEN %s AND %s)",
+    "DELETE FROM teams WHERE admin_student_id IN (SELECT student_id FROM students WHERE tg_id BETWEEN %s AND %s)",
+    "DELETE FROM students WHERE tg_id BETWEEN %s AND %s",
+)
+
+
+def cleanup():
+    """Удаление синтетических данных теста"""
+    for query in CLEANUP_QUERIES:
+        myconn.insert_update(query, (TG_ID_BASE, TG_ID_BASE + 9_999))
+
+
+def seed() -> SimpleNamespace:
+    """Команды с участниками, отчёты за спринты и оценки половины участников"""
+    count = TEAMS * TEAM_SIZE
+    # Последний студент - запасной, не состоит в команде
+    myconn.insert_many(
+        "INSERT INTO students (tg_id, name, group_num) VALUES (%s, %s, %s)",
+        [(TG_ID_BASE + i, f"Студент План {i:03d}", f"ГР-{i % 10:02d}") for i in range(count + 1)],
+    )
+    rows = myconn.select_all(
+        "SELECT student_id FROM students WHERE tg_id BETWEEN %s AND %s ORDER BY tg_id",
+        (TG_ID_BASE, TG_ID_BASE + count), use_dict=False,
+    )
+    student_ids = [row[0] for row in rows]
+    members = [student_ids[i * TEAM_SIZE:(i + 1) * TEAM_SIZE] for i in range(TEAMS)]
+
+    myconn.insert_many(
+        "INSERT INTO teams (team_name, product_name, invite_code, admin_student_id) VALUES (%s, %s, %s, %s)",
+        [(f"Команда План {i:02d}", "Продукт", f"{INVITE_PREFIX}{i:07d}", team[0]) for i, team in enumerate(members)],
+    )
+    rows = myconn.select_all(
+        "SELECT team_id FROM teams WHERE invite_code LIKE %s ORDER BY invite_code", (f"{INVITE_PREFIX}0%",),
+        use_dict=False,
+    )
+    team_ids = [row[0] for row in rows]
+
+    myconn.insert_many(
+        "INSERT INTO team_members (team_id, student_id, role) VALUES (%s, %s, %s)",
+        [
+            (team_id, student_id, "Разработчик")
+            for team_id, team in zip(team_ids, members, strict=True) for student_id in team
+        ],
+    )
+    reports = [
+        (student_id, sprint, f"Отчёт за спринт {sprint}")
+        for student_id in student_ids[:-1] for sprint in range(1, SPRINTS + 1)
+    ]
+    myconn.insert_many(
+        "INSERT INTO sprint_reports (student_id, sprint_num, report_date, report_length) VALUES (%s, %s, NOW(), %s)",
+        [(student_id, sprint, len(text)) for student_id, sprint, text in reports],
+    )
+    myconn.insert_many(
+        "INSERT INTO sprint_report_bodies (student_id, sprint_num, report_text) VALUES (%s, %s, %s)", reports,
+    )
+    myconn.insert_many(
+        "INSERT INTO team_members_ratings "
+        "(assessor_student_id, assessored_student_id, overall_rating, advantages, disadvantages, rate_date) "
+        "VALUES (%s, %s, %s, %s, %s, NOW())",
+        [
+            (assessor, assessored, 8, "Плюсы", "Минусы")
+            for team in members
+            for assessor in team[:TEAM_SIZE // 2 + 1]
+            for assessored in team if assessor != assessored
+        ],
+    )
+
+    # Статистика для оптимизатора, иначе план зависит от истории таблиц
+    if myconn.get_driver().name == "sqlite":
+        myconn.insert_update("ANALYZE")
+    else:
+        myconn.select_all(
+            "ANALYZE TABLE students, teams, team_members, sprint_reports, sprint_report_bodies, team_members_ratings",
+        )
+
+    team = members[TEAMS // 2]
+    report = web_db.get_reports_page(['report_length'], limit=1)[0]
+    return SimpleNamespace(
+        student_id=team[1], tg_id=TG_ID_BASE + student_ids.index(team[1]), team_id=team_ids[TEAMS // 2],
+        invite_code=f"{INVITE_PREFIX}{TEAMS // 2:07d}", spare_id=student_ids[-1],
+        report_key=tuple(report[key] for key in web_db.REPORT_API_KEY),
+    )
+
+
+@pytest.fixture(scope="module")
+def data():
+    cleanup()
+    yield seed()
+    cleanup()
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    path = BASELINE_DIR / f"{myconn.get_driver().name}.json"
+    if not path.exists() and not UPDATE:
+        pytest.skip(f"No query plan baseline {path.name}; record it with QUERY_PLANS_UPDATE=1")
+    plans = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    yield plans
+    if UPDATE:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path.write_text(dump_plans({name: plans[name] for name in CASES if name in plans}), encoding="utf-8")
+
+
+def dump_plans(plans: dict) -> str:
+    """JSON эталона: шаг плана на строку, чтобы изменения были видны в diff"""
+    cases = []
+    for name, statements in plans.items():
+        blocks = [
+            "  [\n" + ",\n".join(f"   {json.dumps(step, ensure_ascii=False)}" for step in steps) + "\n  ]"
+            for steps in statements
+        ]
+        body = "[\n" + ",\n".join(blocks) + "\n ]" if blocks else "[]"
+        cases.append(f" {json.dumps(name)}: {body}")
+    return "{\n" + ",\n".join(cases) + "\n}\n"
+
+
+def capture(call) -> list[tuple[str, object]]:
+    """Запросы, выполненные функцией (каждый текст один раз, с первыми параметрами)"""
+    statements = {}
+    execute = myconn._execute
+
+    def recording(cursor, query, params):
+        statements.setdefault(query, params)
+        return execute(cursor, query, params)
+
+    with patch('myconn._execute', recording):
+        call()
+    return [(query, params) for query, params in statements.items() if query.split(None, 1)[0].upper() in EXPLAINED]
+
+
+def mysql_tables(node, tables: list):
+    """Таблицы из EXPLAIN FORMAT=JSON в порядке обхода (включая подзапросы)"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "table" and isinstance(value, dict) and 'table_name' in value:
+                tables.append({
+                    'table': value['table_name'],
+                    'access_type': value.get('access_type'),
+                    'key': value.get('key'),
+                    'rows': value.get('rows_examined_per_scan'),
+                })
+            mysql_tables(value, tables)
+    elif isinstance(node, list):
+        for item in node:
+            mysql_tables(item, tables)
+    return tables
+
+
+def sqlite_tables(rows) -> list[dict]:
+    """Шаги SCAN/SEARCH из EXPLAIN QUERY PLAN в терминах типов доступа MySQL"""
+    tables = []
+    for row in rows:
+        step = SQLITE_STEP.match(row[3])
+        if not step:
+            continue
+        key = step['index'] or ("PRIMARY" if step['primary'] else None)
+        if step['op'] == "SEARCH":
+            access_type = "ref"
+        else:
+            access_type = "index" if key else "ALL"
+        tables.append({'table': step['table'], 'access_type': access_type, 'key': key, 'rows': None})
+    return tables
+
+
+def explain(query: str, params) -> list[dict]:
+    if myconn.get_driver().name == "sqlite":
+        return sqlite_tables(myconn.select_all(f"EXPLAIN QUERY PLAN {query}", params, use_dict=False))
+    plan = myconn.select_one(f"EXPLAIN FORMAT=JSON {query}", params, use_dict=False)[0]
+    return mysql_tables(json.loads(plan), [])
+
+
+def by_table(plan: list[dict]) -> dict[str, dict]:
+    """Шаги плана по псевдониму таблицы (повторы нумеруются)"""
+    steps = {}
+    for step in plan:
+        name = step['table']
+        number = 2
+        while name in steps:
+            name = f"{step['table']}#{number}"
+            number += 1
+        steps[name] = step
+    return steps
+
+
+def regressions(expected: list[list[dict]], actual: list[list[dict]]) -> list[str]:
+    """Ухудшения плана относительно эталона"""
+    if len(expected) != len(actual):
+        return [f"{len(actual)} statements instead of {len(expected)}"]
+
+    problems = []
+    for number, (expected_plan, actual_plan) in enumerate(zip(expected, actual, strict=True)):
+        expected_steps, actual_steps = by_table(expected_plan), by_table(actual_plan)
+        if expected_steps.keys() != actual_steps.keys():
+            problems.append(f"statement {number}: tables {list(actual_steps)} instead of {list(expected_steps)}")
+            continue
+        for table, was in expected_steps.items():
+            now = actual_steps[table]
+            where = f"statement {number}, {table}"
+            if ACCESS_TYPES.index(now['access_type']) > ACCESS_TYPES.index(was['access_type']):
+                problems.append(f"{where}: access {was['access_type']} -> {now['access_type']}")
+            if was['key'] and not now['key']:
+                problems.append(f"{where}: index {was['key']} is no longer used")
+            estimated = was['rows'] is not None and now['rows'] is not None
+            if estimated and now['rows'] > max(2 * was['rows'], was['rows'] + 10):
+                problems.append(f"{where}: estimated rows {was['rows']} -> {now['rows']}")
+    return problems
+
+
+def test_every_db_function_has_a_case():
+    """Тест: у каждой функции bot/db.py и web/db.py есть случай в CASES"""
+    functions = {
+        f"{prefix}.{name}"
+        for prefix, module in (('bot', db), ('web', web_db))
+        for name, function in inspect.getmembers(module, inspect.isfunction)
+        if function.__module__ == module.__name__ and not name.startswith('_')
+    }
+    assert functions == set(CASES)
+
+
+@pytest.mark.database
+@pytest.mark.parametrize('case', list(CASES))
+def test_query_plan_has_not_regressed(case, baseline, data):
+    """Тест: план запросов функции не хуже эталона"""
+    # Запросы функций на составах команд выполняются только без кэша
+    roster.cache.clear()
+    plans = list(itertools.starmap(explain, capture(lambda: CASES[case](data))))
+    if UPDATE:
+        baseline[case] = plans
+        return
+
+    assert case in baseline, f"No baseline plan for {case}; record it with QUERY_PLANS_UPDATE=1"
+    problems = regressions(baseline[case], plans)
+    assert not problems, f"{case} query plan regressed:\n" + "\n".join(problems)
+
+
+def test_regressions_detects_worse_plans():
+    """Тест сравнения планов без базы данных"""
+    was = [[{'table': "tm", 'access_type': "ref", 'key': "PRIMARY", 'rows': 5}]]
+
+    assert regressions(was, was) == []
+    assert regressions(was, [[{'table': "tm", 'access_type': "ALL", 'key': None, 'rows': 5}]]) == [
+        "statement 0, tm: access ref -> ALL", "statement 0, tm: index PRIMARY is no longer used",
+    ]
+    assert regressions(was, [[{'table': "tm", 'access_type': "ref", 'key': "PRIMARY", 'rows': 500}]]) == [
+        "statement 0, tm: estimated rows 5 -> 500",
+    ]
+    assert regressions(was, [[{'table': "s", 'access_type': "const", 'key': "PRIMARY", 'rows': 1}]])
+    assert regressions(was, []) == ["0 statements instead of 1"]
+
+
+def test_mysql_tables_from_explain_json():
+    """Тест разбора EXPLAIN FORMAT=JSON MySQL 8: соединение таблиц и зависимый подзапрос"""
+    plan = {
+        "query_block": {
+            "select_id": 1,
+            "cost_info": {"query_cost": "2.10"},
+            "nested_loop": [
+                {"table": {
+                    "table_name": "tm", "access_type": "ref", "possible_keys": ["PRIMARY", "idx_student"],
+                    "key": "idx_student", "used_key_parts": ["student_id"], "ref": ["const"],
+                    "rows_examined_per_scan": 1, "rows_produced_per_join": 1, "filtered": "100.00",
+                }},
+                {"table": {
+                    "table_name": "t", "access_type": "eq_ref", "possible_keys": ["PRIMARY"], "key": "PRIMARY",
+                    "rows_examined_per_scan": 1, "filtered": "100.00",
+                    "attached_subqueries": [{
+                        "dependent": True, "cacheable": False,
+                        "query_block": {"select_id": 2, "table": {
+                            "table_name": "sr", "access_type": "ALL", "rows_examined_per_scan": 120,
+                            "filtered": "10.00", "attached_condition": "(`sr`.`student_id` = `tm`.`student_id`)",
+                        }},
+                    }],
+                }},
+            ],
+        },
+    }
+
+    assert mysql_tables(json.loads(json.dumps(plan)), []) == [
+        {'table': "tm", 'access_type': "ref", 'key': "idx_student", 'rows': 1},
+        {'table': "t", 'access_type': "eq_ref", 'key': "PRIMARY", 'rows': 1},
+        {'table': "sr", 'access_type': "ALL", 'key': None, 'rows': 120},
+    ]
@@ -0,0 +1,181 @@
+"""
+Тесты для драйверов базы данных из dbdriver.py
+"""
+
+import datetime
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import myconn
+from dbdriver import (
+    DRIVERS,
+    ER_DUP_ENTRY,
+    MySQLClientDriver,
+    PyMySQLDriver,
+    SQLiteDriver,
+    get_driver,
+    translate_to_sqlite,
+)
+
+
+class FakeError(Exception):
+    pass
+
+
+class FakeIntegrityError(FakeError):
+    pass
+
+
+def fake_module():
+    """DB-API модуль с курсорами PyMySQL/MySQLdb"""
+    cursors = SimpleNamespace(
+        Cursor="Cursor", DictCursor="DictCursor", SSCursor="SSCursor", SSDictCursor="SSDictCursor",
+    )
+    return SimpleNamespace(
+        Error=FakeError, IntegrityError=FakeIntegrityError, cursors=cursors, connect=MagicMock(),
+    )
+
+
+def test_get_driver_unknown_and_missing():
+    """Тест ошибок выбора драйвера"""
+    with pytest.raises(ValueError, match="Unknown database driver 'oracle'"):
+        get_driver("oracle")
+    with patch.dict(sys.modules, {'pymysql': None}), pytest.raises(ImportError):
+        DRIVERS['pymysql']()
+
+
+def test_default_driver_is_mysql_connector(monkeypatch):
+    """Тест: по умолчанию используется mysql.connector"""
+    monkeypatch.delenv('STUDTEAMS_DB_DRIVER', raising=False)
+    assert myconn.get_driver().name == "mysql-connector"
+    assert myconn.get_driver().supports_prepared
+
+
+def test_pymysql_cursors_and_errors():
+    """Тест: виды курсоров и коды ошибок PyMySQL"""
+    with patch.dict(sys.modules, {'pymysql': fake_module()}):
+        driver = PyMySQLDriver()
+    connection = MagicMock()
+
+    driver.cursor(connection, dictionary=True)
+    connection.cursor.assert_called_with("DictCursor")
+    driver.cursor(connection, streaming=True)
+    connection.cursor.assert_called_with("SSCursor")
+
+    error = FakeIntegrityError(ER_DUP_ENTRY, "Duplicate entry 'AB' for key 'teams.uk_teams_invite_code'")
+    with patch('myconn.get_driver', return_value=driver):
+        assert myconn.is_duplicate_key(error, 'uk_teams_invite_code')
+        assert not myconn.is_duplicate_key(FakeIntegrityError(1452, "foreign key"))
+
+
+def test_mysqlclient_collation_via_init_command():
+    """Тест: mysqlclient получает collation командой при подключении"""
+    module = fake_module()
+    with patch.dict(sys.modules, {'MySQLdb': module, 'MySQLdb.cursors': module.cursors}):
+        MySQLClientDriver().connect({'host': "db", 'charset': "utf8mb4", 'collation': "utf8mb4_unicode_ci"})
+
+    module.connect.assert_called_once_with(
+        host="db", charset="utf8mb4", init_command="SET collation_connection = 'utf8mb4_unicode_ci'",
+    )
+
+
+def sqlite_connection(tmp_path):
+    driver = SQLiteDriver()
+    db_cfg = SimpleNamespace(database="studteams_test", sqlite_path=str(tmp_path / "db.sqlite3"), autocommit=True)
+    return driver, driver.connect(driver.credentials(db_cfg))
+
+
+def test_sqlite_translates_mysql_dialect():
+    """Тест перевода запросов MySQL на диалект SQLite"""
+    query = translate_to_sqlite(
+        "INSERT INTO t (a, d) VALUES (%s, NOW()) ON DUPLICATE KEY UPDATE a = %s, n = LENGTH(a), c = CHAR_LENGTH(a)",
+    )
+    assert query == (
+        "INSERT INTO t (a, d) VALUES (?, datetime('now', 'localtime')) "
+        "ON CONFLICT DO UPDATE SET a = ?, n = OCTET_LENGTH(a), c = LENGTH(a)"
+    )
+
+
+def test_sqlite_schema_and_pragmas(tmp_path):
+    """Тест: пустая база создаётся по dbschema/sqlite.sql в режиме WAL"""
+    driver, connection = sqlite_connection(tmp_path)
+
+    tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'students', 'teams', 'team_members', 'sprint_reports', 'team_members_ratings'} <= tables
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert driver.is_connected(connection)
+
+    connection.close()
+    assert not driver.is_connected(connection)
+
+
+def test_sqlite_cursor_contract(tmp_path):
+    """Тест: словари, datetime, lastrowid и длина в байтах, как у MySQL"""
+    driver, connection = sqlite_connection(tmp_path)
+    cursor = driver.cursor(connection, dictionary=True)
+
+    cursor.execute("INSERT INTO students (tg_id, name, group_num) VALUES (%s, %s, %s)", (1, "Иван", "Г1"))
+    student_id = cursor.lastrowid
+    assert student_id
+    cursor.execute(
+        "INSERT INTO sprint_reports (student_id, sprint_num, report_date) VALUES (%s, 1, NOW())", (student_id,),
+    )
+    cursor.execute(
+        "INSERT INTO sprint_report_bodies (student_id, sprint_num, report_text) VALUES (%s, 1, %s)",
+        (student_id, "Отчёт"),
+    )
+    cursor.execute("UPDATE students SET name = %s WHERE student_id = %s", ("Иван Иванов", student_id))
+    assert cursor.lastrowid == 0
+
+    cursor.execute(
+        "SELECT s.name, sr.report_date, LENGTH(b.report_text) AS report_length "
+        "FROM sprint_reports sr JOIN students s ON s.student_id = sr.student_id "
+        "JOIN sprint_report_bodies b ON b.student_id = sr.student_id AND b.sprint_num = sr.sprint_num "
+        "WHERE s.name LIKE %s",
+        ("%иванов%",),
+    )
+    row = cursor.fetchone()
+    assert row['name'] == "Иван Иванов"
+    assert isinstance(row['report_date'], datetime.datetime)
+    assert row['report_length'] == len("Отчёт".encode())
+
+    tuple_cursor = driver.cursor(connection)
+    tuple_cursor.execute("SELECT %s LIKE %s ESCAPE %s", ("a_b", "A!_B", "!"))
+    assert tuple_cursor.fetchone() == (1,)
+
+    # Текст отчёта удаляется вместе с метаданными
+    cursor.execute("DELETE FROM sprint_reports WHERE student_id = %s", (student_id,))
+    tuple_cursor.execute("SELECT COUNT(*) FROM sprint_report_bodies")
+    assert tuple_cursor.fetchone() == (0,)
+
+
+def test_sqlite_upsert_and_duplicate_key(tmp_path):
+    """Тест ON DUPLICATE KEY UPDATE и распознавания нарушения уникального ключа"""
+    driver, connection = sqlite_connection(tmp_path)
+    cursor = driver.cursor(connection)
+    cursor.execute("INSERT INTO students (tg_id, name) VALUES (1, 'Админ')")
+    admin_id = cursor.lastrowid
+    create_team = (
+        "INSERT INTO teams (team_name, product_name, admin_student_id, invite_code) VALUES (%s, 'P', %s, 'INV1')"
+    )
+    cursor.execute(create_team, ("A", admin_id))
+    team_id = cursor.lastrowid
+
+    for role in ("Разработчик", "Тестировщик"):
+        cursor.execute(
+            "INSERT INTO team_members (team_id, student_id, role) VALUES (%s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE role = %s",
+            (team_id, admin_id, role, role),
+        )
+    cursor.execute("SELECT role FROM team_members")
+    assert cursor.fetchall() == [("Тестировщик",)]
+
+    with pytest.raises(driver.IntegrityError) as error:
+        cursor.execute(create_team, ("B", admin_id))
+    with patch('myconn.get_driver', return_value=driver):
+        assert myconn.is_duplicate_key(error.value, 'uk_teams_invite_code')
+        assert not myconn.is_duplicate_key(error.value, 'PRIMARY')
@@ -0,0 +1,30 @@
+"""
+Тесты пакетной вставки myconn.insert_many без базы данных
+"""
+
+from unittest.mock import MagicMock, patch
+
+import myconn
+
+QUERY = "INSERT INTO students (tg_id, name) VALUES (%s, %s)"
+
+
+def test_insert_many_splits_rows_into_batches():
+    """Тест: строки из генератора отправляются пачками executemany"""
+    cursors = MagicMock()
+    rows = ((i, f"Студент {i}") for i in range(5))
+
+    with patch('myconn.cursors', cursors):
+        assert myconn.insert_many(QUERY, rows, batch_size=2) == 5
+
+    batches = [call.args[1] for call in cursors.cur.executemany.call_args_list]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0] == [(0, "Студент 0"), (1, "Студент 1")]
+
+
+def test_insert_many_without_rows():
+    """Тест: пустой набор строк не выполняет запросов"""
+    cursors = MagicMock()
+    with patch('myconn.cursors', cursors):
+        assert myconn.insert_many(QUERY, []) == 0
+    cursors.cur.executemany.assert_not_called()
@@ -0,0 +1,81 @@
+"""
+Тесты LRU подготовленных запросов myconn.PreparedStatements без базы данных
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import myconn
+from myconn import PreparedStatements
+
+
+@pytest.fixture(autouse=True)
+def mysql_driver(monkeypatch):
+    """Тесты подменяют объекты mysql.connector: драйвер не зависит от STUDTEAMS_DB_DRIVER"""
+    monkeypatch.setenv('STUDTEAMS_DB_DRIVER', "mysql-connector")
+
+
+def make_connection():
+    connection = MagicMock()
+    connection.cursor.side_effect = lambda **kwargs: MagicMock(options=kwargs)
+    return connection
+
+
+def test_statement_reused_by_sql_text():
+    """Тест: один курсор на текст запроса, execute получает сохранённую строку"""
+    statements = PreparedStatements(make_connection(), size=4)
+    query = "SELECT name FROM students WHERE tg_id = %s"
+
+    saved_query, cursor = statements.get(query, True)
+    # Равная строка, но другой объект (как при сборке запроса во время выполнения)
+    same_text = "".join(["SELECT name FROM students ", "WHERE tg_id = %s"])
+    assert statements.get(same_text, True) == (saved_query, cursor)
+    assert saved_query is query
+    assert cursor.options == {'prepared': True, 'dictionary': True, 'buffered': None}
+    assert (statements.hits, statements.misses) == (1, 1)
+
+    # Для кортежей - отдельный курсор
+    assert statements.get(query, False)[1] is not cursor
+
+
+def test_lru_eviction_closes_statement():
+    """Тест: вытесняется давно не использованный запрос, его курсор закрывается"""
+    statements = PreparedStatements(make_connection(), size=2)
+    _, first = statements.get("SELECT 1", True)
+    _, second = statements.get("SELECT 2", True)
+    statements.get("SELECT 1", True)
+    statements.get("SELECT 3", True)
+
+    second.close.assert_called_once()
+    first.close.assert_not_called()
+    assert statements.get("SELECT 1", True)[1] is first
+
+
+def test_select_one_prepared_recreated_on_reconnect():
+    """Тест: после переподключения подготовленные запросы создаются на новом соединении"""
+    old, new = make_connection(), make_connection()
+    with patch('myconn.get_connection', side_effect=[old, old, new]), patch.object(myconn, 'prepared_statements', None):
+        myconn.select_one("SELECT 1 FROM dual WHERE 1 = %s", (1,), prepared=True)
+        myconn.select_one("SELECT 1 FROM dual WHERE 1 = %s", (1,), prepared=True)
+        myconn.select_one("SELECT 1 FROM dual WHERE 1 = %s", (1,), prepared=True)
+
+        assert old.cursor.call_count == 1
+        assert new.cursor.call_count == 1
+        assert myconn.prepared_statements.connection is new
+
+
+def test_select_all_prepared_records():
+    """Тест: select_all(prepared=True, records=True) возвращает записи Record"""
+    connection = make_connection()
+    cursor = MagicMock(description=[("tg_id",), ("name",)])
+    cursor.fetchall.return_value = [(1, "Иван")]
+    connection.cursor.side_effect = None
+    connection.cursor.return_value = cursor
+
+    with patch('myconn.get_connection', return_value=connection), patch.object(myconn, 'prepared_statements', None):
+        rows = myconn.select_all("SELECT tg_id, name FROM students", prepared=True, records=True)
+
+    assert connection.cursor.call_args.kwargs['dictionary'] is False
+    assert rows[0].name == "Иван"
+    assert dict(rows[0]) == {'tg_id': 1, 'name': "Иван"}
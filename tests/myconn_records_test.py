@@ -0,0 +1,53 @@
+"""
+Тесты компактных записей myconn.Record без базы данных
+"""
+
+# Записи проверяются на pickle собственных объектов теста (как в общем кэше)
+import pickle  # noqa: S403
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import jinja2
+import pytest
+
+import myconn
+from myconn import record_class
+
+
+def test_record_is_dict_and_attribute_compatible():
+    """Тест: запись читается как словарь и как объект"""
+    row = record_class(('team_name', 'sprint_num'))("Alpha", 2)
+
+    assert row['team_name'] == row.team_name == "Alpha"
+    assert row.get('sprint_num') == 2
+    assert row.get('missing', 0) == 0
+    assert 'team_name' in row
+    assert 'missing' not in row
+    assert dict(row) == {'team_name': "Alpha", 'sprint_num': 2}
+    assert row == {'team_name': "Alpha", 'sprint_num': 2}
+    assert not hasattr(row, '__dict__')
+    with pytest.raises(KeyError):
+        row['missing']
+
+    template = jinja2.Template("{{ row.team_name }}/{{ row['sprint_num'] }}")
+    assert template.render(row=row) == "Alpha/2"
+
+
+def test_record_class_is_shared_and_picklable():
+    """Тест: один класс на набор колонок, записи переживают pickle (общий кэш)"""
+    assert record_class(('a', 'b')) is record_class(('a', 'b'))
+    row = record_class(('a', 'b'))(1, [2])
+    restored = pickle.loads(pickle.dumps(row))  # noqa: S301 - данные создаёт сам тест
+    assert type(restored) is type(row)
+    assert restored == row
+
+
+def test_select_all_records():
+    """Тест: select_all(records=True) строит записи из кортежей курсора"""
+    cursor = MagicMock(description=[('student_id', 3), ('name', 253)])
+    cursor.fetchall.return_value = [(1, "Ivan"), (2, "Anna")]
+    with patch.object(myconn, 'cursors', SimpleNamespace(cur=cursor)):
+        rows = myconn.select_all("SELECT student_id, name FROM students", records=True)
+
+    assert [row.name for row in rows] == ["Ivan", "Anna"]
+    assert rows[0] == {'student_id': 1, 'name': "Ivan"}
@@ -0,0 +1,58 @@
+"""
+Тесты потокового чтения myconn.select_iter без базы данных
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import myconn
+
+
+@pytest.fixture(autouse=True)
+def mysql_driver(monkeypatch):
+    """Тесты подменяют объекты mysql.connector: драйвер не зависит от STUDTEAMS_DB_DRIVER"""
+    monkeypatch.setenv('STUDTEAMS_DB_DRIVER', "mysql-connector")
+
+
+def fake_stream_connection(rows):
+    """Соединение, которое отдаёт rows через fetchmany"""
+    connection = MagicMock()
+    batches = iter([rows[i:i + 2] for i in range(0, len(rows), 2)])
+    connection.cursor.return_value.fetchmany.side_effect = lambda size: next(batches, [])
+    return connection
+
+
+def teardown_function():
+    myconn._stream_connections.clear()
+
+
+def test_select_iter_returns_connection_to_pool():
+    """Тест: после полного перебора соединение возвращается в пул и используется повторно"""
+    connection = fake_stream_connection([(1,), (2,), (3,)])
+    with patch.object(myconn.get_driver(), 'connect', return_value=connection) as mock_connect:
+        assert list(myconn.select_iter("SELECT n FROM t", use_dict=False, batch_size=2)) == [(1,), (2,), (3,)]
+        assert myconn._stream_connections == [connection]
+
+        connection.cursor.return_value.fetchmany.side_effect = lambda size: []
+        assert list(myconn.select_iter("SELECT n FROM t")) == []
+
+    mock_connect.assert_called_once()
+    connection.cursor.assert_called_with(dictionary=True, prepared=None, buffered=False)
+    connection.shutdown.assert_not_called()
+
+
+def test_select_iter_cancellation():
+    """Тест: прерванный перебор закрывает соединение, а не возвращает его в пул"""
+    connection = fake_stream_connection([{'n': i} for i in range(10)])
+    with patch.object(myconn.get_driver(), 'connect', return_value=connection):
+        rows = myconn.select_iter("SELECT n FROM t", batch_size=2)
+        for row in rows:
+            if row['n'] == 2:
+                break
+        rows.close()
+
+    connection.shutdown.assert_called_once()
+    # Прочитаны только две пачки из пяти
+    assert connection.cursor.return_value.fetchmany.call_count == 2
+    assert connection not in myconn._stream_connections
@@ -5,9 +5,16 @@
 Тесты безопасны и не изменяют существующие данные.
 """
 
+import pytest
+
 import myconn
 from config import config
 
+# Запросы к information_schema и свойства соединения MySQL
+mysql_only = pytest.mark.skipif(
+    myconn.get_driver().name == "sqlite", reason="MySQL only (STUDTEAMS_DB_DRIVER=sqlite)",
+)
+
 
 def test_config_values_exist():
     """Тест наличия всех необходимых значений конфигурации"""
@@ -57,6 +64,7 @@ def teardown_function():
     myconn.close_connection()
 
 
+@mysql_only
 def test_real_connection_success():
     """Тест реального подключения к MySQL"""
     conn = myconn.get_connection()
@@ -68,6 +76,7 @@ def test_real_connection_success():
     assert conn.database == expected_db
 
 
+@mysql_only
 def test_cursor_usage():
     """Тест использования курсоров"""
     cur = myconn.cursor()
@@ -84,6 +93,7 @@ def test_cursor_usage():
     dict_cur.close()
 
 
+@mysql_only
 def test_database_tables_exist():
     """Тест наличия таблиц из схемы"""
     dict_cur = myconn.dict_cursor()
@@ -101,3 +111,23 @@ def test_database_tables_exist():
         assert table in tables, f"Таблица {table} не найдена"
 
     dict_cur.close()
+
+
+@mysql_only
+def test_select_iter_matches_select_all():
+    """Тест потокового чтения: те же строки, что и select_all, соединение возвращается в пул"""
+    query = "SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS ORDER BY TABLE_NAME, COLUMN_NAME"
+    assert list(myconn.select_iter(query, batch_size=7)) == myconn.select_all(query)
+    assert len(myconn._stream_connections) == 1
+
+
+@mysql_only
+def test_prepared_select_matches_text_protocol():
+    """Тест: подготовленный запрос возвращает то же, что и обычный, и переиспользуется"""
+    query = "SELECT TABLE_NAME, TABLE_TYPE FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s ORDER BY TABLE_NAME"
+    params = (config.database.test.database,)
+
+    assert myconn.select_all(query, params, prepared=True) == myconn.select_all(query, params)
+    assert myconn.select_one(query, params, prepared=True) == myconn.select_one(query, params)
+    myconn.select_all(query, params, prepared=True)
+    assert myconn.prepared_statements.hits == 2
@@ -0,0 +1,109 @@
+"""
+Тесты для общего кэша из sharedcache.py
+"""
+
+import multiprocessing
+import time
+from unittest.mock import Mock
+
+from sharedcache import SharedCache
+
+
+def bump_in_process(path, namespace):
+    """Сброс кэша из другого процесса (как это делает бот)"""
+    SharedCache(path).bump(namespace)
+
+
+def test_cached_calls_loader_once(tmp_path):
+    """Тест: повторный запрос берётся из кэша"""
+    cache = SharedCache(tmp_path / "shared.sqlite3")
+    loader = Mock(return_value=[{'team_id': 1}])
+
+    assert cache.cached('teams', "page", loader) == [{'team_id': 1}]
+    assert cache.cached('teams', "page", loader) == [{'team_id': 1}]
+    loader.assert_called_once()
+
+
+def test_bump_from_other_process_invalidates(tmp_path):
+    """Тест: сброс версии в другом процессе виден всем экземплярам кэша"""
+    path = tmp_path / "shared.sqlite3"
+    worker_a, worker_b = SharedCache(path), SharedCache(path)
+    worker_a.cached('teams', "page", lambda: "old")
+    assert worker_b.cached('teams', "page", lambda: "unused") == "old"
+
+    process = multiprocessing.get_context("spawn").Process(target=bump_in_process, args=(path, 'teams'))
+    process.start()
+    process.join(timeout=30)
+    assert process.exitcode == 0
+
+    assert worker_a.version('teams') == 1
+    assert worker_b.cached('teams', "page", lambda: "new") == "new"
+    assert worker_a.cached('teams', "page", lambda: "unused") == "new"
+
+
+def test_bump_keeps_other_namespaces(tmp_path):
+    """Тест: сброс одного пространства имён не затрагивает другие"""
+    cache = SharedCache(tmp_path / "shared.sqlite3")
+    cache.cached('reports', "page", lambda: "reports")
+    cache.bump('teams')
+    assert cache.cached('reports', "page", lambda: "reloaded") == "reports"
+
+
+def test_expired_entries(tmp_path):
+    """Тест: просроченная запись загружается заново и удаляется purge_expired"""
+    cache = SharedCache(tmp_path / "shared.sqlite3", ttl=0.01)
+    cache.cached('teams', "page", lambda: "old")
+    time.sleep(0.02)
+    assert cache.cached('teams', "page", lambda: "new", ttl=60) == "new"
+    assert cache.purge_expired() == 0
+
+    cache.set("stale", "value", ttl=-1)
+    assert cache.purge_expired() == 1
+
+
+def test_bump_removes_old_entries(tmp_path):
+    """Тест: bump() удаляет записи сброшенного пространства имён"""
+    cache = SharedCache(tmp_path / "shared.sqlite3")
+    cache.cached('teams', "page", lambda: "teams")
+    cache.cached('reports', "page", lambda: "reports")
+    cache.bump('teams')
+
+    keys = [row[0] for row in cache._connection().execute("SELECT key FROM entries")]
+    assert keys == ["reports:0:page"]
+
+
+def test_set_purges_expired(tmp_path):
+    """Тест: запись в кэш периодически удаляет просроченные записи"""
+    cache = SharedCache(tmp_path / "shared.sqlite3")
+    cache.set("stale", "value", ttl=-1)
+    cache.set("fresh", "value")
+    assert cache.get("fresh") == (True, "value")
+    assert cache.purge_expired() == 1
+
+    cache.set("stale", "value", ttl=-1)
+    cache._purge_at = 0
+    cache.set("fresh", "value")
+    assert cache.purge_expired() == 0
+
+
+def test_broken_file_falls_back_to_loader(tmp_path):
+    """Тест: при повреждённом файле кэша данные загружаются напрямую"""
+    path = tmp_path / "shared.sqlite3"
+    path.write_bytes(b"not a database" * 100)
+    cache = SharedCache(path)
+
+    assert cache.cached('teams', "page", lambda: "from db") == "from db"
+    cache.bump('teams')
+
+
+def test_disabled(tmp_path):
+    """Тест: выключенный кэш не создаёт файл"""
+    path = tmp_path / "shared.sqlite3"
+    cache = SharedCache(path, enabled=False)
+    loader = Mock(return_value="data")
+
+    cache.cached('teams', "page", loader)
+    cache.cached('teams', "page", loader)
+    cache.bump('teams')
+    assert loader.call_count == 2
+    assert not path.exists()
@@ -0,0 +1,53 @@
+"""
+Тесты для профилировщика запуска из startup.py
+"""
+
+import pytest
+
+from startup import StartupTimer, format_report, parse_importtime, profile
+
+# Бюджет холодного старта, секунд: фазы запуска и весь процесс вместе с импортами
+STARTUP_BUDGET = {
+    'bot': {'phases': 1.0, 'wall': 3.0},
+    'web': {'phases': 1.0, 'wall': 4.0},
+}
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      5000 |       9000 | telebot
+some other stderr line
+"""
+
+
+def test_parse_importtime():
+    """Тест разбора вывода python -X importtime"""
+    imports = parse_importtime(IMPORTTIME_OUTPUT)
+    assert [(item.module, item.self_us, item.cumulative_us) for item in imports] == [
+        ("_io", 120, 120),
+        ("telebot", 5000, 9000),
+    ]
+
+
+def test_startup_timer():
+    """Тест замера фаз"""
+    timer = StartupTimer()
+    with timer.phase("config"):
+        pass
+    with pytest.raises(ValueError, match="no database"), timer.phase("db connect"):
+        raise ValueError("no database")
+
+    assert list(timer.phases) == ["config", "db connect"]
+    assert "config" in timer.summary()
+    assert "total" in timer.summary()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('entry_point', list(STARTUP_BUDGET))
+def test_startup_budget(entry_point):
+    """Тест: холодный старт точки входа укладывается в бюджет"""
+    startup = profile(entry_point)
+    budget = STARTUP_BUDGET[entry_point]
+
+    report = format_report(entry_point, startup)
+    assert startup.phases['total'] < budget['phases'], report
+    assert startup.wall < budget['wall'], report
@@ -0,0 +1,142 @@
+"""
+Тесты для JSON API из web/api.py
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from web.api import decode_cursor, encode_cursor, parse_fields
+from web.app import app, reports
+from web.db import REPORT_API_FIELDS, REPORT_API_KEY, get_reports_page
+
+
+def get(path, query=""):
+    """GET-запрос к приложению напрямую через ASGI"""
+    messages = []
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'raw_path': path.encode(), 'root_path': "",
+        'query_string': query.encode(), 'headers': [], 'scheme': 'http', 'server': ("test", 80),
+    }
+    received = asyncio.Event()
+
+    async def receive():
+        if received.is_set():
+            await asyncio.Event().wait()
+        received.set()
+        return {'type': 'http.request', 'body': b"", 'more_body': False}
+
+    # ASGI ожидает awaitable от send, своего await здесь нет
+    def send(message):
+        messages.append(message)
+        return asyncio.sleep(0)
+
+    asyncio.run(app(scope, receive, send))
+    body = b"".join(m.get('body', b"") for m in messages[1:])
+    return messages[0]['status'], orjson.loads(body)
+
+
+def test_parse_fields():
+    """Тест разбора параметра fields"""
+    assert parse_fields(None, ['a', 'b']) == ['a', 'b']
+    assert parse_fields(None, ['a', 'b', 'c'], default=['a']) == ['a']
+    assert parse_fields("b, a,b", ['a', 'b']) == ['b', 'a']
+    with pytest.raises(HTTPException):
+        parse_fields("a,x", ['a', 'b'])
+
+
+def test_cursor_roundtrip():
+    """Тест курсора с датой в ключе сортировки"""
+    row = {'report_date': datetime(2025, 3, 1, 12, 30), 'student_id': 7, 'sprint_num': 2, 'team_id': 3}
+    cursor = encode_cursor(row, REPORT_API_KEY)
+    assert decode_cursor(cursor, REPORT_API_KEY) == (datetime(2025, 3, 1, 12, 30), 7, 2, 3)
+
+    with pytest.raises(HTTPException):
+        decode_cursor("bm90LWpzb24", REPORT_API_KEY)
+
+
+def test_api_reports_projection_and_pagination():
+    """Тест: в ответе только запрошенные поля, лишняя строка даёт next_cursor"""
+    rows = [
+        {
+            'report_text': f"text {i}", 'report_date': datetime(2025, 3, i),
+            'student_id': i, 'sprint_num': 1, 'team_id': 1,
+        }
+        for i in (3, 2, 1)
+    ]
+    with patch('web.api.get_reports_page', return_value=rows) as mock_page:
+        status, data = get("/api/v1/reports", "fields=report_text,report_date&limit=2&sprint=1")
+
+    assert status == 200
+    assert data['items'] == [
+        {'report_text': "text 3", 'report_date': "2025-03-03T00:00:00"},
+        {'report_text': "text 2", 'report_date': "2025-03-02T00:00:00"},
+    ]
+    assert decode_cursor(data['next_cursor'], REPORT_API_KEY) == (datetime(2025, 3, 2), 2, 1, 1)
+    mock_page.assert_called_once_with(
+        ['report_text', 'report_date'], None, 3, team_id=None, sprint_num=1, student_id=None,
+    )
+
+
+def test_api_teams_with_members():
+    """Тест: участники подгружаются одним запросом для всей страницы"""
+    rows = [{'team_name': "Alpha", 'team_id': 1}, {'team_name': "Beta", 'team_id': 2}]
+    members = {1: [{'student_id': 10, 'name': "Ivan"}], 2: []}
+    with patch('web.api.get_teams_page', return_value=rows), \
+            patch('web.api.get_members_by_teams', return_value=members) as mock_members:
+        status, data = get("/api/v1/teams", "fields=team_name,members")
+
+    assert status == 200
+    assert data == {
+        'items': [
+            {'team_name': "Alpha", 'members': [{'student_id': 10, 'name': "Ivan"}]},
+            {'team_name': "Beta", 'members': []},
+        ],
+        'next_cursor': None,
+    }
+    mock_members.assert_called_once_with([1, 2])
+
+
+def test_api_unknown_field():
+    """Тест ответа 400 на неизвестное поле"""
+    status, data = get("/api/v1/teams", "fields=password")
+    assert status == 400
+    assert "password" in data['detail']
+
+
+def test_reports_query_uses_only_whitelisted_fields():
+    """Тест: в SQL попадают только поля из REPORT_API_FIELDS, текст присоединяется по запросу"""
+    with patch('web.db.select_all', return_value=[]) as select_all:
+        get_reports_page(['report_length'])
+        query = select_all.call_args.args[0]
+        assert f"{REPORT_API_FIELDS['report_length']} AS report_length" in query
+        assert "sprint_report_bodies" not in query
+
+        get_reports_page(['report_text'])
+        assert "sprint_report_bodies" in select_all.call_args.args[0]
+
+    with pytest.raises(ValueError, match="Unknown fields: name; DROP TABLE"):
+        get_reports_page(["name; DROP TABLE"])
+
+
+def test_reports_page_caches_only_list_filters():
+    """Тест: страница отчётов не кэширует произвольный текст в фильтрах"""
+    teams = [{'team_id': 1, 'team_name': "Alpha"}]
+    with (
+        patch('web.app.shared_cache.cached', side_effect=lambda ns, key, loader: loader()) as cached,
+        patch('web.app.get_teams_list', return_value=teams),
+        patch('web.app.get_all_reports', return_value=[]) as get_all_reports,
+        patch('web.app.templates.TemplateResponse'),
+    ):
+        asyncio.run(reports(None, team="Alpha", sprint="2"))
+        assert [c.args[1] for c in cached.call_args_list] == ["teams_list", "page:('Alpha', 2)"]
+
+        for filters in ({'student': "Иван"}, {'team': "Alp"}):
+            cached.reset_mock()
+            asyncio.run(reports(None, **filters))
+            assert [c.args[1] for c in cached.call_args_list] == ["teams_list"]
+        assert get_all_reports.call_count == 3
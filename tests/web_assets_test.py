@@ -0,0 +1,33 @@
+"""
+Тесты для статических файлов с хэшем из web/assets.py
+"""
+
+from web.assets import AssetManifest, hashed_name
+
+
+def test_hashed_name():
+    """Тест вставки хэша перед расширением"""
+    assert hashed_name("css/custom.css", "abc") == "css/custom.abc.css"
+    assert hashed_name("js/app.min.js", "abc") == "js/app.abc.min.js"
+    assert hashed_name("LICENSE", "abc") == "LICENSE.abc"
+
+
+def test_manifest_urls(tmp_path):
+    """Тест URL с хэшем и обратного разрешения пути"""
+    (tmp_path / "css").mkdir()
+    css = tmp_path / "css" / "custom.css"
+    css.write_text("body { color: red; }")
+    manifest = AssetManifest(tmp_path)
+
+    url = manifest.url("css/custom.css")
+    assert url.startswith("/static/css/custom.")
+    assert url.endswith(".css")
+    assert manifest.resolve(url.removeprefix("/static/")) == "css/custom.css"
+    # Неизвестный файл отдаётся по обычному URL
+    assert manifest.url("img/logo.png") == "/static/img/logo.png"
+
+    # После изменения файла URL меняется
+    css.write_text("body { color: blue; }")
+    manifest.refresh()
+    assert manifest.url("css/custom.css") != url
+    assert manifest.resolve(url.removeprefix("/static/")) is None
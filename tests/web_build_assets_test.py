@@ -0,0 +1,71 @@
+"""
+Тесты для сборки фронтенд-бандлов из web/build_assets.py
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from web.assets import cdn_url
+from web.build_assets import (
+    STATIC_DIR,
+    TEMPLATES_DIR,
+    collect_used_icons,
+    fetch_vendor_files,
+    minify_css,
+    minify_js,
+    subset_icons_css,
+)
+
+ICONS_CSS = """@font-face {
+  font-display: block;
+  font-family: "bootstrap-icons";
+  src: url("./fonts/bootstrap-icons.woff2?abc") format("woff2"),
+url("./fonts/bootstrap-icons.woff?abc") format("woff");
+}
+.bi-alarm::before { content: "\\f102"; }
+.bi-gear::before { content: "\\f3e5"; }
+.bi-people-fill::before { content: "\\f4cf"; }
+"""
+
+
+def test_cdn_url_is_pinned():
+    """Тест ссылки на CDN с зафиксированной версией"""
+    assert cdn_url('jquery', "dist/jquery.min.js") == "https://cdn.jsdelivr.net/npm/jquery@3.7.1/dist/jquery.min.js"
+
+
+def test_fetch_only_https(tmp_path):
+    """Тест: файлы библиотек не загружаются по другим схемам"""
+    with patch('web.build_assets.vendor_path', side_effect=lambda package, path: tmp_path / package / path), \
+            patch('web.build_assets.cdn_url', return_value="file:///etc/passwd"), \
+            patch('web.build_assets.urllib.request.urlopen') as urlopen, \
+            pytest.raises(ValueError, match="только по https"):
+        fetch_vendor_files()
+    urlopen.assert_not_called()
+
+
+def test_collect_used_icons():
+    """Тест поиска иконок в шаблонах и скриптах"""
+    icons = collect_used_icons(TEMPLATES_DIR, STATIC_DIR)
+    assert {'people-fill', 'question-circle', 'search'} <= icons
+
+
+def test_subset_icons_css():
+    """Тест удаления неиспользуемых иконок и замены шрифта"""
+    css, codepoints = subset_icons_css(ICONS_CSS, {'gear', 'people-fill'}, font_url="icons.woff2")
+
+    assert "bi-alarm" not in css
+    assert ".bi-gear::before" in css
+    assert ".bi-people-fill::before" in css
+    assert codepoints == {0xf3e5, 0xf4cf}
+    assert 'src: url("icons.woff2") format("woff2");' in css
+    assert "bootstrap-icons.woff" not in css
+
+
+def test_minify():
+    """Тест минификации CSS и JS"""
+    css = "/* комментарий */\n.a > .b {\n    color: red;\n}\n/*! лицензия */"
+    assert minify_css(css) == ".a>.b{color: red}/*! лицензия */"
+
+    js = "$(function() {\n    // комментарий\n\n    var url = 'http://x';\n});\n"
+    assert minify_js(js) == "$(function() {\nvar url = 'http://x';\n});"
@@ -0,0 +1,79 @@
+"""
+Тесты для middleware сжатия из web/middleware.py
+"""
+
+import asyncio
+import gzip
+
+from web.middleware import CompressionMiddleware
+
+BODY = b"<tr><td>Team</td></tr>" * 200
+
+
+def make_app(chunks, headers=None, status=200):
+    """ASGI-приложение, отдающее тело указанными фрагментами"""
+    async def app(scope, receive, send):
+        raw_headers = [(b"content-type", b"text/html; charset=utf-8")] + (headers or [])
+        await send({'type': 'http.response.start', 'status': status, 'headers': raw_headers})
+        for i, chunk in enumerate(chunks):
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': i < len(chunks) - 1})
+    return app
+
+
+def call(app, accept_encoding="gzip"):
+    messages = []
+    scope = {'type': 'http', 'headers': [(b"accept-encoding", accept_encoding.encode())]}
+
+    # ASGI ожидает awaitable от receive/send, своих await здесь нет
+    def receive():
+        return asyncio.sleep(0, result={'type': 'http.request'})
+
+    def send(message):
+        messages.append(message)
+        return asyncio.sleep(0)
+
+    asyncio.run(CompressionMiddleware(app, minimum_size=500)(scope, receive, send))
+    headers = {k.decode(): v.decode() for k, v in messages[0]['headers']}
+    body = b"".join(m.get('body', b"") for m in messages[1:])
+    return headers, body
+
+
+def test_compress_large_response():
+    """Тест сжатия целиком переданного и потокового ответа"""
+    headers, body = call(make_app([BODY]))
+    assert headers['content-encoding'] == "gzip"
+    assert headers['vary'] == "Accept-Encoding"
+    assert int(headers['content-length']) == len(body) < len(BODY)
+    assert gzip.decompress(body) == BODY
+
+    headers, body = call(make_app([BODY[:1000], BODY[1000:]], [(b"content-length", str(len(BODY)).encode())]))
+    assert headers['content-encoding'] == "gzip"
+    assert 'content-length' not in headers
+    assert gzip.decompress(body) == BODY
+
+
+def test_skip_small_and_encoded_responses():
+    """Тест: маленькие, уже сжатые ответы и клиенты без gzip не сжимаются"""
+    headers, body = call(make_app([b"<p>ok</p>"]))
+    assert 'content-encoding' not in headers
+    assert body == b"<p>ok</p>"
+
+    precompressed = gzip.compress(BODY)
+    headers, body = call(make_app([precompressed], [(b"content-encoding", b"gzip")]))
+    assert body == precompressed
+
+    headers, body = call(make_app([BODY]), accept_encoding="identity")
+    assert 'content-encoding' not in headers
+    assert body == BODY
+
+
+def test_skip_partial_content():
+    """Тест: ответы на Range-запросы (206, Content-Range) отдаются без сжатия"""
+    content_range = [(b"content-range", f"bytes 0-{len(BODY) - 1}/{len(BODY) * 2}".encode())]
+    headers, body = call(make_app([BODY], content_range, status=206))
+    assert 'content-encoding' not in headers
+    assert body == BODY
+
+    headers, body = call(make_app([BODY], content_range))
+    assert 'content-encoding' not in headers
+    assert body == BODY
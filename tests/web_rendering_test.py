@@ -0,0 +1,51 @@
+"""
+Тесты для слоя рендеринга шаблонов из web/rendering.py
+"""
+
+import gzip
+
+from fastapi import Request
+
+from web.rendering import StaticPage, precompile_templates, render_static_page
+
+
+def make_request(**headers):
+    raw_headers = [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()]
+    return Request({'type': 'http', 'method': 'GET', 'path': '/faq', 'headers': raw_headers})
+
+
+def test_precompile_templates():
+    """Тест компиляции всех шаблонов"""
+    assert precompile_templates() >= 4
+
+
+def test_render_faq_page():
+    """Тест предварительного рендеринга FAQ с подсветкой пункта меню"""
+    page = render_static_page("faq.jinja", "/faq")
+    html = page.body.decode("utf-8")
+
+    assert "Инструкция для бота StudHelper" in html
+    assert 'nav-link active" href="/faq"' in html
+    assert gzip.decompress(page.variants['gzip']) == page.body
+
+
+def test_static_page_response():
+    """Тест выбора сжатия и ответа 304 по ETag"""
+    page = StaticPage(b"<html>" + b"x" * 1000 + b"</html>", max_age=60)
+
+    response = page.response(make_request(accept_encoding="gzip, deflate"))
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == "gzip"
+    assert response.headers['cache-control'] == "public, max-age=60"
+    assert response.headers['vary'] == "Accept-Encoding"
+    assert gzip.decompress(response.body) == page.body
+
+    # Клиент без поддержки сжатия получает исходное тело
+    response = page.response(make_request())
+    assert 'content-encoding' not in response.headers
+    assert response.body == page.body
+
+    # Повторный запрос с ETag
+    response = page.response(make_request(if_none_match=page.etag))
+    assert response.status_code == 304
+    assert response.body == b""
@@ -0,0 +1,29 @@
+"""
+Тесты для запуска web-сервера из web/run_web.py
+"""
+
+from unittest.mock import patch
+
+from web import run_web
+
+
+def test_worker_count():
+    """Тест: 0 в конфиге - по числу ядер, иначе заданное значение"""
+    with patch('web.run_web.available_cpus', return_value=6):
+        assert run_web.worker_count(0) == 6
+        assert run_web.worker_count(2) == 2
+        with patch.object(run_web.config, 'get', return_value=0):
+            assert run_web.worker_count() == 6
+
+
+def test_main_runs_workers_after_preload():
+    """Тест: приложение загружается до запуска воркеров uvicorn"""
+    calls = []
+    with patch('sys.argv', ["run_web.py", "--workers", "3"]), \
+            patch('web.run_web.preload', side_effect=lambda: calls.append("preload")), \
+            patch('web.run_web.uvicorn.run', side_effect=lambda *args, **kwargs: calls.append(kwargs)):
+        run_web.main()
+
+    assert calls[0] == "preload"
+    assert calls[1]['workers'] == 3
+    assert calls[1]['reload'] is False